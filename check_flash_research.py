@@ -4,19 +4,72 @@ Quick Flash Research status check for VM deployment
 """
 import os
 import sys
+import json
 import time
+import hashlib
 import logging
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from importlib.metadata import version, PackageNotFoundError
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'flash_research')
+CACHE_TTL = 86400  # Flash Research gap stats only change once per trading day
+ENV_CACHE_DIR = '/tmp/jgpt_env'
+ENV_CACHE_TTL = 3600  # installed Chrome/Selenium versions rarely change within an hour
+
+
+class FileCache:
+    """Small JSON file cache with a TTL per entry"""
+    
+    def __init__(self, cache_dir: str = CACHE_DIR, ttl: int = CACHE_TTL):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+    
+    def _path(self, key: str) -> str:
+        digest = hashlib.md5(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+    
+    def get(self, key: str):
+        """Return the cached payload for key, or None if missing/expired"""
+        try:
+            with open(self._path(key), 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if time.time() - entry.get('ts', 0) >= self.ttl:
+            return None
+        return entry.get('payload')
+    
+    def set(self, key: str, payload) -> None:
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self._path(key), 'w') as f:
+                json.dump({'ts': time.time(), 'payload': payload}, f, default=str)
+        except OSError:
+            pass
+
 
 def quick_flash_check():
     """Quick check if Flash Research is working"""
-    print("🔍 QUICK FLASH RESEARCH CHECK")
-    print("=" * 35)
+    sys.stdout.write("🔍 QUICK FLASH RESEARCH CHECK\n" + "=" * 35 + "\n")
+    
+    # Serve from disk when we already scraped this symbol today
+    cache = FileCache()
+    start_time = time.time()
+    result = cache.get('KLTO')
+    if result:
+        elapsed = time.time() - start_time
+        print("📊 Using cached Flash Research data...")
+        print_flash_result(result, elapsed)
+        return True
     
     try:
         # Minimal imports
         sys.path.append('/path/to/your/bot')  # Adjust path as needed
         from src.api.flash_research_client import FlashResearchClient
+        from src.utils.retry import with_backoff
         
         # Suppress logging noise
         logging.basicConfig(level=logging.ERROR)
@@ -26,26 +79,19 @@ def quick_flash_check():
         
         # Test with KLTO (symbol we know works)
         start_time = time.time()
-        result = flash_client.analyze_symbol('KLTO')
+        # Logins get rate-limited now and then, so retry those before giving up;
+        # analyze_symbol handles every other failure itself (no data, no
+        # scraper) and those won't change on a retry
+        result = with_backoff(
+            lambda: flash_client.analyze_symbol('KLTO'),
+            attempts=3,
+            retry_if=lambda r: bool(r and r.get('retryable'))
+        )
         elapsed = time.time() - start_time
         
-        if result and result.get('has_flash_data'):
-            print(f"✅ WORKING! ({elapsed:.1f}s)")
-            print(f"   📈 {result.get('total_gaps_analyzed', 0)} gaps")
-            print(f"   📊 {result.get('gap_continuation_rate', 0):.0f}% continuation")
-            print(f"   🎯 {result.get('gap_edge_score', 0)}/100 edge score")
-            print(f"   🔗 Source: {result.get('source', 'unknown')}")
-            
-            # Show sample alert
-            if result.get('gap_continuation_rate', 0) > 70:
-                print("\n📱 Sample Alert Preview:")
-                print(f"🔥 **KLTO** Gap Up +15.2%")
-                print(f"📊 Score: 94/100 (Excellent Setup)")
-                print(f"📈 Historical Edge ({result.get('gap_edge_score', 0)}/100):")
-                print(f"• {result.get('total_gaps_analyzed', 0)} gaps analyzed")
-                print(f"• {result.get('gap_continuation_rate', 0):.0f}% continuation rate ✅")
-                print(f"• Strong momentum bias")
-                
+        if result and result.get('has_flash_data') and not result.get('retryable'):
+            cache.set('KLTO', result)
+            print_flash_result(result, elapsed)
         else:
             print("⚠️ Using simulated data (Flash Research not accessible)")
             
@@ -61,35 +107,89 @@ def quick_flash_check():
         print(f"❌ Error: {e}")
         return False
 
+def print_flash_result(result, elapsed):
+    """Print a successful Flash Research result as a single stdout write"""
+    lines = [
+        f"✅ WORKING! ({elapsed:.1f}s)",
+        f"   📈 {result.get('total_gaps_analyzed', 0)} gaps",
+        f"   📊 {result.get('gap_continuation_rate', 0):.0f}% continuation",
+        f"   🎯 {result.get('gap_edge_score', 0)}/100 edge score",
+        f"   🔗 Source: {result.get('source', 'unknown')}",
+    ]
+
+    # Show sample alert
+    if result.get('gap_continuation_rate', 0) > 70:
+        lines += [
+            "\n📱 Sample Alert Preview:",
+            "🔥 **KLTO** Gap Up +15.2%",
+            "📊 Score: 94/100 (Excellent Setup)",
+            f"📈 Historical Edge ({result.get('gap_edge_score', 0)}/100):",
+            f"• {result.get('total_gaps_analyzed', 0)} gaps analyzed",
+            f"• {result.get('gap_continuation_rate', 0):.0f}% continuation rate ✅",
+            "• Strong momentum bias",
+        ]
+
+    sys.stdout.write('\n'.join(lines) + '\n')
+
+def _probe_credentials():
+    flash_email = os.getenv('FLASH_RESEARCH_EMAIL')
+    flash_pass = os.getenv('FLASH_RESEARCH_PASSWORD')
+    
+    return [
+        f"📧 Flash Email: {'✅' if flash_email else '❌'}",
+        f"🔑 Flash Password: {'✅' if flash_pass else '❌'}",
+    ]
+
+def _probe_chrome():
+    # Bounded so a broken Chrome install can't hang the check; a minimal env
+    # keeps Chrome from picking up unrelated settings while it starts
+    try:
+        result = subprocess.run(['google-chrome', '--version'],
+                              env={'PATH': os.environ.get('PATH', '')},
+                              capture_output=True, text=True, timeout=2, check=False)
+        if result.returncode == 0:
+            return True, f"🌐 Chrome: ✅ {result.stdout.strip()}"
+        return False, "🌐 Chrome: ❌ Not found"
+    except subprocess.TimeoutExpired:
+        return False, "🌐 Chrome: ❌ Timed out"
+    except OSError:
+        return False, "🌐 Chrome: ❌ Not accessible"
+
+def _probe_selenium():
+    # Read the installed version from dist-info instead of importing selenium
+    try:
+        return True, f"🐍 Selenium: ✅ {version('selenium')}"
+    except PackageNotFoundError:
+        return False, "🐍 Selenium: ❌ Not installed"
+
 def check_environment():
     """Check if environment is properly set up"""
     print("\n🔧 ENVIRONMENT CHECK:")
     
-    # Check environment variables
-    flash_email = os.getenv('FLASH_RESEARCH_EMAIL')
-    flash_pass = os.getenv('FLASH_RESEARCH_PASSWORD')
+    # Credentials come from the current shell, so they are always read live
+    lines = _probe_credentials()
     
-    print(f"📧 Flash Email: {'✅' if flash_email else '❌'}")
-    print(f"🔑 Flash Password: {'✅' if flash_pass else '❌'}")
+    # Installed software is stable on the VM - reuse a successful probe for an
+    # hour; failed probes are rerun every time so a fresh install shows up
+    env_cache = FileCache(cache_dir=ENV_CACHE_DIR, ttl=ENV_CACHE_TTL)
+    probes = {'chrome': _probe_chrome, 'selenium': _probe_selenium}
+    software_lines = {name: env_cache.get(name) for name in probes}
+    stale = [name for name, line in software_lines.items() if line is None]
     
-    # Check Chrome
-    try:
-        import subprocess
-        result = subprocess.run(['google-chrome', '--version'], 
-                              capture_output=True, text=True)
-        if result.returncode == 0:
-            print(f"🌐 Chrome: ✅ {result.stdout.strip()}")
-        else:
-            print("🌐 Chrome: ❌ Not found")
-    except:
-        print("🌐 Chrome: ❌ Not accessible")
+    if stale:
+        # Chrome takes a few hundred ms just to print its version, so run the
+        # probes concurrently and report them in a fixed order
+        with ThreadPoolExecutor(max_workers=len(stale)) as executor:
+            futures = {name: executor.submit(probes[name]) for name in stale}
+        
+        for name, future in futures.items():
+            ok, line = future.result()
+            if ok:
+                env_cache.set(name, line)
+            software_lines[name] = line
     
-    # Check Python packages
-    try:
-        import selenium
-        print(f"🐍 Selenium: ✅ {selenium.__version__}")
-    except:
-        print("🐍 Selenium: ❌ Not installed")
+    lines += [software_lines[name] for name in probes]
+    sys.stdout.write('\n'.join(lines) + '\n')
 
 if __name__ == "__main__":
     print(f"⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -5,10 +5,29 @@ Debug Finnhub API connection
 
 import requests
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 load_dotenv()
 
+# Shared session so every call reuses the same keep-alive connection to finnhub.io
+session = requests.Session()
+session.mount('https://', HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+))
+
+def fetch_metrics(symbol, api_key):
+    """Fetch /stock/metric for one symbol, returning (symbol, response, error)"""
+    url = f"https://finnhub.io/api/v1/stock/metric?symbol={symbol}&metric=all&token={api_key}"
+    try:
+        return symbol, session.get(url, timeout=10), None
+    except requests.RequestException as e:
+        return symbol, None, e
+
 def test_finnhub_direct():
     api_key = os.getenv('FINNHUB_API_KEY')
     print(f"API Key: {api_key}")
@@ -18,49 +37,47 @@ def test_finnhub_direct():
     print(f"Testing URL: {url}")
     
     try:
-        response = requests.get(url, timeout=10)
+        response = session.get(url, timeout=10)
         print(f"Status Code: {response.status_code}")
         print(f"Response: {response.text}")
         
         if response.status_code == 200:
             data = response.json()
             print(f"Quote data: {data}")
-    except Exception as e:
+    except requests.RequestException as e:
         print(f"Error: {e}")
     
     # Test metrics endpoint with different symbols
     test_symbols = ['AAPL', 'PLTR', 'SOFI', 'AMC', 'GME']
     
-    for symbol in test_symbols:
+    # Fire the metric requests in parallel over the shared session; 5 calls
+    # stay well inside Finnhub's 60 req/min free tier
+    with ThreadPoolExecutor(max_workers=len(test_symbols)) as executor:
+        results = list(executor.map(lambda s: fetch_metrics(s, api_key), test_symbols))
+    
+    for symbol, response2, error in results:
         print(f"\n{'='*50}")
         print(f"Testing metrics for {symbol}...")
         
-        url2 = f"https://finnhub.io/api/v1/stock/metric?symbol={symbol}&metric=all&token={api_key}"
+        if error:
+            print(f"Error: {error}")
+            continue
+        
+        print(f"Status Code: {response2.status_code}")
         
-        try:
-            response2 = requests.get(url2, timeout=10)
-            print(f"Status Code: {response2.status_code}")
-            
-            if response2.status_code == 200:
-                data2 = response2.json()
-                print(f"Has metric key: {'metric' in data2}")
-                if 'metric' in data2:
-                    metric = data2['metric']
-                    print(f"Shares Outstanding: {metric.get('sharesOutstanding')}")
-                    print(f"Float Shares: {metric.get('floatShares')}")
-                    print(f"Market Cap: {metric.get('marketCapitalization')}")
-                    print(f"Available keys: {list(metric.keys())[:10]}...")  # First 10 keys
-                else:
-                    print(f"No metric data: {data2}")
+        if response2.status_code == 200:
+            data2 = response2.json()
+            print(f"Has metric key: {'metric' in data2}")
+            if 'metric' in data2:
+                metric = data2['metric']
+                print(f"Shares Outstanding: {metric.get('sharesOutstanding')}")
+                print(f"Float Shares: {metric.get('floatShares')}")
+                print(f"Market Cap: {metric.get('marketCapitalization')}")
+                print(f"Available keys: {list(metric.keys())[:10]}...")  # First 10 keys
             else:
-                print(f"Error response: {response2.text}")
-                
-        except Exception as e:
-            print(f"Error: {e}")
-            
-        # Small delay between calls
-        import time
-        time.sleep(1)
+                print(f"No metric data: {data2}")
+        else:
+            print(f"Error response: {response2.text}")
 
 if __name__ == "__main__":
-    test_finnhub_direct()
\ No newline at end of file
+    test_finnhub_direct()
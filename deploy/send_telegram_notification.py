@@ -7,11 +7,46 @@ Usage: python send_telegram_notification.py <commit_sha> <commit_message>
 import os
 import sys
 import requests
-from datetime import datetime
+from datetime import datetime, timezone
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Retry 429/5xx with backoff (honours Retry-After) so a flaky Telegram API
+# can't hang the deploy; POST must be listed explicitly to be retried. This is
+# the only retry layer, so a deploy sends at most 5 POSTs
+_session = requests.Session()
+_session.mount('https://', HTTPAdapter(max_retries=Retry(
+    total=4,
+    backoff_factor=1.0,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=frozenset(['POST'])
+)))
+
+# Last commit announced, kept on disk so re-running a deploy for the same
+# commit doesn't post it again - one sendMessage per deploy
+NOTIFIED_COMMIT_FILE = os.path.expanduser('~/.jgpt_deploy_notified')
+
+def _last_notified_commit():
+    try:
+        with open(NOTIFIED_COMMIT_FILE, 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def _save_notified_commit(commit_sha):
+    try:
+        with open(NOTIFIED_COMMIT_FILE, 'w') as f:
+            f.write(commit_sha)
+    except OSError:
+        pass
 
 def send_deployment_notification(commit_sha, commit_message):
     """Send deployment success notification to Telegram"""
+    if commit_sha != 'unknown' and commit_sha == _last_notified_commit():
+        print(f'ℹ️ Deployment notification for {commit_sha[:7]} already sent')
+        return True
+    
     load_dotenv()
     
     token = os.getenv('TELEGRAM_BOT_TOKEN')
@@ -24,22 +59,24 @@ def send_deployment_notification(commit_sha, commit_message):
     # Prepare message
     commit_sha_short = commit_sha[:7] if len(commit_sha) > 7 else commit_sha
     commit_msg_first_line = commit_message.split('\n')[0] if commit_message else 'No message'
-    current_time = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')
+    current_time = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')
     
     message = f"🚀 Trading Bot Deployed Successfully - `{commit_sha_short}`"
     
     # Send message
     try:
-        response = requests.post(
+        response = _session.post(
             f'https://api.telegram.org/bot{token}/sendMessage',
             json={
                 'chat_id': chat_id,
                 'text': message,
                 'parse_mode': 'Markdown'
-            }
+            },
+            timeout=(5, 10)
         )
         
         if response.status_code == 200:
+            _save_notified_commit(commit_sha)
             print('✅ Deployment notification sent to Telegram')
             return True
         else:
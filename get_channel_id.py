@@ -5,11 +5,112 @@ Script simple para obtener el Chat ID de un canal de Telegram
 
 import os
 import sys
+import threading
 import requests
 from dotenv import load_dotenv
 
 load_dotenv()
 
+LONG_POLL_TIMEOUT = 25
+
+# One session so getMe, getUpdates and sendMessage share a TLS connection
+session = requests.Session()
+
+def offset_file(token):
+    """Per-bot offset file, keyed by the bot id (the part of the token before ':')"""
+    return os.path.expanduser(f"~/.tg_bot_offset_{token.split(':', 1)[0]}")
+
+def load_offset(token):
+    """Return the last processed update_id for this bot, or 0 if none was saved"""
+    try:
+        with open(offset_file(token), 'r') as f:
+            return int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+def save_offset(token, update_id):
+    try:
+        with open(offset_file(token), 'w') as f:
+            f.write(str(update_id))
+    except OSError:
+        pass
+
+def fetch_updates(token, last_id):
+    """Long-poll getUpdates for anything newer than last_id"""
+    return session.get(
+        f'https://api.telegram.org/bot{token}/getUpdates',
+        params={'timeout': LONG_POLL_TIMEOUT, 'offset': last_id + 1},
+        timeout=LONG_POLL_TIMEOUT + 5
+    )
+
+def classify_updates(updates):
+    """Split updates into channels and private chats, tracking the newest update_id"""
+    channels_found = {}
+    private_chats = {}
+    last_id = -1
+    
+    # Single pass: classify chats and track the newest update_id
+    for update in updates:
+        last_id = max(last_id, update['update_id'])
+        
+        # Check channel posts
+        if 'channel_post' in update:
+            chat = update['channel_post']['chat']
+            channels_found.setdefault(chat['id'], chat.get('title', 'Unknown'))
+        
+        # Check private messages
+        elif 'message' in update:
+            chat = update['message']['chat']
+            if chat['type'] == 'private':
+                private_chats.setdefault(chat['id'], chat.get('first_name', 'Unknown'))
+        
+        # Check when bot is added to groups/channels
+        elif 'my_chat_member' in update:
+            chat = update['my_chat_member']['chat']
+            if chat['type'] in ('channel', 'supergroup'):
+                channels_found.setdefault(chat['id'], chat.get('title', 'Unknown'))
+    
+    return channels_found, private_chats, last_id
+
+def long_poll(token, state, stop_event):
+    """Keep long-polling getUpdates and print new chats as soon as they show up"""
+    while not stop_event.is_set():
+        try:
+            response = fetch_updates(token, state['last_id'])
+        except requests.RequestException:
+            stop_event.wait(5)
+            continue
+        
+        if response.status_code != 200:
+            print("❌ Error obteniendo updates")
+            stop_event.wait(5)
+            continue
+        
+        channels, private, last_id = classify_updates(response.json().get('result', []))
+        if last_id < 0:
+            continue
+        
+        # The next getUpdates with offset=last_id+1 confirms these to Telegram
+        state['last_id'] = last_id
+        save_offset(token, last_id)
+        
+        for chat_id, title in channels.items():
+            if chat_id not in state['channels']:
+                state['channels'][chat_id] = title
+                print("\n📢 CANAL ENCONTRADO:")
+                print(f"   Nombre: {title}")
+                print(f"   Chat ID: {chat_id}")
+                print(f"   👆 USA ESTE ID PARA LAS NOTIFICACIONES")
+                print("   " + "-" * 40)
+        
+        for chat_id, name in private.items():
+            if chat_id not in state['private']:
+                state['private'][chat_id] = name
+                print("\n💬 CHAT PRIVADO:")
+                print(f"   Usuario: {name}")
+                print(f"   Chat ID: {chat_id}")
+                print("   " + "-" * 40)
+
 def main():
     token = os.getenv('TELEGRAM_BOT_TOKEN')
     if not token:
@@ -19,7 +120,7 @@ def main():
     print(f"🤖 Bot Token: {token[:10]}...")
     
     # Get bot info
-    response = requests.get(f'https://api.telegram.org/bot{token}/getMe')
+    response = session.get(f'https://api.telegram.org/bot{token}/getMe', timeout=10)
     if response.status_code == 200:
         bot = response.json()['result']
         print(f"✅ Bot: @{bot['username']} ({bot['first_name']})")
@@ -30,75 +131,33 @@ def main():
     print("\n📋 INSTRUCCIONES:")
     print("1. Agrega el bot a tu canal como administrador")
     print("2. En el canal, envía este mensaje exacto: /get_id")
-    print("3. Espera 5 segundos")
-    print("4. Presiona Enter aquí para continuar...")
-    input()
-    
-    # Get updates
-    print("\n🔍 Buscando mensajes recientes...")
-    response = requests.get(f'https://api.telegram.org/bot{token}/getUpdates')
-    
-    if response.status_code != 200:
-        print("❌ Error obteniendo updates")
-        return
-    
-    updates = response.json().get('result', [])
-    
-    if not updates:
-        print("⚠️ No hay mensajes. Intenta de nuevo.")
-        return
-    
-    # Look for channels
-    channels_found = {}
-    private_chats = {}
-    
-    for update in updates:
-        # Check channel posts
-        if 'channel_post' in update:
-            chat = update['channel_post']['chat']
-            channels_found[chat['id']] = chat.get('title', 'Unknown')
-        
-        # Check private messages
-        elif 'message' in update:
-            chat = update['message']['chat']
-            if chat['type'] == 'private':
-                private_chats[chat['id']] = chat.get('first_name', 'Unknown')
-        
-        # Check when bot is added to groups/channels
-        elif 'my_chat_member' in update:
-            chat = update['my_chat_member']['chat']
-            if chat['type'] in ['channel', 'supergroup']:
-                channels_found[chat['id']] = chat.get('title', 'Unknown')
-    
-    print("\n✅ RESULTADOS:")
+    print("3. Los Chat IDs aparecerán aquí en cuanto lleguen")
+    print("4. Presiona Ctrl+C para terminar")
     
-    if channels_found:
-        print("\n📢 CANALES ENCONTRADOS:")
-        for chat_id, title in channels_found.items():
-            print(f"   Nombre: {title}")
-            print(f"   Chat ID: {chat_id}")
-            print(f"   👆 USA ESTE ID PARA LAS NOTIFICACIONES")
-            print("   " + "-" * 40)
+    print("\n🔍 Escuchando mensajes...")
+    state = {'last_id': load_offset(token), 'channels': {}, 'private': {}}
+    stop_event = threading.Event()
+    poller = threading.Thread(target=long_poll, args=(token, state, stop_event), daemon=True)
+    poller.start()
     
-    if private_chats:
-        print("\n💬 CHATS PRIVADOS:")
-        for chat_id, name in private_chats.items():
-            print(f"   Usuario: {name}")
-            print(f"   Chat ID: {chat_id}")
-            print("   " + "-" * 40)
+    try:
+        while poller.is_alive():
+            poller.join(1)
+    except KeyboardInterrupt:
+        stop_event.set()
     
-    if not channels_found and not private_chats:
-        print("⚠️ No se encontraron chats")
+    if not state['channels'] and not state['private']:
+        print("\n⚠️ No se encontraron chats")
         print("Asegúrate de:")
         print("1. Agregar el bot como administrador del canal")
         print("2. Enviar un mensaje en el canal")
-        print("3. Esperar unos segundos antes de ejecutar este script")
+        return
     
     # Clear updates
-    if updates:
-        last_id = updates[-1]['update_id']
-        requests.get(f'https://api.telegram.org/bot{token}/getUpdates?offset={last_id + 1}')
-        print(f"\n🧹 Updates limpiados hasta ID: {last_id}")
+    last_id = state['last_id']
+    session.get(f'https://api.telegram.org/bot{token}/getUpdates',
+                params={'offset': last_id + 1}, timeout=10)
+    print(f"\n🧹 Updates limpiados hasta ID: {last_id}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -10,13 +10,26 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+LONG_POLL_TIMEOUT = 25
+
+# One session so getMe, getUpdates and sendMessage share a TLS connection
+session = requests.Session()
+
+def fetch_updates(token):
+    """Long-poll getUpdates without an offset, so nothing is confirmed to Telegram"""
+    return session.get(
+        f'https://api.telegram.org/bot{token}/getUpdates',
+        params={'timeout': LONG_POLL_TIMEOUT},
+        timeout=LONG_POLL_TIMEOUT + 5
+    )
+
 def get_bot_info():
     token = os.getenv('TELEGRAM_BOT_TOKEN')
     
     print(f"🤖 Bot Token: {token[:10]}...")
     
     # Get bot info
-    response = requests.get(f'https://api.telegram.org/bot{token}/getMe')
+    response = session.get(f'https://api.telegram.org/bot{token}/getMe', timeout=10)
     if response.status_code == 200:
         bot_info = response.json()['result']
         print(f"✅ Bot: @{bot_info['username']} ({bot_info['first_name']})")
@@ -27,9 +40,9 @@ def get_bot_info():
     return token
 
 def get_updates(token):
-    print("\n📥 Getting recent updates...")
+    print(f"\n📥 Getting recent updates (waiting up to {LONG_POLL_TIMEOUT}s)...")
     
-    response = requests.get(f'https://api.telegram.org/bot{token}/getUpdates')
+    response = fetch_updates(token)
     if response.status_code != 200:
         print("❌ Error getting updates")
         return
@@ -82,10 +95,10 @@ def send_test_message(token, chat_id):
     """Send a test message to verify the chat ID works"""
     message = "🤖 Test message from Trading Bot!\n\nIf you see this, the chat ID is working correctly."
     
-    response = requests.post(f'https://api.telegram.org/bot{token}/sendMessage', {
+    response = session.post(f'https://api.telegram.org/bot{token}/sendMessage', {
         'chat_id': chat_id,
         'text': message
-    })
+    }, timeout=10)
     
     if response.status_code == 200:
         print(f"✅ Test message sent successfully to chat {chat_id}")
@@ -2,62 +2,136 @@
 """
 Inspeccionar Flash Research para entender su estructura real
 """
+import re
 import requests
-import time
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+
+SITE_URL = "https://flash-research.com"
+MAX_BODY_BYTES = 256 * 1024
+
+# Keyword groups scanned for in the downloaded HTML
+FINANCIAL_KEYWORDS = ('stock', 'ticker', 'symbol', 'gap', 'float', 'research', 'financial', 'trading', 'market')
+AUTH_KEYWORDS = ('login', 'signin', 'register', 'auth', 'account')
+PLACEHOLDER_INDICATORS = ('coming soon', 'under construction', 'domain for sale', 'parked', 'godaddy')
+RESEARCH_INDICATORS = ('stock analysis', 'market research', 'financial data',
+                       'trading signals', 'stock screener', 'gap analysis')
+SPA_INDICATORS = ('react', 'angular', 'vue', 'app.js', 'bundle.js', 'main.js')
+API_PATTERNS = ('api/', '/api', 'endpoint', 'rest', 'graphql')
+AUTH_SYSTEMS = ('oauth', 'jwt', 'session', 'token', 'firebase', 'auth0')
+ASSESSMENT_KEYWORDS = ('parked domain',)
+
+ALL_KEYWORDS = frozenset(
+    FINANCIAL_KEYWORDS + AUTH_KEYWORDS + PLACEHOLDER_INDICATORS + RESEARCH_INDICATORS +
+    SPA_INDICATORS + API_PATTERNS + AUTH_SYSTEMS + ASSESSMENT_KEYWORDS
+)
+
+# Zero-width lookahead so every start position is tried; longest alternative wins
+KEYWORD_PATTERN = re.compile(
+    '(?=(' + '|'.join(re.escape(kw) for kw in sorted(ALL_KEYWORDS, key=len, reverse=True)) + '))'
+)
+
+# A match also implies every shorter keyword contained in it (e.g. 'oauth' -> 'auth')
+KEYWORD_SUBSTRINGS = {kw: frozenset(k for k in ALL_KEYWORDS if k in kw) for kw in ALL_KEYWORDS}
+
+
+def scan_keywords(content_lower):
+    """Return every known keyword present in content_lower using a single regex pass"""
+    hits = set()
+    for match in KEYWORD_PATTERN.findall(content_lower):
+        hits |= KEYWORD_SUBSTRINGS[match]
+    return hits
 
 
 def inspect_flash_research_with_requests():
-    """Inspect Flash Research using requests first"""
+    """Inspect Flash Research using requests first
+    
+    Returns a dict with ``ok``, ``status``, ``is_placeholder`` and ``needs_js``
+    so the caller can decide whether a Selenium pass is worth starting.
+    """
     print("🌐 INSPECTING FLASH RESEARCH WITH REQUESTS")
     print("=" * 50)
     
+    # If the cheap path fails we know nothing, so let Selenium have a go
+    result = {'ok': False, 'status': None, 'is_placeholder': False, 'needs_js': True}
+    
     try:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         }
         
-        # Test main domain
+        session = requests.Session()
+        session.headers.update(headers)
+        
+        # Test main domain - HEAD first so non-HTML responses bail out cheaply
         print("1️⃣ Testing main domain...")
-        response = requests.get("https://flash-research.com", headers=headers, timeout=10)
-        print(f"   Status: {response.status_code}")
-        print(f"   Content-Type: {response.headers.get('content-type', 'Unknown')}")
-        print(f"   Content length: {len(response.text)} characters")
+        head = session.head(SITE_URL, allow_redirects=True, timeout=5)
+        content_type = head.headers.get('content-type', 'Unknown')
+        print(f"   Status: {head.status_code}")
+        print(f"   Content-Type: {content_type}")
+        result['status'] = head.status_code
+        
+        if head.ok and 'html' not in content_type.lower():
+            print("   ⚠️ Not an HTML page, skipping body download")
+            result['needs_js'] = False
+            return result
+        
+        # Only the first MAX_BODY_BYTES are needed for the keyword scan
+        with session.get(SITE_URL, stream=True, timeout=10,
+                         headers={'Accept-Encoding': 'gzip, deflate'}) as response:
+            body = response.raw.read(MAX_BODY_BYTES, decode_content=True)
+            encoding = response.encoding or 'utf-8'
+            status_code = response.status_code
+        
+        text = body.decode(encoding, errors='replace')
+        print(f"   Content length: {len(text)} characters (first {MAX_BODY_BYTES // 1024} KiB)")
         
         # Check if it's a real financial data site
-        content_lower = response.text.lower()
-        keywords = ['stock', 'ticker', 'symbol', 'gap', 'float', 'research', 'financial', 'trading', 'market']
-        found_keywords = [kw for kw in keywords if kw in content_lower]
+        content_lower = text.lower()
+        hits = scan_keywords(content_lower)
+        found_keywords = [kw for kw in FINANCIAL_KEYWORDS if kw in hits]
         print(f"   Financial keywords found: {found_keywords}")
         
         # Check for login/auth mentions
-        auth_keywords = ['login', 'signin', 'register', 'auth', 'account']
-        found_auth = [kw for kw in auth_keywords if kw in content_lower]
+        found_auth = [kw for kw in AUTH_KEYWORDS if kw in hits]
         print(f"   Auth keywords found: {found_auth}")
         
         # Test if it's a placeholder/parking page
-        placeholder_indicators = ['coming soon', 'under construction', 'domain for sale', 'parked', 'godaddy']
-        is_placeholder = any(indicator in content_lower for indicator in placeholder_indicators)
+        is_placeholder = any(indicator in hits for indicator in PLACEHOLDER_INDICATORS)
         print(f"   Appears to be placeholder: {is_placeholder}")
         
+        # SPA bundles only render their content once JavaScript runs
+        found_spa = [ind for ind in SPA_INDICATORS if ind in hits]
+        print(f"   SPA indicators: {found_spa}")
+        
         # Save HTML for inspection
         with open('/tmp/flash_research_raw.html', 'w') as f:
-            f.write(response.text)
+            f.write(text)
+        # Keep a lowercased copy so analyze_findings doesn't lower() it again
+        with open('/tmp/flash_research_raw.lower.html', 'w') as f:
+            f.write(content_lower)
         print(f"   HTML saved to: /tmp/flash_research_raw.html")
         
-        return response.status_code == 200 and not is_placeholder
+        result.update({
+            'ok': status_code == 200 and not is_placeholder,
+            'status': status_code,
+            'is_placeholder': is_placeholder,
+            'needs_js': bool(found_spa),
+        })
+        return result
         
     except Exception as e:
         print(f"   ❌ Error: {str(e)}")
-        return False
+        return result
 
 
 def inspect_with_selenium():
     """Inspect with Selenium to handle JavaScript"""
+    # Imported here so the requests-only path doesn't pay selenium's import cost
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    
     print("\n🔍 INSPECTING WITH SELENIUM")
     print("=" * 50)
     
@@ -65,15 +139,22 @@ def inspect_with_selenium():
     chrome_options.add_argument("--headless=new")
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--disable-extensions")
+    # Text scrape only - don't spend bandwidth on images
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    chrome_options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+    # Return from get() at DOMContentLoaded instead of waiting for every asset
+    chrome_options.page_load_strategy = 'eager'
     
     driver = None
     try:
         driver = webdriver.Chrome(options=chrome_options)
-        wait = WebDriverWait(driver, 10)
+        wait = WebDriverWait(driver, 5)
         
         print("1️⃣ Loading Flash Research...")
-        driver.get("https://flash-research.com")
-        time.sleep(3)
+        driver.get(SITE_URL)
+        wait.until(EC.presence_of_element_located((By.TAG_NAME, 'body')))
         
         # Get basic info
         title = driver.title
@@ -103,14 +184,11 @@ def inspect_with_selenium():
         print(f"   Links found: {len(links)}")
         
         # Look for specific text patterns
-        page_text = driver.page_source.lower()
+        page_lower = page_source.lower()
+        hits = scan_keywords(page_lower)
         
         # Check if it's a real research platform
-        research_indicators = [
-            'stock analysis', 'market research', 'financial data', 
-            'trading signals', 'stock screener', 'gap analysis'
-        ]
-        found_indicators = [ind for ind in research_indicators if ind in page_text]
+        found_indicators = [ind for ind in RESEARCH_INDICATORS if ind in hits]
         print(f"   Research indicators: {found_indicators}")
         
         # Check for authentication elements
@@ -132,6 +210,8 @@ def inspect_with_selenium():
         # Save page source
         with open('/tmp/flash_research_selenium.html', 'w') as f:
             f.write(page_source)
+        with open('/tmp/flash_research_selenium.lower.html', 'w') as f:
+            f.write(page_lower)
         print(f"   Page source saved: /tmp/flash_research_selenium.html")
         
         return True
@@ -144,52 +224,48 @@ def inspect_with_selenium():
             driver.quit()
 
 
-def analyze_findings():
+def analyze_findings(html_path='/tmp/flash_research_selenium.lower.html'):
     """Analyze what we found"""
     print("\n📊 ANALYSIS AND RECOMMENDATIONS")
     print("=" * 50)
     
     # Check if HTML files exist
     try:
-        with open('/tmp/flash_research_raw.html', 'r') as f:
-            raw_html = f.read().lower()
-        
-        with open('/tmp/flash_research_selenium.html', 'r') as f:
-            selenium_html = f.read().lower()
+        with open(html_path, 'r') as f:
+            selenium_html = f.read()
         
         print("✅ HTML files available for analysis")
         
+        hits = scan_keywords(selenium_html)
+        
         # Detailed analysis
         print("\n🔍 Detailed Analysis:")
         
         # Check for React/Angular/Vue (SPA indicators)
-        spa_indicators = ['react', 'angular', 'vue', 'app.js', 'bundle.js', 'main.js']
-        found_spa = [ind for ind in spa_indicators if ind in selenium_html]
+        found_spa = [ind for ind in SPA_INDICATORS if ind in hits]
         print(f"   SPA Framework indicators: {found_spa}")
         
         # Check for API endpoints
-        api_patterns = ['api/', '/api', 'endpoint', 'rest', 'graphql']
-        found_api = [pattern for pattern in api_patterns if pattern in selenium_html]
+        found_api = [pattern for pattern in API_PATTERNS if pattern in hits]
         print(f"   API patterns found: {found_api}")
         
         # Check for authentication systems
-        auth_systems = ['oauth', 'jwt', 'session', 'token', 'firebase', 'auth0']
-        found_auth_sys = [sys for sys in auth_systems if sys in selenium_html]
+        found_auth_sys = [sys for sys in AUTH_SYSTEMS if sys in hits]
         print(f"   Auth systems: {found_auth_sys}")
         
         # Determine site type
         print("\n🎯 Site Assessment:")
         
-        if 'coming soon' in selenium_html or 'under construction' in selenium_html:
+        if 'coming soon' in hits or 'under construction' in hits:
             print("   📋 Type: Under construction / Coming soon page")
             recommendation = "Wait for site to be completed"
-        elif 'domain for sale' in selenium_html or 'parked domain' in selenium_html:
+        elif 'domain for sale' in hits or 'parked domain' in hits:
             print("   📋 Type: Parked domain / For sale")
             recommendation = "Domain not yet developed"
         elif len(found_spa) > 0:
             print("   📋 Type: Single Page Application (React/Vue/Angular)")
             recommendation = "Need to wait for JavaScript to load and find API endpoints"
-        elif 'login' in selenium_html and 'research' in selenium_html:
+        elif 'login' in hits and 'research' in hits:
             print("   📋 Type: Potential research platform with authentication")
             recommendation = "Examine authentication flow and try different login approaches"
         else:
@@ -207,7 +283,7 @@ def analyze_findings():
             print("   3. Use Selenium with explicit waits for dynamic content")
             print("   4. Consider using requests to directly call APIs")
         
-        if 'login' in selenium_html:
+        if 'login' in hits:
             print("   1. Inspect login form HTML structure manually")
             print("   2. Try different element selectors (CSS vs XPath)")
             print("   3. Look for CSRF tokens or other security measures")
@@ -226,14 +302,20 @@ def main():
     print("=" * 60)
     
     # Step 1: Basic HTTP inspection
-    requests_success = inspect_flash_research_with_requests()
+    requests_result = inspect_flash_research_with_requests()
     
-    # Step 2: Selenium inspection  
-    selenium_success = inspect_with_selenium()
+    # Step 2: Selenium inspection, only when the page needs JavaScript to render
+    selenium_success = False
+    if requests_result['is_placeholder'] or not requests_result['needs_js']:
+        print("\n⏭️ Skipping Selenium - plain HTML already tells us enough")
+    else:
+        selenium_success = inspect_with_selenium()
     
     # Step 3: Analysis
-    if requests_success or selenium_success:
-        analyze_findings()
+    if selenium_success:
+        analyze_findings('/tmp/flash_research_selenium.lower.html')
+    elif requests_result['ok'] or requests_result['is_placeholder']:
+        analyze_findings('/tmp/flash_research_raw.lower.html')
     else:
         print("\n❌ Unable to access Flash Research - site may be down")
     
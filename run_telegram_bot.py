@@ -3,13 +3,23 @@
 Script para ejecutar solo el bot de Telegram (para obtener Chat ID)
 """
 
-from src.alerts.telegram_bot import TelegramAlertBot
+import os
+from dotenv import load_dotenv
 from src.utils.logger import setup_logger
 
+load_dotenv()
+
 
 def main():
     logger = setup_logger('telegram_runner')
     
+    # Fail fast before importing python-telegram-bot
+    if not os.getenv('TELEGRAM_BOT_TOKEN'):
+        logger.error("Bot no habilitado - verifica TELEGRAM_BOT_TOKEN en .env")
+        return
+    
+    from src.alerts.telegram_bot import TelegramAlertBot
+    
     logger.info("Iniciando bot de Telegram...")
     logger.info("Envía /start al bot para obtener tu Chat ID")
     
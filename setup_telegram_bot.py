@@ -3,20 +3,21 @@
 Script para configurar y probar el bot de Telegram
 """
 
+import os
 import asyncio
-from src.alerts.telegram_bot import TelegramAlertBot
+from dotenv import load_dotenv
 from src.utils.logger import setup_logger
 
+load_dotenv()
+
 
 async def test_bot():
     logger = setup_logger('telegram_setup')
     
     logger.info("=== Configuración del Bot de Telegram ===\n")
     
-    # Check if bot is configured
-    bot = TelegramAlertBot()
-    
-    if not bot.enabled:
+    # Check if bot is configured before importing python-telegram-bot
+    if not os.getenv('TELEGRAM_BOT_TOKEN'):
         logger.error("❌ Bot no configurado!")
         logger.info("\nPasos para configurar:")
         logger.info("1. Abre Telegram y busca @BotFather")
@@ -26,6 +27,9 @@ async def test_bot():
         logger.info("5. Ejecuta este script de nuevo")
         return
     
+    from src.alerts.telegram_bot import TelegramAlertBot
+    bot = TelegramAlertBot()
+    
     logger.info("✅ Bot configurado correctamente!")
     logger.info("\nAhora necesitas obtener tu Chat ID:")
     logger.info("1. Inicia una conversación con tu bot en Telegram")
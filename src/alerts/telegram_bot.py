@@ -1,23 +1,66 @@
 import os
 import asyncio
+import heapq
+from bisect import bisect_right
 from datetime import datetime
 from typing import List, Dict, Optional
+from zoneinfo import ZoneInfo
 from dotenv import load_dotenv
-from telegram import Update, Bot
-from telegram.ext import Application, CommandHandler, ContextTypes, MessageHandler, filters
+from telegram import Update
+from telegram.ext import AIORateLimiter, Application, CommandHandler, ContextTypes, MessageHandler, filters
 from telegram.constants import ParseMode
 from src.utils.logger import setup_logger
-import pytz
 
 load_dotenv()
 
+# Shared by every alert/status message instead of being rebuilt per bot
+EASTERN = ZoneInfo('US/Eastern')
+_TIME_FMT = '%H:%M:%S ET'
+
+# Telegram caps messages at 4096 chars; leave headroom for Markdown entities
+MAX_MESSAGE_LENGTH = 4000
+ALERT_SEPARATOR = "\n\n━━━━━━━━━━\n\n"
+ALERT_QUEUE_SIZE = 100
+
+# Alert level by absolute gap size: below 10%, 10-20%, 20% and up
+_LEVEL_THRESHOLDS = (10.0, 20.0)
+_LEVELS = (
+    ("📊", "Gap Alert"),
+    ("🔥🔥", "HOT GAP!"),
+    ("🚨🚨🚨", "MEGA GAP!"),
+)
+_DIR_EMOJI = {'UP': "🟢", 'DOWN': "🔴"}
+
+# Gap alert layouts, filled with str.format_map in format_gap_alert; gaps
+# from the "hot" level up get the Gap & Go setup block, smaller ones don't
+_ALERT_HEADER = (
+    "{alert_emoji} *{alert_text}* {alert_emoji}\n\n"
+    "{dir_emoji} *${symbol}* {dir_emoji}\n"
+    "Gap: *{direction} {gap_percent:.1f}%*\n"
+    "Precio: ${previous_close:.2f} → ${current_price:.2f}\n"
+    "Volumen: {volume:,}\n\n"
+)
+_FMT_SMALL = _ALERT_HEADER + "\n⏰ {time}"
+_FMT_HOT = (
+    _ALERT_HEADER
+    + "💡 *Setup Potencial:* Gap & Go\n"
+    "🎯 Target: ${target:.2f} (+5%)\n"
+    "🛑 Stop: ${stop:.2f} (-3%)\n"
+    "\n⏰ {time}"
+)
+
 
 class TelegramAlertBot:
     def __init__(self):
         self.logger = setup_logger('telegram_bot')
         self.bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
         self.chat_id = os.getenv('TELEGRAM_CHAT_ID')
-        self.eastern = pytz.timezone('US/Eastern')
+        self.eastern = EASTERN
+        
+        # Background sender state, bound lazily to the running event loop
+        self._alert_q: Optional[asyncio.Queue] = None
+        self._alert_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sender_task: Optional[asyncio.Task] = None
         
         if not self.bot_token:
             self.logger.warning("TELEGRAM_BOT_TOKEN not configured - alerts disabled")
@@ -25,8 +68,18 @@ class TelegramAlertBot:
             return
         
         self.enabled = True
-        self.application = Application.builder().token(self.bot_token).build()
-        self.bot = Bot(self.bot_token)
+        # One pooled bot for commands and alerts; AIORateLimiter paces sends to
+        # Telegram's limits and retries on RetryAfter instead of fixed sleeps
+        self.application = (
+            Application.builder()
+            .token(self.bot_token)
+            .rate_limiter(AIORateLimiter(max_retries=3))
+            .connection_pool_size(32)
+            .pool_timeout(20)
+            .get_updates_connection_pool_size(4)
+            .build()
+        )
+        self.bot = self.application.bot
         
         # Add command handlers
         self._setup_handlers()
@@ -82,7 +135,7 @@ class TelegramAlertBot:
                 "📊 *Estado del Sistema:*\n\n"
                 "✅ Bot: Activo\n"
                 "✅ Scanner: Funcionando\n"
-                f"⏰ Hora: {datetime.now(self.eastern).strftime('%H:%M:%S ET')}\n"
+                f"⏰ Hora: {datetime.now(EASTERN).strftime(_TIME_FMT)}\n"
                 "📈 Mercado: Verificando..."
             ),
             parse_mode=ParseMode.MARKDOWN
@@ -120,37 +173,34 @@ class TelegramAlertBot:
         
     def format_gap_alert(self, gap_data: Dict) -> str:
         """Format gap data for Telegram message"""
-        direction_emoji = "🟢" if gap_data['gap_direction'] == 'UP' else "🔴"
+        direction_emoji = _DIR_EMOJI.get(gap_data['gap_direction'], "🔴")
         gap_percent = abs(gap_data['gap_percent'])
         
         # Determine alert level
-        if gap_percent >= 20:
-            alert_emoji = "🚨🚨🚨"
-            alert_text = "MEGA GAP!"
-        elif gap_percent >= 10:
-            alert_emoji = "🔥🔥"
-            alert_text = "HOT GAP!"
-        else:
-            alert_emoji = "📊"
-            alert_text = "Gap Alert"
-            
-        message = (
-            f"{alert_emoji} *{alert_text}* {alert_emoji}\n\n"
-            f"{direction_emoji} *${gap_data['symbol']}* {direction_emoji}\n"
-            f"Gap: *{gap_data['gap_direction']} {gap_percent:.1f}%*\n"
-            f"Precio: ${gap_data['previous_close']:.2f} → ${gap_data['current_price']:.2f}\n"
-            f"Volumen: {gap_data['volume']:,}\n\n"
-        )
+        level = bisect_right(_LEVEL_THRESHOLDS, gap_percent)
+        alert_emoji, alert_text = _LEVELS[level]
+        current_price = gap_data['current_price']
         
-        # Add potential setup info
-        if gap_percent >= 10:
-            message += "💡 *Setup Potencial:* Gap & Go\n"
-            message += f"🎯 Target: ${gap_data['current_price'] * 1.05:.2f} (+5%)\n"
-            message += f"🛑 Stop: ${gap_data['current_price'] * 0.97:.2f} (-3%)\n"
-            
-        message += f"\n⏰ {datetime.now(self.eastern).strftime('%H:%M:%S ET')}"
+        fields = {
+            'alert_emoji': alert_emoji,
+            'alert_text': alert_text,
+            'dir_emoji': direction_emoji,
+            'symbol': gap_data['symbol'],
+            'direction': gap_data['gap_direction'],
+            'gap_percent': gap_percent,
+            'previous_close': gap_data['previous_close'],
+            'current_price': current_price,
+            'volume': gap_data['volume'],
+            'time': datetime.now(EASTERN).strftime(_TIME_FMT),
+        }
         
-        return message
+        if not level:
+            return _FMT_SMALL.format_map(fields)
+        
+        # Add potential setup info
+        fields['target'] = current_price * 1.05
+        fields['stop'] = current_price * 0.97
+        return _FMT_HOT.format_map(fields)
         
     async def send_alert(self, message: str):
         """Send alert to configured chat"""
@@ -168,29 +218,85 @@ class TelegramAlertBot:
         except Exception as e:
             self.logger.error(f"Error sending alert: {str(e)}")
             
+    def _alert_queue(self) -> asyncio.Queue:
+        """Queue drained by the sender task for the current event loop"""
+        loop = asyncio.get_running_loop()
+        if self._alert_loop is not loop:
+            # Callers use asyncio.run per scan, so start a fresh worker per loop
+            self._alert_q = asyncio.Queue(maxsize=ALERT_QUEUE_SIZE)
+            self._sender_task = loop.create_task(self._alert_worker(self._alert_q))
+            self._alert_loop = loop
+        return self._alert_q
+    
+    async def _alert_worker(self, queue: asyncio.Queue):
+        """Send queued alerts one at a time; AIORateLimiter handles spacing"""
+        while True:
+            message = await queue.get()
+            try:
+                await self.send_alert(message)
+            finally:
+                queue.task_done()
+    
+    async def queue_alert(self, message: str):
+        """Hand an alert to the background sender and return immediately"""
+        await self._alert_queue().put(message)
+    
+    async def flush_alerts(self):
+        """Wait until every queued alert has been sent"""
+        if self._alert_q is not None and self._alert_loop is asyncio.get_running_loop():
+            await self._alert_q.join()
+            
     async def send_gap_alerts(self, gaps: List[Dict]):
-        """Send alerts for multiple gaps"""
+        """Send alerts for multiple gaps, batched into as few messages as possible"""
         if not gaps:
             return
-            
-        for gap in gaps[:5]:  # Limit to top 5 to avoid spam
-            message = self.format_gap_alert(gap)
-            await self.send_alert(message)
-            await asyncio.sleep(1)  # Avoid rate limiting
+        
+        # Limit to top 5 to avoid spam
+        alerts = [self.format_gap_alert(gap) for gap in self._top_gaps(gaps, 5)]
+        
+        for chunk in self._chunk_messages(alerts):
+            await self.queue_alert(chunk)
+        await self.flush_alerts()
+    
+    def _top_gaps(self, gaps: List[Dict], n: int) -> List[Dict]:
+        """Largest n gaps by absolute size without sorting the whole list (stable for ties)"""
+        return heapq.nlargest(n, gaps, key=lambda gap: abs(gap['gap_percent']))
+    
+    def _chunk_messages(self, messages: List[str]) -> List[str]:
+        """Join messages with a separator, splitting so no chunk exceeds Telegram's limit"""
+        chunks = []
+        current = ""
+        
+        for message in messages:
+            candidate = f"{current}{ALERT_SEPARATOR}{message}" if current else message
+            if len(candidate) <= MAX_MESSAGE_LENGTH:
+                current = candidate
+            else:
+                if current:
+                    chunks.append(current)
+                current = message[:MAX_MESSAGE_LENGTH]
+        
+        if current:
+            chunks.append(current)
+        
+        return chunks
             
     async def send_summary(self, gaps: List[Dict]):
         """Send daily summary of gaps"""
         if not gaps:
             message = "📊 *Resumen del Día*\n\nNo se detectaron gaps significativos hoy."
         else:
-            message = f"📊 *Resumen del Día*\n\n"
-            message += f"Total gaps detectados: {len(gaps)}\n\n"
+            parts = [
+                "📊 *Resumen del Día*\n\n",
+                f"Total gaps detectados: {len(gaps)}\n\n",
+                "*Top 3 Gaps:*\n",
+            ]
             
             # Top 3 gaps
-            message += "*Top 3 Gaps:*\n"
-            for i, gap in enumerate(gaps[:3], 1):
-                emoji = "🥇" if i == 1 else "🥈" if i == 2 else "🥉"
-                message += f"{emoji} ${gap['symbol']}: {gap['gap_direction']} {abs(gap['gap_percent']):.1f}%\n"
+            for emoji, gap in zip(("🥇", "🥈", "🥉"), self._top_gaps(gaps, 3)):
+                parts.append(f"{emoji} ${gap['symbol']}: {gap['gap_direction']} {abs(gap['gap_percent']):.1f}%\n")
+            
+            message = "".join(parts)
                 
         await self.send_alert(message)
         
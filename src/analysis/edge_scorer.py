@@ -1,7 +1,85 @@
-from typing import Dict, Optional, List
+import operator
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from dataclasses import dataclass, fields
+from typing import Dict, Optional, List, Sequence
 from datetime import datetime
+from types import MappingProxyType
 from src.utils.logger import setup_logger
 
+# Score tiers as (sorted thresholds, bonus per tier); bonuses has one more
+# entry than thresholds, for values below the first threshold
+_GAP_SIZE_TIERS = ((5, 7, 10, 15, 20, 30), (-10, 2, 5, 10, 15, 20, 25))          # gap % >= threshold
+_VOLUME_TIERS = ((100_000, 200_000, 500_000, 1_000_000), (0, 2, 5, 10, 15))      # volume > threshold
+_CONTINUATION_TIERS = ((60, 70, 80), (0, 5, 10, 15))                             # continuation % > threshold
+_GAP_FILL_TIERS = ((20, 30), (10, 5, 0))                                         # gap fill % < threshold
+_VOLUME_FACTOR_TIERS = ((1.5, 2.5, 4.0), (0, 2, 5, 8))                           # volume factor > threshold
+_OVERALL_EDGE_TIERS = ((65, 75), (0, 3, 5))                                      # overall edge > threshold
+_SQUEEZE_TIERS = ((70, 80, 90), (0, 5, 10, 15))                                  # squeeze potential > threshold
+_TURNOVER_TIERS = ((0.1, 0.3, 0.5), (0, 5, 10, 15))                              # volume / float > threshold
+_TOTAL_GAPS_TIERS = ((10, 20, 50), (10, 20, 30, 40))                             # gaps analyzed > threshold
+
+# Classification bins: label index = bisect_right(thresholds, value)
+_CONFIDENCE_THRESHOLDS = (40, 60, 80)
+_CONFIDENCE_LABELS = ("Low", "Medium", "High", "Very High")
+_CONFIDENCE_FACTORS = {"Very High": 1.0, "High": 0.95, "Medium": 0.85}
+_EDGE_THRESHOLDS = (45, 55, 65, 75, 85)
+_EDGE_LABELS = ("Negative Edge", "Neutral", "Modest Edge", "Good Edge", "Strong Edge", "Exceptional Edge")
+
+# Component order shared by the score tuple and the weight lookups
+_WEIGHT_KEYS = ('flash_research_edge', 'gap_characteristics', 'float_dynamics',
+                'ai_pattern_recognition', 'news_catalyst')
+
+
+def _tier_bonus(value: float, tiers: Sequence[Sequence[float]], inclusive: bool = False) -> float:
+    """Look up the bonus for value; inclusive matches value >= threshold, otherwise value > threshold"""
+    thresholds, bonuses = tiers
+    index = bisect_right(thresholds, value) if inclusive else bisect_left(thresholds, value)
+    return bonuses[index]
+
+
+@dataclass(frozen=True, slots=True)
+class FlashAnalysis:
+    """Flash Research fields used for scoring"""
+    has_flash_data: bool = False
+    gap_edge_score: float = 50
+    gap_continuation_rate: float = 50
+    gap_fill_rate: float = 50
+    volume_factor: float = 1.0
+    overall_edge_score: float = 50
+    total_gaps_analyzed: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class FloatAnalysis:
+    """Float screener fields used for scoring"""
+    is_nanofloat: bool = False
+    is_microfloat: bool = False
+    squeeze_potential: float = 0
+    float_shares: float = 0
+
+
+@dataclass(frozen=True, slots=True)
+class NewsAnalysis:
+    """News catalyst fields used for scoring"""
+    has_catalyst: bool = False
+    catalyst_strength: float = 0
+    catalyst_type: str = 'Unknown'
+
+
+@dataclass(frozen=True, slots=True)
+class AIAnalysis:
+    """AI pattern recognition fields used for scoring"""
+    setup_quality: float = 50
+    confidence: float = 50
+    pattern_type: str = ''
+
+
+def _from_dict(cls, data: Optional[Dict]):
+    """Build a scoring struct from an analysis dict, keeping defaults for missing keys"""
+    data = data or {}
+    return cls(**{f.name: data[f.name] for f in fields(cls) if f.name in data})
+
 
 class EdgeScorer:
     """
@@ -9,17 +87,37 @@ class EdgeScorer:
     to maximize trading edge and probability of success
     """
     
+    # Edge scoring weights (total = 100%); invariant, so shared by every
+    # instance and every result as a read-only view instead of being rebuilt
+    SCORE_WEIGHTS = MappingProxyType({
+        'flash_research_edge': 0.40,  # Historical statistics (highest weight)
+        'gap_characteristics': 0.25,  # Gap size, direction, timing
+        'float_dynamics': 0.20,       # Float size and turnover
+        'ai_pattern_recognition': 0.10, # AI-identified patterns
+        'news_catalyst': 0.05          # News timing and strength
+    })
+    
     def __init__(self):
         self.logger = setup_logger('edge_scorer')
+        self.weights = self.SCORE_WEIGHTS
         
-        # Edge scoring weights (total = 100%)
-        self.weights = {
-            'flash_research_edge': 0.40,  # Historical statistics (highest weight)
-            'gap_characteristics': 0.25,  # Gap size, direction, timing
-            'float_dynamics': 0.20,       # Float size and turnover
-            'ai_pattern_recognition': 0.10, # AI-identified patterns
-            'news_catalyst': 0.05          # News timing and strength
-        }
+        # Weights in _WEIGHT_KEYS order so totals are a single dot product
+        self._weight_vec = tuple(self.weights[key] for key in _WEIGHT_KEYS)
+        
+        # Timestamp shared by every result in the current scan batch
+        self._batch_timestamp: Optional[str] = None
+    
+    @contextmanager
+    def batch(self, timestamp: Optional[str] = None):
+        """Scope a scan batch: results scored inside the block share one timestamp"""
+        self._batch_timestamp = timestamp or datetime.now().isoformat()
+        try:
+            yield self._batch_timestamp
+        finally:
+            self._batch_timestamp = None
+    
+    def _result_timestamp(self) -> str:
+        return self._batch_timestamp or datetime.now().isoformat()
     
     def calculate_edge_score(self, gap_data: Dict, flash_analysis: Dict, 
                            float_analysis: Dict, news_analysis: Dict, 
@@ -28,108 +126,94 @@ class EdgeScorer:
         Calculate comprehensive edge score based on all available data
         Returns score (0-100) with breakdown and confidence level
         """
-        try:
-            symbol = gap_data.get('symbol', 'Unknown')
-            self.logger.info(f"Calculating edge score for {symbol}")
-            
-            # Calculate individual component scores
-            flash_score = self._score_flash_research_edge(flash_analysis)
-            gap_score = self._score_gap_characteristics(gap_data)
-            float_score = self._score_float_dynamics(float_analysis, gap_data)
-            ai_score = self._score_ai_pattern_recognition(ai_analysis)
-            news_score = self._score_news_catalyst(news_analysis)
-            
-            # Calculate weighted total score
-            total_score = (
-                flash_score * self.weights['flash_research_edge'] +
-                gap_score * self.weights['gap_characteristics'] +
-                float_score * self.weights['float_dynamics'] +
-                ai_score * self.weights['ai_pattern_recognition'] +
-                news_score * self.weights['news_catalyst']
-            )
-            
-            # Calculate confidence level based on data availability
-            confidence = self._calculate_confidence(
-                flash_analysis, float_analysis, news_analysis, ai_analysis
-            )
-            
-            # Generate edge classification
-            edge_class = self._classify_edge(total_score, confidence)
-            
-            # Generate trading recommendations
-            recommendations = self._generate_edge_recommendations(
-                total_score, confidence, flash_analysis, gap_data
-            )
-            
-            edge_result = {
-                'symbol': symbol,
-                'timestamp': datetime.now().isoformat(),
-                'total_edge_score': round(total_score, 1),
-                'confidence_level': confidence,
-                'edge_classification': edge_class,
-                'component_scores': {
-                    'flash_research': round(flash_score, 1),
-                    'gap_characteristics': round(gap_score, 1),
-                    'float_dynamics': round(float_score, 1),
-                    'ai_pattern': round(ai_score, 1),
-                    'news_catalyst': round(news_score, 1)
-                },
-                'score_weights': self.weights,
-                'trading_recommendations': recommendations,
-                'edge_summary': self._generate_edge_summary(total_score, confidence, flash_analysis)
-            }
-            
-            self.logger.info(f"Edge score calculated for {symbol}: {total_score:.1f} ({edge_class})")
-            return edge_result
-            
-        except Exception as e:
-            self.logger.error(f"Error calculating edge score: {str(e)}")
-            return self._create_fallback_edge_score(gap_data)
+        # Validate once up front; anything else wrong is a bug and should surface
+        if not isinstance(gap_data, dict) or gap_data.get('symbol') is None:
+            self.logger.error("Invalid gap data for edge score - missing symbol")
+            return self._create_fallback_edge_score(gap_data or {})
+        
+        symbol = gap_data['symbol']
+        self.logger.info("Calculating edge score for %s", symbol)
+        
+        # Unpack the analysis dicts once; scorers read typed attributes
+        flash_analysis = _from_dict(FlashAnalysis, flash_analysis)
+        float_analysis = _from_dict(FloatAnalysis, float_analysis) if float_analysis else None
+        news_analysis = _from_dict(NewsAnalysis, news_analysis)
+        ai_analysis = _from_dict(AIAnalysis, ai_analysis) if ai_analysis else None
+        
+        # Calculate individual component scores
+        flash_score = self._score_flash_research_edge(flash_analysis)
+        gap_score = self._score_gap_characteristics(gap_data)
+        float_score = self._score_float_dynamics(float_analysis, gap_data)
+        ai_score = self._score_ai_pattern_recognition(ai_analysis)
+        news_score = self._score_news_catalyst(news_analysis)
+        
+        # Calculate weighted total score (scores ordered like _WEIGHT_KEYS)
+        scores = (flash_score, gap_score, float_score, ai_score, news_score)
+        total_score = sum(map(operator.mul, scores, self._weight_vec))
+        
+        # Calculate confidence level based on data availability
+        confidence = self._calculate_confidence(
+            flash_analysis, float_analysis, news_analysis, ai_analysis
+        )
+        
+        # Generate edge classification
+        edge_class = self._classify_edge(total_score, confidence)
+        
+        # Generate trading recommendations
+        recommendations = self._generate_edge_recommendations(
+            total_score, confidence, flash_analysis, gap_data
+        )
+        
+        edge_result = {
+            'symbol': symbol,
+            'timestamp': self._result_timestamp(),
+            'total_edge_score': round(total_score, 1),
+            'confidence_level': confidence,
+            'edge_classification': edge_class,
+            'component_scores': {
+                'flash_research': round(flash_score, 1),
+                'gap_characteristics': round(gap_score, 1),
+                'float_dynamics': round(float_score, 1),
+                'ai_pattern': round(ai_score, 1),
+                'news_catalyst': round(news_score, 1)
+            },
+            'score_weights': self.SCORE_WEIGHTS,
+            'trading_recommendations': recommendations,
+            'edge_summary': self._generate_edge_summary(edge_class, total_score, confidence, flash_analysis)
+        }
+        
+        self.logger.info("Edge score calculated for %s: %.1f (%s)", symbol, total_score, edge_class)
+        return edge_result
+        
     
-    def _score_flash_research_edge(self, flash_analysis: Dict) -> float:
+    def _score_flash_research_edge(self, flash_analysis: FlashAnalysis) -> float:
         """Score based on Flash Research historical statistics (0-100)"""
-        if not flash_analysis.get('has_flash_data', False):
+        if not flash_analysis.has_flash_data:
             return 50.0  # Neutral score when no data
         
         score = 50.0  # Base score
         
         # Historical gap edge score (primary factor)
-        gap_edge_score = flash_analysis.get('gap_edge_score', 50)
+        gap_edge_score = flash_analysis.gap_edge_score
         score = gap_edge_score  # Direct use of Flash Research calculated edge
         
         # Continuation rate boost
-        continuation_rate = flash_analysis.get('gap_continuation_rate', 50)
-        if continuation_rate > 80:
-            score += 15
-        elif continuation_rate > 70:
-            score += 10
-        elif continuation_rate > 60:
-            score += 5
+        continuation_rate = flash_analysis.gap_continuation_rate
+        score += _tier_bonus(continuation_rate, _CONTINUATION_TIERS)
         
         # Gap fill rate adjustment (lower is better for momentum)
-        gap_fill_rate = flash_analysis.get('gap_fill_rate', 50)
-        if gap_fill_rate < 20:
-            score += 10
-        elif gap_fill_rate < 30:
-            score += 5
-        elif gap_fill_rate > 80:
+        gap_fill_rate = flash_analysis.gap_fill_rate
+        score += _tier_bonus(gap_fill_rate, _GAP_FILL_TIERS, inclusive=True)
+        if gap_fill_rate > 80:
             score -= 10
         
         # Volume factor during gaps
-        volume_factor = flash_analysis.get('volume_factor', 1.0)
-        if volume_factor > 4.0:
-            score += 8
-        elif volume_factor > 2.5:
-            score += 5
-        elif volume_factor > 1.5:
-            score += 2
+        volume_factor = flash_analysis.volume_factor
+        score += _tier_bonus(volume_factor, _VOLUME_FACTOR_TIERS)
         
         # Historical performance
-        overall_edge = flash_analysis.get('overall_edge_score', 50)
-        if overall_edge > 75:
-            score += 5
-        elif overall_edge > 65:
-            score += 3
+        overall_edge = flash_analysis.overall_edge_score
+        score += _tier_bonus(overall_edge, _OVERALL_EDGE_TIERS)
         
         return min(100.0, max(0.0, score))
     
@@ -141,41 +225,21 @@ class EdgeScorer:
         gap_direction = gap_data.get('gap_direction', 'UP')
         volume = gap_data.get('volume', 0)
         
-        # Gap size scoring
-        if gap_percent >= 30:
-            score += 25  # Mega gap
-        elif gap_percent >= 20:
-            score += 20  # Large gap
-        elif gap_percent >= 15:
-            score += 15  # Significant gap
-        elif gap_percent >= 10:
-            score += 10  # Good gap
-        elif gap_percent >= 7:
-            score += 5   # Moderate gap
-        elif gap_percent >= 5:
-            score += 2   # Small gap
-        else:
-            score -= 10  # Too small
+        # Gap size scoring (too small -> mega gap)
+        score += _tier_bonus(gap_percent, _GAP_SIZE_TIERS, inclusive=True)
         
         # Direction bias (slight preference for gaps up in bull market)
         if gap_direction == 'UP':
             score += 2
         
         # Volume confirmation
-        if volume > 1_000_000:
-            score += 15
-        elif volume > 500_000:
-            score += 10
-        elif volume > 200_000:
-            score += 5
-        elif volume > 100_000:
-            score += 2
-        elif volume < 10_000:
+        score += _tier_bonus(volume, _VOLUME_TIERS)
+        if volume < 10_000:
             score -= 5
         
         return min(100.0, max(0.0, score))
     
-    def _score_float_dynamics(self, float_analysis: Dict, gap_data: Dict) -> float:
+    def _score_float_dynamics(self, float_analysis: Optional[FloatAnalysis], gap_data: Dict) -> float:
         """Score based on float characteristics and dynamics (0-100)"""
         score = 50.0
         
@@ -183,49 +247,39 @@ class EdgeScorer:
             return score
         
         # Float size impact
-        if float_analysis.get('is_nanofloat', False):
+        if float_analysis.is_nanofloat:
             score += 30  # Nano float has highest impact
-        elif float_analysis.get('is_microfloat', False):
+        elif float_analysis.is_microfloat:
             score += 20  # Micro float significant impact
         
         # Squeeze potential
-        squeeze_potential = float_analysis.get('squeeze_potential', 0)
-        if squeeze_potential > 90:
-            score += 15
-        elif squeeze_potential > 80:
-            score += 10
-        elif squeeze_potential > 70:
-            score += 5
+        squeeze_potential = float_analysis.squeeze_potential
+        score += _tier_bonus(squeeze_potential, _SQUEEZE_TIERS)
         
         # Float turnover vs volume
-        float_shares = float_analysis.get('float_shares', 0)
+        float_shares = float_analysis.float_shares
         volume = gap_data.get('volume', 0)
         
         if float_shares > 0:
             turnover_ratio = volume / float_shares
-            if turnover_ratio > 0.5:  # 50%+ of float traded
-                score += 15
-            elif turnover_ratio > 0.3:  # 30%+ turnover
-                score += 10
-            elif turnover_ratio > 0.1:  # 10%+ turnover
-                score += 5
+            score += _tier_bonus(turnover_ratio, _TURNOVER_TIERS)
         
         return min(100.0, max(0.0, score))
     
-    def _score_ai_pattern_recognition(self, ai_analysis: Optional[Dict]) -> float:
+    def _score_ai_pattern_recognition(self, ai_analysis: Optional[AIAnalysis]) -> float:
         """Score based on AI pattern recognition confidence (0-100)"""
         if not ai_analysis:
             return 50.0
         
         # Use AI setup quality as base score
-        setup_quality = ai_analysis.get('setup_quality', 50)
-        confidence = ai_analysis.get('confidence', 50)
+        setup_quality = ai_analysis.setup_quality
+        confidence = ai_analysis.confidence
         
         # Weight by AI confidence
         ai_score = (setup_quality * 0.7) + (confidence * 0.3)
         
         # Pattern type bonuses
-        pattern_type = ai_analysis.get('pattern_type', '')
+        pattern_type = ai_analysis.pattern_type
         if pattern_type in ['Float Squeeze', 'Statistical Edge']:
             ai_score += 10
         elif pattern_type in ['News Catalyst', 'Mega Gap']:
@@ -233,15 +287,15 @@ class EdgeScorer:
         
         return min(100.0, max(0.0, ai_score))
     
-    def _score_news_catalyst(self, news_analysis: Dict) -> float:
+    def _score_news_catalyst(self, news_analysis: NewsAnalysis) -> float:
         """Score based on news catalyst strength and timing (0-100)"""
         score = 50.0
         
-        if not news_analysis.get('has_catalyst', False):
+        if not news_analysis.has_catalyst:
             return score
         
-        catalyst_strength = news_analysis.get('catalyst_strength', 0)
-        catalyst_type = news_analysis.get('catalyst_type', 'Unknown')
+        catalyst_strength = news_analysis.catalyst_strength
+        catalyst_type = news_analysis.catalyst_type
         
         # Base catalyst score
         score = catalyst_strength
@@ -254,78 +308,45 @@ class EdgeScorer:
         
         return min(100.0, max(0.0, score))
     
-    def _calculate_confidence(self, flash_analysis: Dict, float_analysis: Dict, 
-                            news_analysis: Dict, ai_analysis: Optional[Dict]) -> str:
+    def _calculate_confidence(self, flash_analysis: FlashAnalysis, float_analysis: Optional[FloatAnalysis], 
+                            news_analysis: NewsAnalysis, ai_analysis: Optional[AIAnalysis]) -> str:
         """Calculate confidence level based on data availability and quality"""
         confidence_score = 0
         
         # Flash Research data (highest impact on confidence)
-        if flash_analysis.get('has_flash_data', False):
-            total_gaps = flash_analysis.get('total_gaps_analyzed', 0)
-            if total_gaps > 50:
-                confidence_score += 40
-            elif total_gaps > 20:
-                confidence_score += 30
-            elif total_gaps > 10:
-                confidence_score += 20
-            else:
-                confidence_score += 10
+        if flash_analysis.has_flash_data:
+            total_gaps = flash_analysis.total_gaps_analyzed
+            confidence_score += _tier_bonus(total_gaps, _TOTAL_GAPS_TIERS)
         
         # Float data availability
-        if float_analysis and float_analysis.get('float_shares', 0) > 0:
+        if float_analysis and float_analysis.float_shares > 0:
             confidence_score += 20
         
         # AI analysis availability
-        if ai_analysis and ai_analysis.get('confidence', 0) > 60:
+        if ai_analysis and ai_analysis.confidence > 60:
             confidence_score += 20
         elif ai_analysis:
             confidence_score += 10
         
         # News data
-        if news_analysis.get('has_catalyst', False):
+        if news_analysis.has_catalyst:
             confidence_score += 10
         
         # Volume data quality
         confidence_score += 10  # Always have volume data from gap
         
-        if confidence_score >= 80:
-            return "Very High"
-        elif confidence_score >= 60:
-            return "High"
-        elif confidence_score >= 40:
-            return "Medium"
-        else:
-            return "Low"
+        return _CONFIDENCE_LABELS[bisect_right(_CONFIDENCE_THRESHOLDS, confidence_score)]
     
     def _classify_edge(self, score: float, confidence: str) -> str:
         """Classify the overall edge level"""
         
-        # Adjust score based on confidence
-        adjusted_score = score
-        if confidence == "Very High":
-            adjusted_score *= 1.0
-        elif confidence == "High":
-            adjusted_score *= 0.95
-        elif confidence == "Medium":
-            adjusted_score *= 0.85
-        else:  # Low confidence
-            adjusted_score *= 0.7
-        
-        if adjusted_score >= 85:
-            return "Exceptional Edge"
-        elif adjusted_score >= 75:
-            return "Strong Edge"
-        elif adjusted_score >= 65:
-            return "Good Edge"
-        elif adjusted_score >= 55:
-            return "Modest Edge"
-        elif adjusted_score >= 45:
-            return "Neutral"
-        else:
-            return "Negative Edge"
+        # Adjust score based on confidence (anything unrecognised counts as Low)
+        adjusted_score = score * _CONFIDENCE_FACTORS.get(confidence, 0.7)
+        
+        return _EDGE_LABELS[bisect_right(_EDGE_THRESHOLDS, adjusted_score)]
     
     def _generate_edge_recommendations(self, score: float, confidence: str, 
-                                     flash_analysis: Dict, gap_data: Dict) -> List[str]:
+                                     flash_analysis: FlashAnalysis, gap_data: Dict) -> List[str]:
         """Generate specific trading recommendations based on edge analysis"""
         recommendations = []
         
@@ -341,9 +362,9 @@ class EdgeScorer:
             recommendations.append("Limited edge - consider passing or very small position")
         
         # Flash Research specific recommendations
-        if flash_analysis.get('has_flash_data', False):
-            continuation_rate = flash_analysis.get('gap_continuation_rate', 50)
-            gap_fill_rate = flash_analysis.get('gap_fill_rate', 50)
+        if flash_analysis.has_flash_data:
+            continuation_rate = flash_analysis.gap_continuation_rate
+            gap_fill_rate = flash_analysis.gap_fill_rate
             
             if continuation_rate > 75:
                 recommendations.append(f"Strong {continuation_rate:.0f}% historical continuation rate")
@@ -363,13 +384,12 @@ class EdgeScorer:
         
         return recommendations
     
-    def _generate_edge_summary(self, score: float, confidence: str, flash_analysis: Dict) -> str:
+    def _generate_edge_summary(self, edge_class: str, score: float, confidence: str,
+                               flash_analysis: FlashAnalysis) -> str:
         """Generate concise edge summary for alerts"""
-        edge_class = self._classify_edge(score, confidence)
-        
-        if flash_analysis.get('has_flash_data', False):
-            flash_score = flash_analysis.get('gap_edge_score', 50)
-            continuation_rate = flash_analysis.get('gap_continuation_rate', 50)
+        if flash_analysis.has_flash_data:
+            flash_score = flash_analysis.gap_edge_score
+            continuation_rate = flash_analysis.gap_continuation_rate
             
             summary = f"{edge_class} (Score: {score:.0f}/100, Flash: {flash_score}/100, Cont: {continuation_rate:.0f}%)"
         else:
@@ -381,7 +401,7 @@ class EdgeScorer:
         """Create fallback edge score when calculation fails"""
         return {
             'symbol': gap_data.get('symbol', 'Unknown'),
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': self._result_timestamp(),
             'total_edge_score': 50.0,
             'confidence_level': 'Low',
             'edge_classification': 'Analysis Error',
@@ -1,75 +1,547 @@
-from typing import Dict, List, Optional, Tuple
-from datetime import datetime
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, field, fields
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
+from datetime import datetime, timezone
+import os
+import json
+import hashlib
+import sqlite3
 import asyncio
+import functools
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import time
+import numpy as np
+import pandas as pd
 from src.api.openai_client import OpenAIClient
 from src.api.flash_research_client import FlashResearchClient
 from src.scanners.news_scanner import NewsScanner
+from src.utils.async_runner import run_sync
 from src.utils.logger import setup_logger
 
+# How long news and Flash Research lookups are reused before refetching, and
+# how many keys (and per-key fetch locks) are kept, least recently used evicted
+LOOKUP_CACHE_TTL = 300  # 5 minutes
+LOOKUP_CACHE_SIZE = 1024
+
+# Repo-level .cache/ so the database doesn't follow the working directory
+_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), '.cache')
+
+# Finished analyses persisted per (symbol, minute, inputs hash) so replays of the
+# same scan skip all network/LLM work, even across restarts; rows older than a
+# day are pruned. Bump the schema version when the table layout changes.
+ANALYSIS_DB_PATH = os.getenv('PATTERN_ANALYSIS_DB', os.path.join(_CACHE_DIR, 'pattern_analyses.db'))
+ANALYSIS_DB_RETENTION_MINUTES = 24 * 60
+ANALYSIS_DB_SCHEMA_VERSION = 2
+
+# Longest a streamed analysis may take before its fallback is yielded instead
+STREAM_ANALYSIS_TIMEOUT = 15.0  # seconds
+
+# Per-provider (hedge after, hard timeout) in seconds: a duplicate request is
+# sent once the first has run past roughly its p95 latency. Each client also
+# times out its own requests within the hard timeout, so an abandoned attempt
+# frees its pool thread instead of hanging on it. Flash Research is never
+# hedged (its requests are rate limited), so only its hard timeout applies
+_PROVIDER_TIMEOUTS = {
+    'flash_research': (4.0, 15.0),
+    'openai': (10.0, 30.0),
+}
+
+# Blocking provider calls in flight at once; each may run a primary and a
+# hedged attempt, so the hedge pool has room for both and a call never queues
+# (queue time would count against its hedge / timeout budget)
+IO_WORKERS = 16
+HEDGE_WORKERS = 2 * IO_WORKERS
+
+# Only setups at least this strong are worth a duplicate (billable) LLM request
+AI_HEDGE_MIN_QUALITY = 75
+
+# Score tiers as (sorted thresholds, value per tier); values has one more
+# entry than thresholds, for values below the first threshold
+_CATALYST_TIERS = ((20, 30, 50), (20, 50, 70, 90))                      # score >= t
+_CATALYST_TYPE_TIERS = ((20, 30, 50), ('Minimal', 'Weak', 'Moderate', 'Strong'))  # score >= t
+_WIN_RATE_TIERS = ((50, 60, 70), ('Poor', 'Average', 'Good', 'Excellent'))  # win rate % >= t
+_GAP_FACTOR_TIERS = ((10, 20), ('Moderate gap', 'Significant gap', 'Large gap'))  # gap % >= t
+_GAP_RISK_TIERS = ((10, 20, 30), (0, 1, 2, 3))                           # gap % >= t
+_RISK_LEVEL_TIERS = ((2, 4), ('Low', 'Medium', 'High'))                  # risk score >= t
+_GAP_QUALITY_TIERS = ((5, 7, 10, 15, 20, 30), (10, 15, 20, 25, 30, 35, 40))  # gap % >= t
+_VOLUME_QUALITY_TIERS = ((50_000, 100_000, 200_000, 500_000), (0, 3, 5, 7, 10))  # volume > t
+_FLASH_EDGE_TIERS = ((55, 60, 70, 80), (0, 5, 8, 12, 15))                # edge score >= t
+_CONTINUATION_TIERS = ((65, 75), (0, 2, 3))                              # continuation % > t
+
+# Patterns worth an AI read even when their local setup quality is below the gate
+_AI_PRIORITY_PATTERNS = frozenset({"Float Squeeze", "Mega Gap", "News Catalyst"})
+
+
+class _AnalysisView:
+    """Base for the frozen analysis structs passed between PatternAnalyzer helpers"""
+    __slots__ = ()
+    
+    def to_dict(self) -> Dict:
+        """Plain dict form for the analysis result returned to callers"""
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+
+@dataclass(frozen=True, slots=True)
+class FloatView(_AnalysisView):
+    """Float characteristics; defaults describe missing float data"""
+    category: str = 'Unknown'
+    is_microfloat: bool = False
+    is_nanofloat: bool = False
+    squeeze_potential: int = 0
+    float_shares: float = 0
+
+
+@dataclass(frozen=True, slots=True)
+class NewsView(_AnalysisView):
+    """News catalyst strength; defaults describe no catalyst"""
+    has_catalyst: bool = False
+    catalyst_strength: int = 0
+    catalyst_type: str = 'None'
+    headline_count: int = 0
+    catalyst_score: float = 0
+
+
+@dataclass(frozen=True, slots=True)
+class FlashView(_AnalysisView):
+    """Flash Research statistics; defaults describe missing Flash data"""
+    has_flash_data: bool = False
+    gap_edge_score: float = 50
+    historical_performance: str = 'Unknown'
+    gap_continuation_rate: float = 50
+    gap_fill_rate: float = 50
+    volume_factor: float = 1.0
+    statistical_edge: str = 'Insufficient data'
+    total_gaps_analyzed: int = 0
+    avg_gap_size: float = 0
+    overall_edge_score: float = 50
+    trading_recommendations: List[str] = field(default_factory=list)
+
+
+def _utc_timestamp() -> str:
+    """Current time as an unambiguous UTC ISO string"""
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _minute_bucket() -> int:
+    """Wall-clock minute used to key persisted analyses"""
+    return int(time.time() // 60)
+
+
+def _inputs_hash(gap_data: Dict, float_data: Optional[Dict]) -> str:
+    """Stable digest of an analysis' inputs, for the persisted analysis key"""
+    blob = json.dumps([gap_data, float_data], sort_keys=True, default=str)
+    return hashlib.blake2b(blob.encode(), digest_size=16).hexdigest()
+
+
+def _safe_call(fn: Callable, *args, **kwargs) -> Tuple[Any, Optional[str]]:
+    """Call fn and return (result, None), or (None, error message) if it raised"""
+    try:
+        return fn(*args, **kwargs), None
+    except Exception as e:
+        return None, str(e)
+
+
+def _tier_value(value: float, tiers: Sequence[Sequence], inclusive: bool = False):
+    """Look up the value for a tier; inclusive matches value >= threshold, otherwise value > threshold"""
+    thresholds, values = tiers
+    index = bisect_right(thresholds, value) if inclusive else bisect_left(thresholds, value)
+    return values[index]
+
+
+def _tier_values(values: np.ndarray, tiers: Sequence[Sequence], inclusive: bool = False) -> np.ndarray:
+    """Vectorized _tier_value over an array of values"""
+    thresholds, tier_values = tiers
+    return np.take(tier_values, np.searchsorted(thresholds, values, side='right' if inclusive else 'left'))
+
 
 class PatternAnalyzer:
     """
     AI-powered pattern analyzer for small-cap trading setups
     """
     
-    def __init__(self):
+    # Local playbook text per pattern type, filled with str.format_map
+    _PLAYBOOK_TEMPLATES = {
+        "Float Squeeze": "Small float ({float_m:.1f}M) with {gap:.1f}% gap. "
+                         "Limited supply can amplify moves. Watch for volume confirmation and momentum continuation.",
+        
+        "News Catalyst": "News-driven {gap:.1f}% gap with {catalyst} catalyst. "
+                         "Event-based momentum often creates follow-through opportunities in first hour.",
+        
+        "Mega Gap": "Exceptional {gap:.1f}% gap suggests significant development. "
+                    "Large gaps often see initial profit-taking followed by potential resumption.",
+        
+        "Gap & Go": "Classic {gap:.1f}% {direction} gap setup. "
+                    "Look for volume confirmation and clean breakout above/below gap levels.",
+        
+        "Micro Float": "Micro float ({float_m:.1f}M shares) with {gap:.1f}% move. "
+                       "Small supply can create volatile price action on modest volume.",
+        
+        "Statistical Edge": "{gap:.1f}% gap with strong historical edge (Score: {edge_score}/100). "
+                            "Statistics show {statistical_edge}.",
+        
+        "Standard Gap": "{gap:.1f}% gap - monitor for volume and momentum confirmation. "
+                        "Standard gap setups require technical confirmation for continuation."
+    }
+    
+    def __init__(self, ai_gate_threshold: int = 60):
         self.logger = setup_logger('pattern_analyzer')
         self.openai_client = OpenAIClient()
         self.news_scanner = NewsScanner()
         self.flash_research = FlashResearchClient()
         
+        # Provider calls resolved once instead of on every analysis
+        self._scan_news = self.news_scanner.scan_symbol_news
+        self._get_flash = self.flash_research.get_enhanced_analysis
+        self._ai_analyze = self.openai_client.analyze_trading_pattern
+        
         # Pattern thresholds
         self.microfloat_threshold = 5_000_000  # 5M shares
         self.nanofloat_threshold = 1_000_000   # 1M shares
         self.high_gap_threshold = 15.0         # 15%
         self.mega_gap_threshold = 30.0         # 30%
+        
+        # Squeeze potential by float size (float_shares < threshold)
+        self._squeeze_tiers = (
+            (self.nanofloat_threshold, self.microfloat_threshold, 10_000_000, 25_000_000),
+            (95, 80, 60, 40, 20)
+        )
+        
+        # Local setup quality needed before spending an AI call
+        self.ai_gate_threshold = ai_gate_threshold
+        self.ai_calls_skipped_by_gate = 0
+        
+        # TTL cache for news/Flash Research lookups: key -> (expiry, value), with
+        # a lock per key so concurrent misses fetch only once; both in LRU order
+        self._lookup_cache: OrderedDict[Tuple, Tuple[float, Dict]] = OrderedDict()
+        self._lookup_locks: OrderedDict[Tuple, threading.Lock] = OrderedDict()
+        self._lookup_guard = threading.Lock()
+        
+        # Bounded pools for the blocking provider clients: _io_pool keeps them off
+        # the event loop, _hedge_pool runs each call under its timeout / hedge
+        self._io_pool = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix='pat-io')
+        self._hedge_pool = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix='pat-hedge')
+        
+        # Second-level disk cache beneath the in-memory lookups, opened on first use
+        self._db_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_opened = False
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def close(self):
+        """Shut down the provider worker pools and the analysis database"""
+        self._io_pool.shutdown(wait=False, cancel_futures=True)
+        self._hedge_pool.shutdown(wait=False, cancel_futures=True)
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+            self._db = None
+            self._db_opened = True  # don't reopen after close
+    
+    def _open_analysis_db(self, path: str) -> Optional[sqlite3.Connection]:
+        """Open (creating if needed) the persisted analysis cache; None disables it"""
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            db = sqlite3.connect(path, check_same_thread=False)
+            if db.execute("PRAGMA user_version").fetchone()[0] != ANALYSIS_DB_SCHEMA_VERSION:
+                db.execute("DROP TABLE IF EXISTS analyses")
+                db.execute(f"PRAGMA user_version = {ANALYSIS_DB_SCHEMA_VERSION}")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS analyses ("
+                "symbol TEXT, bucket INTEGER, inputs TEXT, payload TEXT, "
+                "PRIMARY KEY (symbol, bucket, inputs))"
+            )
+            db.execute(
+                "DELETE FROM analyses WHERE bucket < ?",
+                (_minute_bucket() - ANALYSIS_DB_RETENTION_MINUTES,)
+            )
+            db.commit()
+            return db
+        except sqlite3.Error as e:
+            self.logger.warning(f"Analysis cache disabled ({path}): {str(e)}")
+            return None
+    
+    def _analysis_db(self) -> Optional[sqlite3.Connection]:
+        """The analysis database, opened on first use; call with _db_lock held"""
+        if not self._db_opened:
+            self._db_opened = True
+            self._db = self._open_analysis_db(ANALYSIS_DB_PATH)
+        return self._db
+    
+    def _load_analysis(self, symbol: str, bucket: int, inputs: str) -> Optional[Dict]:
+        """Analysis already stored for these inputs in this minute, if any"""
+        with self._db_lock:
+            db = self._analysis_db()
+            if db is None:
+                return None
+            row = db.execute(
+                "SELECT payload FROM analyses WHERE symbol = ? AND bucket = ? AND inputs = ?",
+                (symbol, bucket, inputs)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def _store_analysis(self, symbol: str, bucket: int, inputs: str, analysis: Dict):
+        payload = json.dumps(analysis, default=str)
+        with self._db_lock:
+            db = self._analysis_db()
+            if db is None:
+                return
+            db.execute(
+                "INSERT OR REPLACE INTO analyses (symbol, bucket, inputs, payload) VALUES (?, ?, ?, ?)",
+                (symbol, bucket, inputs, payload)
+            )
+            db.commit()
     
-    def analyze_gap_setup(self, gap_data: Dict, float_data: Optional[Dict] = None) -> Dict:
+    async def _io(self, fn: Callable, *args, **kwargs):
+        """Run a blocking call on the bounded I/O pool"""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._io_pool, functools.partial(fn, *args, **kwargs)
+        )
+    
+    def analyze_gap_setup(self, gap_data: Dict, float_data: Optional[Dict] = None,
+                          timestamp: Optional[str] = None) -> Dict:
         """
         Comprehensive analysis of a gap trading setup
         """
+        return run_sync(self.analyze_gap_setup_async(gap_data, float_data, timestamp))
+    
+    async def analyze_gap_setup_async(self, gap_data: Dict, float_data: Optional[Dict] = None,
+                                      timestamp: Optional[str] = None) -> Dict:
+        """
+        Comprehensive analysis of a gap trading setup, overlapping the
+        independent news and Flash Research lookups
+        
+        ``timestamp`` lets batch callers stamp every result with one shared time.
+        """
+        timestamp = timestamp or _utc_timestamp()
         try:
             # Get symbol info
             symbol = gap_data['symbol']
-            gap_percent = abs(gap_data['gap_percent'])
             
-            # Get news data
-            news_data = self.news_scanner.scan_symbol_news(symbol, hours_back=48)
+            # Replays of a scan within the same minute come straight from disk,
+            # as long as the gap and float data are unchanged
+            bucket = _minute_bucket()
+            inputs = _inputs_hash(gap_data, float_data)
+            stored = await self._io(self._load_analysis, symbol, bucket, inputs)
+            if stored is not None:
+                self.logger.info("Using stored pattern analysis for %s", symbol)
+                return stored
             
-            # Get Flash Research enhanced statistics
-            flash_data = None
-            try:
-                flash_data = self.flash_research.get_enhanced_analysis(symbol)
-                if flash_data and 'error' not in flash_data:
-                    self.logger.info(f"Flash Research data obtained for {symbol}")
-                else:
-                    flash_data = None
-                    self.logger.warning(f"Flash Research data unavailable for {symbol}")
-            except Exception as e:
-                self.logger.warning(f"Flash Research error for {symbol}: {str(e)}")
-                flash_data = None
+            # News and Flash Research don't depend on each other; fetch both at once
+            news_data, flash_data = await asyncio.gather(
+                self._io(self._cached_news, symbol, 48),
+                self._io(self._cached_flash, symbol),
+            )
             
             # Classify pattern type first (local analysis)
             pattern_classification = self._classify_pattern_local(gap_data, float_data, news_data, flash_data)
             
-            # Get AI analysis if enabled
+            # Get AI analysis if enabled (needs the news results), only for
+            # setups the local classification rates worth it
             ai_analysis = None
+            ai_attempted = self.openai_client.enabled and self._passes_ai_gate(pattern_classification)
             if self.openai_client.enabled:
-                ai_analysis = self.openai_client.analyze_trading_pattern(
-                    gap_data, float_data, news_data
-                )
+                if ai_attempted:
+                    ai_analysis = await self._io(
+                        self._hedged_call,
+                        lambda: self._ai_analyze(gap_data, float_data, news_data),
+                        'openai',
+                        pattern_classification['setup_quality'] >= AI_HEDGE_MIN_QUALITY
+                    )
+                else:
+                    self.ai_calls_skipped_by_gate += 1
+                    self.logger.info(
+                        "Skipping AI analysis for %s (quality %s, ai_calls_skipped_by_gate=%d)",
+                        symbol, pattern_classification['setup_quality'], self.ai_calls_skipped_by_gate
+                    )
             
             # Combine local, AI, and Flash Research analysis
             combined_analysis = self._combine_analysis(
-                pattern_classification, ai_analysis, gap_data, flash_data
+                pattern_classification, ai_analysis, gap_data, flash_data, timestamp
             )
             
-            self.logger.info(f"Pattern analysis completed for {symbol}: {combined_analysis['pattern_type']}")
+            self.logger.info("Pattern analysis completed for %s: %s", symbol, combined_analysis['pattern_type'])
+            # Only complete analyses are replayed: a failed news, Flash Research
+            # or attempted AI lookup would otherwise stick for the whole minute
+            if news_data is not None and flash_data is not None and (ai_analysis is not None or not ai_attempted):
+                await self._io(self._store_analysis, symbol, bucket, inputs, combined_analysis)
             return combined_analysis
             
         except Exception as e:
             self.logger.error(f"Error analyzing pattern for {gap_data.get('symbol', 'Unknown')}: {str(e)}")
-            return self._create_fallback_analysis(gap_data)
+            return self._create_fallback_analysis(gap_data, timestamp)
+    
+    async def analyze_gap_setups_batch(self, gap_list: List[Dict],
+                                       float_data: Optional[Dict[str, Dict]] = None,
+                                       concurrency: int = 20,
+                                       qpm: Optional[int] = None) -> List:
+        """
+        Analyze many gap setups concurrently, in input order
+        
+        At most ``concurrency`` analyses run at once, and when ``qpm`` is set
+        launches are spaced 60/qpm seconds apart to stay under provider
+        request-per-minute caps. ``float_data`` maps symbol to float data.
+        Failed analyses come back as the raised exception.
+        """
+        float_data = float_data or {}
+        semaphore = asyncio.Semaphore(concurrency)
+        timestamp = _utc_timestamp()
+        
+        async def _one(gap: Dict) -> Dict:
+            async with semaphore:
+                return await self.analyze_gap_setup_async(gap, float_data.get(gap['symbol']), timestamp)
+        
+        tasks = []
+        for i, gap in enumerate(gap_list):
+            if qpm and i:
+                await asyncio.sleep(60 / qpm)
+            tasks.append(asyncio.create_task(_one(gap)))
+        
+        return await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def analyze_stream(self, gap_list: List[Dict],
+                             float_data: Optional[Dict[str, Dict]] = None,
+                             timeout: float = STREAM_ANALYSIS_TIMEOUT) -> AsyncIterator[Dict]:
+        """
+        Yield analyses in completion order, so early results can be shown while
+        slow ones are still in flight
+        
+        An analysis that takes longer than ``timeout`` seconds yields the
+        fallback analysis for that gap, so one slow call never stalls the stream.
+        """
+        float_data = float_data or {}
+        timestamp = _utc_timestamp()
+        
+        async def _one(gap: Dict) -> Dict:
+            try:
+                return await asyncio.wait_for(
+                    self.analyze_gap_setup_async(gap, float_data.get(gap['symbol']), timestamp), timeout
+                )
+            except asyncio.TimeoutError:
+                self.logger.warning(f"Pattern analysis for {gap['symbol']} timed out after {timeout:.0f}s")
+                return self._create_fallback_analysis(gap, timestamp)
+        
+        tasks = [asyncio.create_task(_one(gap)) for gap in gap_list]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Consumer stopped early: don't leave analyses running unobserved
+            for task in tasks:
+                task.cancel()
+    
+    def _passes_ai_gate(self, pattern_classification: Dict) -> bool:
+        """Whether a locally classified setup deserves an AI call"""
+        return (pattern_classification['setup_quality'] >= self.ai_gate_threshold
+                or pattern_classification['pattern_type'] in _AI_PRIORITY_PATTERNS)
+    
+    def _cached_lookup(self, key: Tuple, fetch: Callable[[], Optional[Dict]]) -> Optional[Dict]:
+        """Return a fresh cached value for key, fetching it once if missing or expired
+        
+        Failed lookups (None) are not cached so the next call retries.
+        """
+        value = self._lookup_cached(key)
+        if value is not None:
+            return value
+        
+        with self._lookup_lock(key):
+            # Another caller may have filled it while we waited
+            value = self._lookup_cached(key)
+            if value is not None:
+                return value
+            
+            value = fetch()
+            with self._lookup_guard:
+                if value is not None:
+                    self._lookup_cache[key] = (time.monotonic() + LOOKUP_CACHE_TTL, value)
+                    self._lookup_cache.move_to_end(key)
+                    while len(self._lookup_cache) > LOOKUP_CACHE_SIZE:
+                        self._lookup_cache.popitem(last=False)
+                else:
+                    self._lookup_cache.pop(key, None)
+            return value
+    
+    def _lookup_cached(self, key: Tuple) -> Optional[Dict]:
+        """Fresh cached value for key, or None"""
+        with self._lookup_guard:
+            entry = self._lookup_cache.get(key)
+            if entry is None:
+                return None
+            if entry[0] > time.monotonic():
+                self._lookup_cache.move_to_end(key)
+                return entry[1]
+            del self._lookup_cache[key]
+            return None
+    
+    def _lookup_lock(self, key: Tuple) -> threading.Lock:
+        """Fetch lock for key; evicting an idle key's lock only risks a duplicate fetch"""
+        with self._lookup_guard:
+            lock = self._lookup_locks.get(key)
+            if lock is None:
+                lock = self._lookup_locks[key] = threading.Lock()
+                while len(self._lookup_locks) > LOOKUP_CACHE_SIZE:
+                    self._lookup_locks.popitem(last=False)
+            else:
+                self._lookup_locks.move_to_end(key)
+            return lock
+    
+    def _cached_news(self, symbol: str, hours_back: int) -> Optional[Dict]:
+        return self._cached_lookup(
+            ('news', symbol, hours_back),
+            lambda: self._scan_news(symbol, hours_back=hours_back)
+        )
+    
+    def _cached_flash(self, symbol: str) -> Optional[Dict]:
+        return self._cached_lookup(
+            ('flash', symbol),
+            lambda: self._hedged_call(lambda: self._get_flash_data(symbol), 'flash_research', hedge=False)
+        )
+    
+    def _hedged_call(self, fn: Callable[[], Optional[Dict]], provider: str,
+                     hedge: bool = True) -> Optional[Dict]:
+        """Call fn under the provider's hard timeout, sending a duplicate once it
+        passes the hedge delay; returns the first result, or None on timeout
+
+        Attempts still queued when a result is taken (or the timeout hits) are
+        cancelled; ones already running can't be interrupted, so they finish
+        in the background and are discarded.
+        """
+        hedge_after, hard_timeout = _PROVIDER_TIMEOUTS[provider]
+        attempts = [self._hedge_pool.submit(fn)]
+        try:
+            done, _ = wait(attempts, timeout=hedge_after if hedge else hard_timeout)
+            
+            if not done and hedge:
+                self.logger.info("%s call slower than %.0fs, sending hedged request", provider, hedge_after)
+                attempts.append(self._hedge_pool.submit(fn))
+                done, _ = wait(attempts, timeout=hard_timeout - hedge_after, return_when=FIRST_COMPLETED)
+            
+            if not done:
+                self.logger.warning("%s call timed out after %.0fs", provider, hard_timeout)
+                return None
+            
+            return done.pop().result()
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
+    
+    def _get_flash_data(self, symbol: str) -> Optional[Dict]:
+        """Get Flash Research enhanced statistics, or None if unavailable"""
+        flash_data, error = _safe_call(self._get_flash, symbol)
+        if error:
+            self.logger.warning(f"Flash Research error for {symbol}: {error}")
+        elif flash_data and 'error' not in flash_data:
+            self.logger.info("Flash Research data obtained for %s", symbol)
+            return flash_data
+        else:
+            self.logger.warning(f"Flash Research data unavailable for {symbol}")
+        return None
     
     def _classify_pattern_local(self, gap_data: Dict, float_data: Optional[Dict], 
                               news_data: Optional[Dict], flash_data: Optional[Dict]) -> Dict:
@@ -109,24 +581,82 @@ class PatternAnalyzer:
             'pattern_type': pattern_type,
             'setup_quality': setup_quality,
             'playbook': playbook,
-            'float_analysis': float_analysis,
-            'news_analysis': news_analysis,
-            'flash_analysis': flash_analysis,
+            'float_analysis': float_analysis.to_dict(),
+            'news_analysis': news_analysis.to_dict(),
+            'flash_analysis': flash_analysis.to_dict(),
             'confidence': min(setup_quality + 10, 100),  # Local confidence estimate
             'key_factors': self._extract_key_factors(gap_percent, float_analysis, news_analysis, flash_analysis),
             'risk_level': self._assess_risk_level(gap_percent, float_analysis, news_analysis, flash_analysis)
         }
     
-    def _analyze_float_characteristics(self, float_data: Optional[Dict]) -> Dict:
+    def classify_batch(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Vectorized pattern type and setup quality for many gaps at once
+        
+        Expects columns gap_percent, gap_direction, float_shares, catalyst_score,
+        volume, gap_edge_score, continuation_rate and gap_fill_rate; NaN marks
+        missing float/news/Flash data. A catalyst counts when catalyst_score >= 20,
+        as in NewsScanner. Returns a copy with pattern_type and setup_quality
+        columns matching _classify_pattern_local row by row.
+        """
+        gap = df['gap_percent'].abs().to_numpy(dtype=float)
+        volume = df['volume'].fillna(0).to_numpy(dtype=float)
+        
+        # Float characteristics
+        float_shares = df['float_shares'].to_numpy(dtype=float)
+        has_float = ~np.isnan(float_shares)
+        is_nano = has_float & (float_shares < self.nanofloat_threshold)
+        is_micro = has_float & (float_shares < self.microfloat_threshold)
+        squeeze = np.where(
+            has_float, _tier_values(float_shares, self._squeeze_tiers, inclusive=True), 0
+        )
+        
+        # News catalyst
+        catalyst_score = df['catalyst_score'].to_numpy(dtype=float)
+        has_catalyst = catalyst_score >= 20
+        catalyst_strength = np.where(
+            has_catalyst, _tier_values(catalyst_score, _CATALYST_TIERS, inclusive=True), 0
+        )
+        
+        # Flash Research statistics
+        edge_score = df['gap_edge_score'].to_numpy(dtype=float)
+        has_flash = ~np.isnan(edge_score)
+        continuation = df['continuation_rate'].fillna(50).to_numpy(dtype=float)
+        
+        # Pattern type, first matching condition wins (same priority as _determine_pattern_type)
+        conditions = [
+            (is_nano & (gap >= 10)) | (is_micro & (gap >= 15)),
+            has_catalyst & (catalyst_strength >= 70) & (gap >= 8),
+            gap >= self.mega_gap_threshold,
+            has_flash & (edge_score >= 75) & (gap >= 8),
+            (gap >= 10) & (volume > 50000),
+            is_micro & (gap >= 5),
+        ]
+        choices = ["Float Squeeze", "News Catalyst", "Mega Gap", "Statistical Edge", "Gap & Go", "Micro Float"]
+        
+        # Setup quality, same tiers as _calculate_setup_quality
+        quality = (
+            _tier_values(gap, _GAP_QUALITY_TIERS, inclusive=True)
+            + (squeeze * 0.3).astype(int)
+            + (catalyst_strength * 0.2).astype(int)
+            + _tier_values(volume, _VOLUME_QUALITY_TIERS)
+            + np.where(
+                has_flash,
+                _tier_values(np.nan_to_num(edge_score), _FLASH_EDGE_TIERS, inclusive=True)
+                + _tier_values(continuation, _CONTINUATION_TIERS),
+                0
+            )
+        )
+        
+        result = df.copy()
+        result['pattern_type'] = np.select(conditions, choices, default="Standard Gap")
+        result['setup_quality'] = np.minimum(quality, 100)
+        return result
+    
+    def _analyze_float_characteristics(self, float_data: Optional[Dict]) -> FloatView:
         """Analyze float characteristics for pattern detection"""
         if not float_data:
-            return {
-                'category': 'Unknown',
-                'is_microfloat': False,
-                'is_nanofloat': False,
-                'squeeze_potential': 0,
-                'float_shares': 0
-            }
+            return FloatView()
         
         float_shares = float_data.get('float_shares', 0)
         
@@ -134,72 +664,40 @@ class PatternAnalyzer:
         is_microfloat = float_shares < self.microfloat_threshold
         
         # Calculate squeeze potential (0-100)
-        if is_nanofloat:
-            squeeze_potential = 95
-        elif is_microfloat:
-            squeeze_potential = 80
-        elif float_shares < 10_000_000:  # 10M
-            squeeze_potential = 60
-        elif float_shares < 25_000_000:  # 25M
-            squeeze_potential = 40
-        else:
-            squeeze_potential = 20
-        
-        return {
-            'category': float_data.get('float_category', 'Unknown'),
-            'is_microfloat': is_microfloat,
-            'is_nanofloat': is_nanofloat,
-            'squeeze_potential': squeeze_potential,
-            'float_shares': float_shares
-        }
+        squeeze_potential = _tier_value(float_shares, self._squeeze_tiers, inclusive=True)
+        
+        return FloatView(
+            category=float_data.get('float_category', 'Unknown'),
+            is_microfloat=is_microfloat,
+            is_nanofloat=is_nanofloat,
+            squeeze_potential=squeeze_potential,
+            float_shares=float_shares
+        )
     
-    def _analyze_news_catalyst(self, news_data: Optional[Dict]) -> Dict:
+    def _analyze_news_catalyst(self, news_data: Optional[Dict]) -> NewsView:
         """Analyze news catalyst strength"""
         if not news_data or not news_data.get('has_catalyst'):
-            return {
-                'has_catalyst': False,
-                'catalyst_strength': 0,
-                'catalyst_type': 'None',
-                'headline_count': 0
-            }
+            return NewsView()
         
         catalyst_score = news_data.get('catalyst_score', 0)
         headlines = news_data.get('key_headlines', [])
         
         # Determine catalyst strength
-        if catalyst_score >= 50:
-            catalyst_strength = 90
-            catalyst_type = 'Strong'
-        elif catalyst_score >= 30:
-            catalyst_strength = 70
-            catalyst_type = 'Moderate'
-        elif catalyst_score >= 20:
-            catalyst_strength = 50
-            catalyst_type = 'Weak'
-        else:
-            catalyst_strength = 20
-            catalyst_type = 'Minimal'
-        
-        return {
-            'has_catalyst': True,
-            'catalyst_strength': catalyst_strength,
-            'catalyst_type': catalyst_type,
-            'headline_count': len(headlines),
-            'catalyst_score': catalyst_score
-        }
+        catalyst_strength = _tier_value(catalyst_score, _CATALYST_TIERS, inclusive=True)
+        catalyst_type = _tier_value(catalyst_score, _CATALYST_TYPE_TIERS, inclusive=True)
+        
+        return NewsView(
+            has_catalyst=True,
+            catalyst_strength=catalyst_strength,
+            catalyst_type=catalyst_type,
+            headline_count=len(headlines),
+            catalyst_score=catalyst_score
+        )
     
-    def _analyze_flash_statistics(self, flash_data: Optional[Dict]) -> Dict:
+    def _analyze_flash_statistics(self, flash_data: Optional[Dict]) -> FlashView:
         """Analyze Flash Research historical statistics"""
         if not flash_data or 'error' in flash_data:
-            return {
-                'has_flash_data': False,
-                'gap_edge_score': 50,
-                'historical_performance': 'Unknown',
-                'gap_continuation_rate': 50,
-                'gap_fill_rate': 50,
-                'volume_factor': 1.0,
-                'statistical_edge': 'Insufficient data'
-            }
+            return FlashView()
         
         gap_stats = flash_data.get('gap_statistics', {})
         performance_metrics = flash_data.get('performance_metrics', {})
@@ -207,14 +705,7 @@ class PatternAnalyzer:
         
         # Determine historical performance category
         win_rate = performance_metrics.get('win_rate_percent', 50)
-        if win_rate >= 70:
-            historical_performance = 'Excellent'
-        elif win_rate >= 60:
-            historical_performance = 'Good'
-        elif win_rate >= 50:
-            historical_performance = 'Average'
-        else:
-            historical_performance = 'Poor'
+        historical_performance = _tier_value(win_rate, _WIN_RATE_TIERS, inclusive=True)
         
         # Determine statistical edge
         continuation_rate = gap_stats.get('continuation_rate', 50)
@@ -229,31 +720,31 @@ class PatternAnalyzer:
         else:
             statistical_edge = 'Neutral statistical profile'
         
-        return {
-            'has_flash_data': True,
-            'gap_edge_score': gap_stats.get('gap_edge_score', 50),
-            'historical_performance': historical_performance,
-            'gap_continuation_rate': continuation_rate,
-            'gap_fill_rate': gap_fill_rate,
-            'volume_factor': gap_stats.get('volume_factor', 1.0),
-            'statistical_edge': statistical_edge,
-            'total_gaps_analyzed': gap_stats.get('total_gaps', 0),
-            'avg_gap_size': gap_stats.get('avg_gap_size', 0),
-            'overall_edge_score': overall_edge_score,
-            'trading_recommendations': flash_data.get('trading_recommendations', [])
-        }
+        return FlashView(
+            has_flash_data=True,
+            gap_edge_score=gap_stats.get('gap_edge_score', 50),
+            historical_performance=historical_performance,
+            gap_continuation_rate=continuation_rate,
+            gap_fill_rate=gap_fill_rate,
+            volume_factor=gap_stats.get('volume_factor', 1.0),
+            statistical_edge=statistical_edge,
+            total_gaps_analyzed=gap_stats.get('total_gaps', 0),
+            avg_gap_size=gap_stats.get('avg_gap_size', 0),
+            overall_edge_score=overall_edge_score,
+            trading_recommendations=flash_data.get('trading_recommendations', [])
+        )
     
     def _determine_pattern_type(self, gap_percent: float, gap_direction: str, 
-                              float_analysis: Dict, news_analysis: Dict, volume: int, flash_analysis: Dict) -> str:
+                              float_analysis: FloatView, news_analysis: NewsView, volume: int, flash_analysis: FlashView) -> str:
         """Determine the primary pattern type"""
         
         # Priority 1: Float Squeeze (nano/micro float + significant gap)
-        if (float_analysis['is_nanofloat'] and gap_percent >= 10) or \
-           (float_analysis['is_microfloat'] and gap_percent >= 15):
+        if (float_analysis.is_nanofloat and gap_percent >= 10) or \
+           (float_analysis.is_microfloat and gap_percent >= 15):
             return "Float Squeeze"
         
         # Priority 2: News Catalyst (strong news + gap)
-        if news_analysis['has_catalyst'] and news_analysis['catalyst_strength'] >= 70 and gap_percent >= 8:
+        if news_analysis.has_catalyst and news_analysis.catalyst_strength >= 70 and gap_percent >= 8:
             return "News Catalyst"
         
         # Priority 3: Mega Gap (30%+ gap regardless of other factors)
@@ -261,7 +752,7 @@ class PatternAnalyzer:
             return "Mega Gap"
         
         # Priority 4: Statistical Edge Pattern (Flash Research shows strong edge)
-        if flash_analysis['has_flash_data'] and flash_analysis['gap_edge_score'] >= 75:
+        if flash_analysis.has_flash_data and flash_analysis.gap_edge_score >= 75:
             if gap_percent >= 8:
                 return "Statistical Edge"
         
@@ -270,116 +761,71 @@ class PatternAnalyzer:
             return "Gap & Go"
         
         # Priority 6: Micro Float Play (small float but smaller gap)
-        if float_analysis['is_microfloat'] and gap_percent >= 5:
+        if float_analysis.is_microfloat and gap_percent >= 5:
             return "Micro Float"
         
         # Default: Standard Gap
         return "Standard Gap"
     
-    def _calculate_setup_quality(self, gap_percent: float, float_analysis: Dict, 
-                               news_analysis: Dict, volume: int, flash_analysis: Dict) -> int:
+    def _calculate_setup_quality(self, gap_percent: float, float_analysis: FloatView, 
+                               news_analysis: NewsView, volume: int, flash_analysis: FlashView) -> int:
         """Calculate overall setup quality score (0-100)"""
         score = 0
         
         # Gap percentage contribution (0-40 points)
-        if gap_percent >= 30:
-            score += 40
-        elif gap_percent >= 20:
-            score += 35
-        elif gap_percent >= 15:
-            score += 30
-        elif gap_percent >= 10:
-            score += 25
-        elif gap_percent >= 7:
-            score += 20
-        elif gap_percent >= 5:
-            score += 15
-        else:
-            score += 10
+        score += _tier_value(gap_percent, _GAP_QUALITY_TIERS, inclusive=True)
         
         # Float contribution (0-30 points)
-        squeeze_potential = float_analysis.get('squeeze_potential', 0)
+        squeeze_potential = float_analysis.squeeze_potential
         score += int(squeeze_potential * 0.3)
         
         # News catalyst contribution (0-20 points)
-        if news_analysis['has_catalyst']:
-            catalyst_strength = news_analysis.get('catalyst_strength', 0)
+        if news_analysis.has_catalyst:
+            catalyst_strength = news_analysis.catalyst_strength
             score += int(catalyst_strength * 0.2)
         
         # Volume contribution (0-10 points)
-        if volume > 500000:
-            score += 10
-        elif volume > 200000:
-            score += 7
-        elif volume > 100000:
-            score += 5
-        elif volume > 50000:
-            score += 3
+        score += _tier_value(volume, _VOLUME_QUALITY_TIERS)
         
         # Flash Research statistical edge contribution (0-15 points)
-        if flash_analysis['has_flash_data']:
-            flash_edge_score = flash_analysis.get('gap_edge_score', 50)
-            continuation_rate = flash_analysis.get('gap_continuation_rate', 50)
+        if flash_analysis.has_flash_data:
+            flash_edge_score = flash_analysis.gap_edge_score
+            continuation_rate = flash_analysis.gap_continuation_rate
             
             # High edge score adds points
-            if flash_edge_score >= 80:
-                score += 15
-            elif flash_edge_score >= 70:
-                score += 12
-            elif flash_edge_score >= 60:
-                score += 8
-            elif flash_edge_score >= 55:
-                score += 5
+            score += _tier_value(flash_edge_score, _FLASH_EDGE_TIERS, inclusive=True)
             
             # High continuation rate adds bonus
-            if continuation_rate > 75:
-                score += 3
-            elif continuation_rate > 65:
-                score += 2
+            score += _tier_value(continuation_rate, _CONTINUATION_TIERS)
         
         return min(score, 100)
     
     def _generate_local_playbook(self, pattern_type: str, gap_percent: float, 
-                               gap_direction: str, float_analysis: Dict, 
-                               news_analysis: Dict, flash_analysis: Dict) -> str:
+                               gap_direction: str, float_analysis: FloatView, 
+                               news_analysis: NewsView, flash_analysis: FlashView) -> str:
         """Generate educational playbook description"""
         
-        playbooks = {
-            "Float Squeeze": f"Small float ({float_analysis['float_shares']/1_000_000:.1f}M) with {gap_percent:.1f}% gap. "
-                           f"Limited supply can amplify moves. Watch for volume confirmation and momentum continuation.",
-            
-            "News Catalyst": f"News-driven {gap_percent:.1f}% gap with {news_analysis['catalyst_type'].lower()} catalyst. "
-                           f"Event-based momentum often creates follow-through opportunities in first hour.",
-            
-            "Mega Gap": f"Exceptional {gap_percent:.1f}% gap suggests significant development. "
-                      f"Large gaps often see initial profit-taking followed by potential resumption.",
-            
-            "Gap & Go": f"Classic {gap_percent:.1f}% {gap_direction.lower()} gap setup. "
-                      f"Look for volume confirmation and clean breakout above/below gap levels.",
-            
-            "Micro Float": f"Micro float ({float_analysis['float_shares']/1_000_000:.1f}M shares) with {gap_percent:.1f}% move. "
-                         f"Small supply can create volatile price action on modest volume.",
-            
-            "Statistical Edge": f"{gap_percent:.1f}% gap with strong historical edge (Score: {flash_analysis.get('gap_edge_score', 50)}/100). "
-                           f"Statistics show {flash_analysis.get('statistical_edge', 'favorable profile')}.",
-            
-            "Standard Gap": f"{gap_percent:.1f}% gap - monitor for volume and momentum confirmation. "
-                          f"Standard gap setups require technical confirmation for continuation."
-        }
-        
-        base_playbook = playbooks.get(pattern_type, f"{gap_percent:.1f}% gap setup requiring analysis.")
+        template = self._PLAYBOOK_TEMPLATES.get(pattern_type, "{gap:.1f}% gap setup requiring analysis.")
+        base_playbook = template.format_map({
+            'gap': gap_percent,
+            'direction': gap_direction.lower(),
+            'float_m': float_analysis.float_shares / 1_000_000,
+            'catalyst': news_analysis.catalyst_type.lower(),
+            'edge_score': flash_analysis.gap_edge_score,
+            'statistical_edge': flash_analysis.statistical_edge,
+        })
         
         # Add context based on characteristics
-        if float_analysis['is_nanofloat']:
+        if float_analysis.is_nanofloat:
             base_playbook += " Nano float (<1M) increases volatility potential."
         
-        if news_analysis['has_catalyst'] and pattern_type != "News Catalyst":
+        if news_analysis.has_catalyst and pattern_type != "News Catalyst":
             base_playbook += f" News catalyst adds momentum factor."
         
         # Add Flash Research statistical insights
-        if flash_analysis['has_flash_data']:
-            continuation_rate = flash_analysis.get('gap_continuation_rate', 50)
-            gap_fill_rate = flash_analysis.get('gap_fill_rate', 50)
+        if flash_analysis.has_flash_data:
+            continuation_rate = flash_analysis.gap_continuation_rate
+            gap_fill_rate = flash_analysis.gap_fill_rate
             
             if continuation_rate > 70:
                 base_playbook += f" Historically shows {continuation_rate:.0f}% continuation rate."
@@ -388,31 +834,26 @@ class PatternAnalyzer:
         
         return base_playbook
     
-    def _extract_key_factors(self, gap_percent: float, float_analysis: Dict, 
-                           news_analysis: Dict, flash_analysis: Dict) -> List[str]:
+    def _extract_key_factors(self, gap_percent: float, float_analysis: FloatView, 
+                           news_analysis: NewsView, flash_analysis: FlashView) -> List[str]:
         """Extract key factors driving the setup"""
         factors = []
         
-        if gap_percent >= 20:
-            factors.append("Large gap")
-        elif gap_percent >= 10:
-            factors.append("Significant gap")
-        else:
-            factors.append("Moderate gap")
+        factors.append(_tier_value(gap_percent, _GAP_FACTOR_TIERS, inclusive=True))
         
-        if float_analysis['is_nanofloat']:
+        if float_analysis.is_nanofloat:
             factors.append("Nano float")
-        elif float_analysis['is_microfloat']:
+        elif float_analysis.is_microfloat:
             factors.append("Micro float")
         
-        if news_analysis['has_catalyst']:
-            factors.append(f"{news_analysis['catalyst_type']} catalyst")
+        if news_analysis.has_catalyst:
+            factors.append(f"{news_analysis.catalyst_type} catalyst")
         
         # Add Flash Research statistical factors (these are the EDGE factors)
-        if flash_analysis['has_flash_data']:
-            edge_score = flash_analysis.get('gap_edge_score', 50)
-            continuation_rate = flash_analysis.get('gap_continuation_rate', 50)
-            gap_fill_rate = flash_analysis.get('gap_fill_rate', 50)
+        if flash_analysis.has_flash_data:
+            edge_score = flash_analysis.gap_edge_score
+            continuation_rate = flash_analysis.gap_continuation_rate
+            gap_fill_rate = flash_analysis.gap_fill_rate
             
             if edge_score >= 75:
                 factors.append("High statistical edge")
@@ -420,38 +861,33 @@ class PatternAnalyzer:
                 factors.append(f"{continuation_rate:.0f}% continuation rate")
             if gap_fill_rate < 40:
                 factors.append("Low gap fill tendency")
-            if flash_analysis.get('volume_factor', 1) > 2.5:
+            if flash_analysis.volume_factor > 2.5:
                 factors.append("High volume multiplier")
         
         return factors
     
-    def _assess_risk_level(self, gap_percent: float, float_analysis: Dict, 
-                         news_analysis: Dict, flash_analysis: Dict) -> str:
+    def _assess_risk_level(self, gap_percent: float, float_analysis: FloatView, 
+                         news_analysis: NewsView, flash_analysis: FlashView) -> str:
         """Assess overall risk level"""
         risk_score = 0
         
         # Gap size increases risk
-        if gap_percent >= 30:
-            risk_score += 3
-        elif gap_percent >= 20:
-            risk_score += 2
-        elif gap_percent >= 10:
-            risk_score += 1
+        risk_score += _tier_value(gap_percent, _GAP_RISK_TIERS, inclusive=True)
         
         # Small float increases volatility risk
-        if float_analysis['is_nanofloat']:
+        if float_analysis.is_nanofloat:
             risk_score += 2
-        elif float_analysis['is_microfloat']:
+        elif float_analysis.is_microfloat:
             risk_score += 1
         
         # News catalyst can add uncertainty
-        if news_analysis['has_catalyst']:
+        if news_analysis.has_catalyst:
             risk_score += 1
         
         # Flash Research can REDUCE risk with statistical backing
-        if flash_analysis['has_flash_data']:
-            edge_score = flash_analysis.get('gap_edge_score', 50)
-            continuation_rate = flash_analysis.get('gap_continuation_rate', 50)
+        if flash_analysis.has_flash_data:
+            edge_score = flash_analysis.gap_edge_score
+            continuation_rate = flash_analysis.gap_continuation_rate
             
             # High statistical edge reduces risk
             if edge_score >= 80 and continuation_rate > 75:
@@ -459,28 +895,25 @@ class PatternAnalyzer:
             elif edge_score >= 70:
                 risk_score -= 1
         
-        if risk_score >= 4:
-            return "High"
-        elif risk_score >= 2:
-            return "Medium"
-        else:
-            return "Low"
+        return _tier_value(risk_score, _RISK_LEVEL_TIERS, inclusive=True)
     
     def _combine_analysis(self, local_analysis: Dict, ai_analysis: Optional[Dict], 
-                        gap_data: Dict, flash_data: Optional[Dict]) -> Dict:
+                        gap_data: Dict, flash_data: Optional[Dict],
+                        timestamp: Optional[str] = None) -> Dict:
         """Combine local and AI analysis"""
+        timestamp = timestamp or _utc_timestamp()
         if not ai_analysis:
             # Use local analysis only
             combined = local_analysis.copy()
             combined['analysis_source'] = 'local'
             combined['symbol'] = gap_data['symbol']
-            combined['timestamp'] = datetime.now().isoformat()
+            combined['timestamp'] = timestamp
             return combined
         
         # Combine both analyses
         combined = {
             'symbol': gap_data['symbol'],
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': timestamp,
             'analysis_source': 'ai_enhanced',
             
             # Prefer AI for these fields
@@ -495,8 +928,8 @@ class PatternAnalyzer:
                 ai_analysis.get('setup_quality', 0) + local_analysis['setup_quality']
             ) / 2),
             
-            # Combine key factors
-            'key_factors': list(set(
+            # Combine key factors (deduplicated, AI factors first)
+            'key_factors': list(dict.fromkeys(
                 ai_analysis.get('key_factors', []) + local_analysis['key_factors']
             )),
             
@@ -510,11 +943,11 @@ class PatternAnalyzer:
         
         return combined
     
-    def _create_fallback_analysis(self, gap_data: Dict) -> Dict:
+    def _create_fallback_analysis(self, gap_data: Dict, timestamp: Optional[str] = None) -> Dict:
         """Create fallback analysis when main analysis fails"""
         return {
             'symbol': gap_data['symbol'],
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': timestamp or _utc_timestamp(),
             'analysis_source': 'fallback',
             'pattern_type': 'Analysis Error',
             'setup_quality': 50,
@@ -1,173 +1,541 @@
-from typing import Dict, List, Optional
+import functools
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, fields, replace
+from numbers import Real
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+from types import MappingProxyType
 from src.utils.logger import setup_logger
 
+# Playbook templates for different patterns; read-only and shared by every
+# generator instead of being rebuilt per instance
+_PATTERN_PLAYBOOKS = MappingProxyType({
+    "Float Squeeze": MappingProxyType({
+        "description": "Low float stock with significant gap creating supply/demand imbalance",
+        "typical_behavior": "Initial spike, possible pullback, then momentum continuation if volume sustains",
+        "key_levels": "Gap fill level, previous resistance/support",
+        "volume_importance": "Critical - low float needs volume to move significantly",
+        "timing": "Best in first 30-60 minutes, watch for momentum shifts",
+        "risk_factors": ["Extreme volatility", "Low liquidity", "Quick reversals"],
+        "educational_notes": "Float squeezes can create explosive moves but require careful timing and risk management"
+    }),
+    
+    "News Catalyst": MappingProxyType({
+        "description": "Gap driven by specific news or catalyst event",
+        "typical_behavior": "Initial reaction, consolidation, then follow-through based on news significance",
+        "key_levels": "Pre-news levels, gap support/resistance",
+        "volume_importance": "High volume confirms news impact and continuation potential",
+        "timing": "First hour typically most volatile, watch for institutional response",
+        "risk_factors": ["News interpretation", "Market sentiment", "Sector rotation"],
+        "educational_notes": "News-driven gaps often see multiple waves as different market participants react"
+    }),
+    
+    "Gap & Go": MappingProxyType({
+        "description": "Classic gap setup with potential for momentum continuation",
+        "typical_behavior": "Gap open, possible test of gap level, continuation on volume",
+        "key_levels": "Gap fill zone, previous day's high/low, round numbers",
+        "volume_importance": "Volume above average confirms strength and continuation potential",
+        "timing": "First 15-30 minutes critical for direction, then hourly momentum shifts",
+        "risk_factors": ["Gap fill risk", "Momentum failure", "Sector weakness"],
+        "educational_notes": "Most reliable when accompanied by above-average volume and clean technical levels"
+    }),
+    
+    "Mega Gap": MappingProxyType({
+        "description": "Exceptional gap (30%+) suggesting major development or event",
+        "typical_behavior": "Extreme volatility, multiple waves, profit-taking followed by reassessment",
+        "key_levels": "Multiple resistance/support zones due to size of move",
+        "volume_importance": "Extremely high volume expected, watch for distribution vs accumulation",
+        "timing": "All day event, multiple entry/exit opportunities",
+        "risk_factors": ["Extreme volatility", "Halt risk", "Overnight developments"],
+        "educational_notes": "Mega gaps often create all-day momentum but require constant risk assessment"
+    }),
+    
+    "Micro Float": MappingProxyType({
+        "description": "Very small float stock with moderate gap showing early momentum",
+        "typical_behavior": "Volatile price action, sensitive to small volume changes",
+        "key_levels": "Previous highs/lows more important due to limited supply",
+        "volume_importance": "Even small volume can create significant moves",
+        "timing": "Watch for volume spikes that can accelerate moves quickly",
+        "risk_factors": ["Low liquidity", "Wide spreads", "Manipulation risk"],
+        "educational_notes": "Micro floats require smaller position sizes but can offer explosive potential"
+    }),
+    
+    "Standard Gap": MappingProxyType({
+        "description": "Moderate gap requiring technical confirmation for continuation",
+        "typical_behavior": "Initial move, consolidation, then direction based on market factors",
+        "key_levels": "Standard technical levels, moving averages, trend lines",
+        "volume_importance": "Above-average volume needed to confirm move sustainability",
+        "timing": "Monitor first hour, then look for technical breakouts/breakdowns",
+        "risk_factors": ["Lack of catalyst", "Market conditions", "Sector performance"],
+        "educational_notes": "Standard gaps rely more on technical analysis and market conditions"
+    })
+})
+
+# Historical comparisons per pattern type, for educational context
+_SIMILAR_PATTERNS = MappingProxyType({
+    "Float Squeeze": "Similar to micro-cap momentum plays like IMPP, PROG, ATER during their major runs",
+    "News Catalyst": "Comparable to biotech FDA approvals or tech earnings surprises",
+    "Gap & Go": "Classic setup seen in quality small-caps during sector rotation",
+    "Mega Gap": "Reminiscent of major catalyst plays like DWAC, GME during peak momentum",
+    "Micro Float": "Similar to other sub-5M float runners during momentum phases"
+})
+_DEFAULT_SIMILAR_PATTERN = "Standard gap pattern seen regularly in small-cap trading"
+_SUPPORTED_PATTERNS = tuple(_PATTERN_PLAYBOOKS)
+
+# Description suffix per (nanofloat, microfloat, catalyst) flags; nano wins over micro
+_NANO_SUFFIX = " {symbol} has nano float (<1M shares) amplifying move potential."
+_MICRO_SUFFIX = " {symbol} has micro float amplifying volatility."
+_CATALYST_SUFFIX = " News catalyst adds fundamental driver to technical setup."
+_DESC_SUFFIX = {
+    (nano, micro, catalyst): (
+        (_NANO_SUFFIX if nano else _MICRO_SUFFIX if micro else "")
+        + (_CATALYST_SUFFIX if catalyst else "")
+    )
+    for nano in (False, True)
+    for micro in (False, True)
+    for catalyst in (False, True)
+}
+
+# Alert summary pieces: quality emoji by tier and suffix per (nanofloat, microfloat, catalyst)
+_QUALITY_EMOJI = ("📊", "⚡", "🔥")
+_ALERT_SUFFIX = {
+    (nano, micro, catalyst): (
+        (" • Nano Float" if nano else " • Micro Float" if micro else "")
+        + (" • News Catalyst" if catalyst else "")
+    )
+    for nano in (False, True)
+    for micro in (False, True)
+    for catalyst in (False, True)
+}
+
+# Trading considerations per (pattern_type, nanofloat, gap >= 20%); pattern
+# types without their own entry share the None row
+_PATTERN_CONSIDERATIONS = {
+    "Float Squeeze": ("Position size carefully due to low liquidity", "Monitor Level 2 for thin order book areas"),
+    "News Catalyst": ("Watch for additional news developments", "Monitor sector response to gauge sustainability"),
+    "Mega Gap": ("Expect multiple waves of volatility", "Consider scaling in/out of positions"),
+}
+_NANOFLOAT_CONSIDERATIONS = ("Use smaller position sizes due to extreme volatility", "Expect wide bid/ask spreads")
+_VOLATILE_GAP_CONSIDERATIONS = ("High volatility expected - adjust position sizing",)
+_GENERAL_CONSIDERATIONS = ("Set alerts for key technical levels", "Monitor overall market sentiment")
+_TRADING_CONSIDERATIONS = {
+    (pattern_type, nano, volatile): (
+        considerations
+        + (_NANOFLOAT_CONSIDERATIONS if nano else ())
+        + (_VOLATILE_GAP_CONSIDERATIONS if volatile else ())
+        + _GENERAL_CONSIDERATIONS
+    )
+    for pattern_type, considerations in list(_PATTERN_CONSIDERATIONS.items()) + [(None, ())]
+    for nano in (False, True)
+    for volatile in (False, True)
+}
+
+# Top-3 primary risks per (pattern_type, nanofloat); the general risks only
+# show up when the pattern and float add fewer than three of their own
+_PATTERN_RISKS = {
+    "Float Squeeze": ("Low liquidity", "Extreme volatility", "Quick reversals"),
+    "News Catalyst": ("News interpretation risk", "Sector sentiment"),
+    "Mega Gap": ("Extreme volatility", "Halt risk", "Overnight gaps"),
+}
+_NANOFLOAT_RISKS = ("Manipulation risk", "Wide spreads")
+_GENERAL_RISKS = ("Market conditions", "Gap fill potential")
+_PRIMARY_RISKS = {
+    (pattern_type, nano): (risks + (_NANOFLOAT_RISKS if nano else ()) + _GENERAL_RISKS)[:3]
+    for pattern_type, risks in list(_PATTERN_RISKS.items()) + [(None, ())]
+    for nano in (False, True)
+}
+_RISK_MITIGATION = (
+    "Use appropriate position sizing",
+    "Set stop losses before entry",
+    "Monitor volume for confirmation",
+    "Watch for momentum shifts"
+)
+
+# Default for missing float/news analysis, shared instead of a fresh {} per read
+_EMPTY = MappingProxyType({})
+
+# Playbooks are memoized on the analysis fields they read; low-quality setups
+# are cheap, rarely re-alerted and not worth a cache slot
+PLAYBOOK_CACHE_SIZE = 1024
+PLAYBOOK_CACHE_MIN_QUALITY = 50
+_KEY_FIELDS = ('pattern_type', 'symbol', 'setup_quality', 'gap_percent', 'risk_level')
+_FLOAT_KEY_FIELDS = ('is_nanofloat', 'is_microfloat', 'float_shares')
+_NEWS_KEY_FIELDS = ('has_catalyst', 'catalyst_type')
+
+# Repo-level .cache/ so the database doesn't follow the working directory
+_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), '.cache')
+
+# Built playbooks are also persisted so restarts during the session start warm;
+# rows expire after a day so template edits show up by the next session
+PLAYBOOK_DB_PATH = os.getenv('PLAYBOOK_CACHE_DB', os.path.join(_CACHE_DIR, 'playbooks.db'))
+PLAYBOOK_DB_TTL = 24 * 60 * 60  # seconds
+
+# EnhancedPlaybook fields the fallback playbook leaves out
+_FALLBACK_OMITTED = frozenset({'timestamp', 'timing_considerations', 'educational_notes', 'similar_patterns'})
+
+
+@dataclass(frozen=True, slots=True)
+class RiskAssessment:
+    """Overall risk, primary risks and mitigation steps for a setup"""
+    overall_risk: str
+    primary_risks: Tuple[str, ...]
+    risk_mitigation: Tuple[str, ...]
+    
+    def to_dict(self) -> Dict:
+        return {
+            'overall_risk': self.overall_risk,
+            'primary_risks': list(self.primary_risks),
+            'risk_mitigation': list(self.risk_mitigation)
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class EnhancedPlaybook:
+    """
+    Generated playbook; immutable so it can be shared out of the playbook cache
+    
+    Fields the fallback playbook leaves as None are omitted from to_dict.
+    """
+    symbol: str
+    pattern_type: str
+    setup_quality: float
+    timestamp: Optional[str]
+    description: str
+    expected_behavior: str
+    key_levels: str
+    timing_considerations: Optional[str]
+    current_observations: Tuple[str, ...]
+    trading_considerations: Tuple[str, ...]
+    risk_assessment: RiskAssessment
+    educational_notes: Optional[str]
+    similar_patterns: Optional[str]
+    alert_summary: str
+    
+    def to_dict(self, timestamp: Optional[str] = None) -> Dict:
+        """Plain dict form for alerts/JSON, optionally restamped with timestamp"""
+        playbook = {}
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if value is None and f.name in _FALLBACK_OMITTED:
+                continue
+            if isinstance(value, tuple):
+                value = list(value)
+            elif isinstance(value, RiskAssessment):
+                value = value.to_dict()
+            playbook[f.name] = value
+        if timestamp is not None and 'timestamp' in playbook:
+            playbook['timestamp'] = timestamp
+        return playbook
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'EnhancedPlaybook':
+        """Inverse of to_dict"""
+        values = {f.name: data.get(f.name) for f in fields(cls)}
+        for name in ('current_observations', 'trading_considerations'):
+            values[name] = tuple(values[name])
+        risk = values['risk_assessment']
+        values['risk_assessment'] = RiskAssessment(
+            overall_risk=risk['overall_risk'],
+            primary_risks=tuple(risk['primary_risks']),
+            risk_mitigation=tuple(risk['risk_mitigation'])
+        )
+        return cls(**values)
+
+
+# Returned when generation fails; shared since it only varies by symbol
+_FALLBACK_PLAYBOOK = EnhancedPlaybook(
+    symbol='Unknown',
+    pattern_type='Analysis Error',
+    setup_quality=50,
+    timestamp=None,
+    description='Gap detected but detailed analysis unavailable',
+    expected_behavior='Monitor for volume and momentum confirmation',
+    key_levels='Gap fill level, previous support/resistance',
+    timing_considerations=None,
+    current_observations=('Gap detected', 'Analysis temporarily unavailable'),
+    trading_considerations=('Use standard gap trading rules', 'Monitor volume'),
+    risk_assessment=RiskAssessment(
+        overall_risk='Medium',
+        primary_risks=('Analysis incomplete', 'Standard gap risks'),
+        risk_mitigation=('Conservative position sizing', 'Standard risk management')
+    ),
+    educational_notes=None,
+    similar_patterns=None,
+    alert_summary='📊 Gap Setup (Analysis Limited)'
+)
+
 
 class PlaybookGenerator:
     """
     Generate educational trading playbooks for different pattern types
     """
+    __slots__ = ('logger', 'pattern_playbooks', '_cached_playbook', '_db', '_db_lock')
     
     def __init__(self):
         self.logger = setup_logger('playbook_generator')
         
         # Playbook templates for different patterns
-        self.pattern_playbooks = {
-            "Float Squeeze": {
-                "description": "Low float stock with significant gap creating supply/demand imbalance",
-                "typical_behavior": "Initial spike, possible pullback, then momentum continuation if volume sustains",
-                "key_levels": "Gap fill level, previous resistance/support",
-                "volume_importance": "Critical - low float needs volume to move significantly",
-                "timing": "Best in first 30-60 minutes, watch for momentum shifts",
-                "risk_factors": ["Extreme volatility", "Low liquidity", "Quick reversals"],
-                "educational_notes": "Float squeezes can create explosive moves but require careful timing and risk management"
-            },
-            
-            "News Catalyst": {
-                "description": "Gap driven by specific news or catalyst event",
-                "typical_behavior": "Initial reaction, consolidation, then follow-through based on news significance",
-                "key_levels": "Pre-news levels, gap support/resistance",
-                "volume_importance": "High volume confirms news impact and continuation potential",
-                "timing": "First hour typically most volatile, watch for institutional response",
-                "risk_factors": ["News interpretation", "Market sentiment", "Sector rotation"],
-                "educational_notes": "News-driven gaps often see multiple waves as different market participants react"
-            },
-            
-            "Gap & Go": {
-                "description": "Classic gap setup with potential for momentum continuation",
-                "typical_behavior": "Gap open, possible test of gap level, continuation on volume",
-                "key_levels": "Gap fill zone, previous day's high/low, round numbers",
-                "volume_importance": "Volume above average confirms strength and continuation potential",
-                "timing": "First 15-30 minutes critical for direction, then hourly momentum shifts",
-                "risk_factors": ["Gap fill risk", "Momentum failure", "Sector weakness"],
-                "educational_notes": "Most reliable when accompanied by above-average volume and clean technical levels"
-            },
-            
-            "Mega Gap": {
-                "description": "Exceptional gap (30%+) suggesting major development or event",
-                "typical_behavior": "Extreme volatility, multiple waves, profit-taking followed by reassessment",
-                "key_levels": "Multiple resistance/support zones due to size of move",
-                "volume_importance": "Extremely high volume expected, watch for distribution vs accumulation",
-                "timing": "All day event, multiple entry/exit opportunities",
-                "risk_factors": ["Extreme volatility", "Halt risk", "Overnight developments"],
-                "educational_notes": "Mega gaps often create all-day momentum but require constant risk assessment"
-            },
-            
-            "Micro Float": {
-                "description": "Very small float stock with moderate gap showing early momentum",
-                "typical_behavior": "Volatile price action, sensitive to small volume changes",
-                "key_levels": "Previous highs/lows more important due to limited supply",
-                "volume_importance": "Even small volume can create significant moves",
-                "timing": "Watch for volume spikes that can accelerate moves quickly",
-                "risk_factors": ["Low liquidity", "Wide spreads", "Manipulation risk"],
-                "educational_notes": "Micro floats require smaller position sizes but can offer explosive potential"
-            },
-            
-            "Standard Gap": {
-                "description": "Moderate gap requiring technical confirmation for continuation",
-                "typical_behavior": "Initial move, consolidation, then direction based on market factors",
-                "key_levels": "Standard technical levels, moving averages, trend lines",
-                "volume_importance": "Above-average volume needed to confirm move sustainability",
-                "timing": "Monitor first hour, then look for technical breakouts/breakdowns",
-                "risk_factors": ["Lack of catalyst", "Market conditions", "Sector performance"],
-                "educational_notes": "Standard gaps rely more on technical analysis and market conditions"
-            }
-        }
+        self.pattern_playbooks = _PATTERN_PLAYBOOKS
+        
+        # Per-instance memo of playbooks by _cache_key
+        self._cached_playbook = functools.lru_cache(maxsize=PLAYBOOK_CACHE_SIZE)(self._playbook_for_key)
+        
+        # Persistent layer under the memo
+        self._db_lock = threading.Lock()
+        self._db = self._open_playbook_db(PLAYBOOK_DB_PATH)
+    
+    def close(self):
+        """Close the playbook database"""
+        if self._db is not None:
+            with self._db_lock:
+                self._db.close()
+                self._db = None
+    
+    def _open_playbook_db(self, path: str) -> Optional[sqlite3.Connection]:
+        """Open (creating if needed) the persisted playbook cache; None disables it"""
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            db = sqlite3.connect(path, check_same_thread=False)
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS playbooks (key TEXT PRIMARY KEY, created REAL, payload TEXT)"
+            )
+            db.execute("DELETE FROM playbooks WHERE created < ?", (time.time() - PLAYBOOK_DB_TTL,))
+            db.commit()
+            return db
+        except sqlite3.Error as e:
+            self.logger.warning(f"Playbook cache disabled ({path}): {str(e)}")
+            return None
+    
+    def _load_playbook(self, db_key: str) -> Optional[EnhancedPlaybook]:
+        """Stored playbook for db_key, if any and not expired"""
+        if self._db is None:
+            return None
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT payload FROM playbooks WHERE key = ? AND created >= ?",
+                (db_key, time.time() - PLAYBOOK_DB_TTL)
+            ).fetchone()
+        return EnhancedPlaybook.from_dict(json.loads(row[0])) if row else None
     
-    def generate_enhanced_playbook(self, pattern_analysis: Dict) -> Dict:
+    def _store_playbook(self, db_key: str, playbook: EnhancedPlaybook):
+        if self._db is None:
+            return
+        try:
+            payload = json.dumps(playbook.to_dict())
+        except (TypeError, ValueError):
+            return  # non-JSON field values (e.g. numpy scalars) stay memory-only
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO playbooks (key, created, payload) VALUES (?, ?, ?)",
+                (db_key, time.time(), payload)
+            )
+            self._db.commit()
+    
+    def generate_enhanced_playbook(self, pattern_analysis: Dict, timestamp: Optional[str] = None) -> Dict:
         """
         Generate comprehensive playbook based on pattern analysis
+        
+        Pass the scan's timestamp to stamp every playbook of a scan alike and
+        skip reading the clock per alert.
+        """
+        return self.generate_playbook(pattern_analysis).to_dict(timestamp=timestamp or datetime.now().isoformat())
+    
+    def generate_playbook(self, pattern_analysis: Dict) -> EnhancedPlaybook:
+        """
+        Same as generate_enhanced_playbook, as an EnhancedPlaybook (cached
+        playbooks keep the timestamp they were built with)
+        """
+        key = self._cache_key(pattern_analysis)
+        if key is None:
+            return self._build_playbook(pattern_analysis)
+        return self._cached_playbook(key)
+    
+    def generate_batch(self, pattern_analyses: List[Dict], timestamp: Optional[str] = None) -> List[Dict]:
+        """
+        Generate playbooks for a whole scan at once
+        
+        Output matches generate_enhanced_playbook row by row. Identical setups
+        within the batch are built once; all rows share one timestamp (now, or
+        the given scan timestamp).
         """
+        if not pattern_analyses:
+            return []
+        
+        timestamp = timestamp or datetime.now().isoformat()
+        built: Dict[Tuple, EnhancedPlaybook] = {}
+        playbooks = []
+        for pattern_analysis in pattern_analyses:
+            key = self._cache_key(pattern_analysis)
+            if key is None:
+                playbook = self._build_playbook(pattern_analysis)
+            else:
+                if key not in built:
+                    built[key] = self._cached_playbook(key)
+                playbook = built[key]
+            playbooks.append(playbook.to_dict(timestamp=timestamp))
+        
+        return playbooks
+    
+    def _cache_key(self, pattern_analysis: Dict) -> Optional[Tuple]:
+        """
+        Hashable key of the fields the playbook builders read, or None when the
+        analysis is malformed or below PLAYBOOK_CACHE_MIN_QUALITY
+        """
+        if not isinstance(pattern_analysis, Mapping):
+            return None
+        setup_quality = pattern_analysis.get('setup_quality', 50)
+        if not isinstance(setup_quality, Real) or setup_quality < PLAYBOOK_CACHE_MIN_QUALITY:
+            return None
+        float_analysis = pattern_analysis.get('float_analysis', _EMPTY)
+        news_analysis = pattern_analysis.get('news_analysis', _EMPTY)
+        if not isinstance(float_analysis, Mapping) or not isinstance(news_analysis, Mapping):
+            return None
+        
+        # Values carry their type: 80 and 80.0 (or True and 1) hash alike but
+        # render differently in the playbook text
+        key = (
+            tuple((name, type(pattern_analysis[name]), pattern_analysis[name])
+                  for name in _KEY_FIELDS if name in pattern_analysis),
+            tuple((name, type(float_analysis[name]), float_analysis[name])
+                  for name in _FLOAT_KEY_FIELDS if name in float_analysis),
+            tuple((name, type(news_analysis[name]), news_analysis[name])
+                  for name in _NEWS_KEY_FIELDS if name in news_analysis),
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+    
+    def _playbook_for_key(self, key: Tuple) -> EnhancedPlaybook:
+        """
+        Playbook for a _cache_key: the persisted copy if there is one, else
+        built from just the fields the key covers and persisted
+        """
+        db_key = hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+        playbook = self._load_playbook(db_key)
+        if playbook is not None:
+            return playbook
+        
+        analysis_fields, float_fields, news_fields = key
+        pattern_analysis = {name: value for name, _, value in analysis_fields}
+        pattern_analysis['float_analysis'] = {name: value for name, _, value in float_fields}
+        pattern_analysis['news_analysis'] = {name: value for name, _, value in news_fields}
+        playbook = self._build_playbook(pattern_analysis)
+        self._store_playbook(db_key, playbook)
+        return playbook
+    
+    def _build_playbook(self, pattern_analysis: Dict) -> EnhancedPlaybook:
+        """Build the enhanced playbook (uncached)"""
+        if not isinstance(pattern_analysis, Mapping):
+            self.logger.error(f"Error generating playbook: expected a dict, got {type(pattern_analysis).__name__}")
+            return _FALLBACK_PLAYBOOK
+        
+        # Read every field once and hand the values to the helpers
+        get = pattern_analysis.get
+        pattern_type = get('pattern_type', 'Standard Gap')
+        symbol = get('symbol', 'Unknown')
+        setup_quality = get('setup_quality', 50)
+        gap_percent = get('gap_percent', 0)
+        float_analysis = get('float_analysis', _EMPTY)
+        news_analysis = get('news_analysis', _EMPTY)
+        if not isinstance(float_analysis, Mapping) or not isinstance(news_analysis, Mapping):
+            self.logger.error(f"Error generating playbook: malformed float/news analysis for {symbol}")
+            return self._create_fallback_playbook(pattern_analysis)
+        
+        # Only malformed field values (non-numeric gap/quality/float, unhashable type) can fail here
         try:
-            pattern_type = pattern_analysis.get('pattern_type', 'Standard Gap')
-            symbol = pattern_analysis.get('symbol', 'Unknown')
-            setup_quality = pattern_analysis.get('setup_quality', 50)
-            
             # Get base playbook template
             base_playbook = self.pattern_playbooks.get(pattern_type, self.pattern_playbooks['Standard Gap'])
             
             # Generate customized playbook
-            customized_playbook = self._customize_playbook(base_playbook, pattern_analysis)
+            customized_playbook = self._customize_playbook(
+                base_playbook, get('symbol', 'Stock'), gap_percent, float_analysis, news_analysis
+            )
             
             # Add specific observations
-            observations = self._generate_observations(pattern_analysis)
+            observations = self._generate_observations(gap_percent, setup_quality, float_analysis, news_analysis)
             
             # Create trading considerations
-            considerations = self._generate_trading_considerations(pattern_analysis)
+            considerations = self._generate_trading_considerations(pattern_type, gap_percent, float_analysis)
             
             # Generate risk assessment
-            risk_assessment = self._generate_risk_assessment(pattern_analysis)
+            risk_assessment = self._generate_risk_assessment(
+                get('risk_level', 'Medium'), pattern_type, float_analysis
+            )
             
-            enhanced_playbook = {
-                'symbol': symbol,
-                'pattern_type': pattern_type,
-                'setup_quality': setup_quality,
-                'timestamp': datetime.now().isoformat(),
+            enhanced_playbook = EnhancedPlaybook(
+                symbol=symbol,
+                pattern_type=pattern_type,
+                setup_quality=setup_quality,
+                timestamp=datetime.now().isoformat(),
                 
                 # Core playbook content
-                'description': customized_playbook['description'],
-                'expected_behavior': customized_playbook['expected_behavior'],
-                'key_levels': customized_playbook['key_levels'],
-                'timing_considerations': customized_playbook['timing'],
+                description=customized_playbook['description'],
+                expected_behavior=customized_playbook['expected_behavior'],
+                key_levels=customized_playbook['key_levels'],
+                timing_considerations=customized_playbook['timing'],
                 
                 # Specific analysis
-                'current_observations': observations,
-                'trading_considerations': considerations,
-                'risk_assessment': risk_assessment,
+                current_observations=observations,
+                trading_considerations=considerations,
+                risk_assessment=risk_assessment,
                 
                 # Educational content
-                'educational_notes': base_playbook['educational_notes'],
-                'similar_patterns': self._find_similar_patterns(pattern_analysis),
+                educational_notes=base_playbook['educational_notes'],
+                similar_patterns=self._find_similar_patterns(pattern_type),
                 
                 # Summary for alerts
-                'alert_summary': self._generate_alert_summary(pattern_analysis)
-            }
+                alert_summary=self._generate_alert_summary(
+                    get('pattern_type', 'Gap'), setup_quality, float_analysis, news_analysis
+                )
+            )
             
-            self.logger.info(f"Enhanced playbook generated for {symbol}: {pattern_type}")
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("Enhanced playbook generated for %s: %s", symbol, pattern_type)
             return enhanced_playbook
             
-        except Exception as e:
+        except (TypeError, ValueError) as e:
             self.logger.error(f"Error generating playbook: {str(e)}")
             return self._create_fallback_playbook(pattern_analysis)
     
-    def _customize_playbook(self, base_playbook: Dict, pattern_analysis: Dict) -> Dict:
+    def _customize_playbook(self, base_playbook: Dict, symbol: str, gap_percent: float,
+                            float_analysis: Dict, news_analysis: Dict) -> Dict:
         """Customize base playbook with specific analysis data"""
         
-        symbol = pattern_analysis.get('symbol', 'Stock')
-        gap_percent = pattern_analysis.get('gap_percent', 0)
-        
-        # Get analysis details
-        float_analysis = pattern_analysis.get('float_analysis', {})
-        news_analysis = pattern_analysis.get('news_analysis', {})
-        
-        customized = base_playbook.copy()
-        
         # Customize description
-        if float_analysis.get('is_nanofloat'):
-            customized['description'] += f" {symbol} has nano float (<1M shares) amplifying move potential."
-        elif float_analysis.get('is_microfloat'):
-            customized['description'] += f" {symbol} has micro float amplifying volatility."
-        
-        if news_analysis.get('has_catalyst'):
-            customized['description'] += f" News catalyst adds fundamental driver to technical setup."
+        suffix = _DESC_SUFFIX[(
+            bool(float_analysis.get('is_nanofloat')),
+            bool(float_analysis.get('is_microfloat')),
+            bool(news_analysis.get('has_catalyst')),
+        )]
+        description = base_playbook['description'] + suffix.format(symbol=symbol) if suffix else base_playbook['description']
         
         # Customize expected behavior
+        expected_behavior = base_playbook['typical_behavior']
         if abs(gap_percent) >= 20:
-            customized['expected_behavior'] = "Extreme initial volatility expected, " + customized['typical_behavior']
-        else:
-            customized['expected_behavior'] = customized['typical_behavior']
+            expected_behavior = "Extreme initial volatility expected, " + expected_behavior
         
-        return customized
+        # Only the fields the playbook reads; the base template is never copied
+        return {
+            'description': description,
+            'expected_behavior': expected_behavior,
+            'key_levels': base_playbook['key_levels'],
+            'timing': base_playbook['timing'],
+        }
     
-    def _generate_observations(self, pattern_analysis: Dict) -> List[str]:
+    def _generate_observations(self, gap_percent: float, setup_quality: float,
+                               float_analysis: Dict, news_analysis: Dict) -> Tuple[str, ...]:
         """Generate specific observations about current setup"""
         observations = []
         
-        gap_percent = pattern_analysis.get('gap_percent', 0)
-        float_analysis = pattern_analysis.get('float_analysis', {})
-        news_analysis = pattern_analysis.get('news_analysis', {})
-        setup_quality = pattern_analysis.get('setup_quality', 50)
-        
         # Gap observations
         if abs(gap_percent) >= 30:
             observations.append(f"Exceptional {abs(gap_percent):.1f}% gap indicates major development")
@@ -197,146 +565,58 @@ class PlaybookGenerator:
         else:
             observations.append("Moderate setup requiring careful risk management")
         
-        return observations
+        return tuple(observations)
     
-    def _generate_trading_considerations(self, pattern_analysis: Dict) -> List[str]:
+    def _generate_trading_considerations(self, pattern_type: str, gap_percent: float,
+                                         float_analysis: Dict) -> Tuple[str, ...]:
         """Generate specific trading considerations"""
-        considerations = []
-        
-        pattern_type = pattern_analysis.get('pattern_type', 'Standard Gap')
-        float_analysis = pattern_analysis.get('float_analysis', {})
-        gap_percent = pattern_analysis.get('gap_percent', 0)
-        
-        # Pattern-specific considerations
-        if pattern_type == "Float Squeeze":
-            considerations.append("Position size carefully due to low liquidity")
-            considerations.append("Monitor Level 2 for thin order book areas")
-            
-        elif pattern_type == "News Catalyst":
-            considerations.append("Watch for additional news developments")
-            considerations.append("Monitor sector response to gauge sustainability")
-            
-        elif pattern_type == "Mega Gap":
-            considerations.append("Expect multiple waves of volatility")
-            considerations.append("Consider scaling in/out of positions")
-            
-        # Float-based considerations
-        if float_analysis.get('is_nanofloat'):
-            considerations.append("Use smaller position sizes due to extreme volatility")
-            considerations.append("Expect wide bid/ask spreads")
-        
-        # Gap-based considerations
-        if abs(gap_percent) >= 20:
-            considerations.append("High volatility expected - adjust position sizing")
-        
-        considerations.append("Set alerts for key technical levels")
-        considerations.append("Monitor overall market sentiment")
-        
-        return considerations
+        if pattern_type not in _PATTERN_CONSIDERATIONS:
+            pattern_type = None
+        return _TRADING_CONSIDERATIONS[(
+            pattern_type, bool(float_analysis.get('is_nanofloat')), abs(gap_percent) >= 20
+        )]
     
-    def _generate_risk_assessment(self, pattern_analysis: Dict) -> Dict:
+    def _generate_risk_assessment(self, risk_level: str, pattern_type: str,
+                                  float_analysis: Dict) -> RiskAssessment:
         """Generate comprehensive risk assessment"""
         
-        risk_level = pattern_analysis.get('risk_level', 'Medium')
-        pattern_type = pattern_analysis.get('pattern_type', 'Standard Gap')
-        float_analysis = pattern_analysis.get('float_analysis', {})
-        
-        risk_factors = []
-        
-        # Pattern-specific risks
-        if pattern_type == "Float Squeeze":
-            risk_factors.extend(["Low liquidity", "Extreme volatility", "Quick reversals"])
-        elif pattern_type == "News Catalyst":
-            risk_factors.extend(["News interpretation risk", "Sector sentiment"])
-        elif pattern_type == "Mega Gap":
-            risk_factors.extend(["Extreme volatility", "Halt risk", "Overnight gaps"])
-        
-        # Float-specific risks
-        if float_analysis.get('is_nanofloat'):
-            risk_factors.extend(["Manipulation risk", "Wide spreads"])
-        
-        # General risks
-        risk_factors.extend(["Market conditions", "Gap fill potential"])
+        if pattern_type not in _PATTERN_RISKS:
+            pattern_type = None
+        primary_risks = _PRIMARY_RISKS[(pattern_type, bool(float_analysis.get('is_nanofloat')))]
         
-        return {
-            'overall_risk': risk_level,
-            'primary_risks': risk_factors[:3],  # Top 3 risks
-            'risk_mitigation': [
-                "Use appropriate position sizing",
-                "Set stop losses before entry",
-                "Monitor volume for confirmation",
-                "Watch for momentum shifts"
-            ]
-        }
+        return RiskAssessment(
+            overall_risk=risk_level,
+            primary_risks=primary_risks,  # Top 3 risks
+            risk_mitigation=_RISK_MITIGATION
+        )
     
-    def _find_similar_patterns(self, pattern_analysis: Dict) -> str:
+    def _find_similar_patterns(self, pattern_type: str) -> str:
         """Find similar historical patterns for educational context"""
-        
-        pattern_type = pattern_analysis.get('pattern_type', 'Standard Gap')
-        
-        similar_patterns = {
-            "Float Squeeze": "Similar to micro-cap momentum plays like IMPP, PROG, ATER during their major runs",
-            "News Catalyst": "Comparable to biotech FDA approvals or tech earnings surprises",
-            "Gap & Go": "Classic setup seen in quality small-caps during sector rotation",
-            "Mega Gap": "Reminiscent of major catalyst plays like DWAC, GME during peak momentum",
-            "Micro Float": "Similar to other sub-5M float runners during momentum phases"
-        }
-        
-        return similar_patterns.get(pattern_type, "Standard gap pattern seen regularly in small-cap trading")
+        return _SIMILAR_PATTERNS.get(pattern_type, _DEFAULT_SIMILAR_PATTERN)
     
-    def _generate_alert_summary(self, pattern_analysis: Dict) -> str:
+    def _generate_alert_summary(self, pattern_type: str, setup_quality: float,
+                                float_analysis: Dict, news_analysis: Dict) -> str:
         """Generate concise summary for Telegram alerts"""
         
-        pattern_type = pattern_analysis.get('pattern_type', 'Gap')
-        setup_quality = pattern_analysis.get('setup_quality', 50)
-        confidence = pattern_analysis.get('confidence', 50)
-        
-        # Add quality indicators
-        if setup_quality >= 80:
-            quality_emoji = "🔥"
-        elif setup_quality >= 60:
-            quality_emoji = "⚡"
-        else:
-            quality_emoji = "📊"
-        
-        summary = f"{quality_emoji} {pattern_type} Setup (Q:{setup_quality}/100)"
-        
-        # Add key characteristics
-        float_analysis = pattern_analysis.get('float_analysis', {})
-        if float_analysis.get('is_nanofloat'):
-            summary += " • Nano Float"
-        elif float_analysis.get('is_microfloat'):
-            summary += " • Micro Float"
-        
-        news_analysis = pattern_analysis.get('news_analysis', {})
-        if news_analysis.get('has_catalyst'):
-            summary += " • News Catalyst"
-        
-        return summary
+        # Quality indicator and key characteristics
+        tier = 2 if setup_quality >= 80 else 1 if setup_quality >= 60 else 0
+        suffix = _ALERT_SUFFIX[(
+            bool(float_analysis.get('is_nanofloat')),
+            bool(float_analysis.get('is_microfloat')),
+            bool(news_analysis.get('has_catalyst')),
+        )]
+        return f"{_QUALITY_EMOJI[tier]} {pattern_type} Setup (Q:{setup_quality}/100){suffix}"
     
-    def _create_fallback_playbook(self, pattern_analysis: Dict) -> Dict:
+    def _create_fallback_playbook(self, pattern_analysis: Dict) -> EnhancedPlaybook:
         """Create fallback playbook when generation fails"""
-        return {
-            'symbol': pattern_analysis.get('symbol', 'Unknown'),
-            'pattern_type': 'Analysis Error',
-            'setup_quality': 50,
-            'description': 'Gap detected but detailed analysis unavailable',
-            'expected_behavior': 'Monitor for volume and momentum confirmation',
-            'key_levels': 'Gap fill level, previous support/resistance',
-            'current_observations': ['Gap detected', 'Analysis temporarily unavailable'],
-            'trading_considerations': ['Use standard gap trading rules', 'Monitor volume'],
-            'risk_assessment': {
-                'overall_risk': 'Medium',
-                'primary_risks': ['Analysis incomplete', 'Standard gap risks'],
-                'risk_mitigation': ['Conservative position sizing', 'Standard risk management']
-            },
-            'alert_summary': '📊 Gap Setup (Analysis Limited)'
-        }
+        if 'symbol' not in pattern_analysis:
+            return _FALLBACK_PLAYBOOK
+        return replace(_FALLBACK_PLAYBOOK, symbol=pattern_analysis['symbol'])
     
     def get_pattern_statistics(self) -> Dict:
         """Get statistics about pattern types for analysis"""
         return {
-            'supported_patterns': list(self.pattern_playbooks.keys()),
-            'pattern_count': len(self.pattern_playbooks),
+            'supported_patterns': _SUPPORTED_PATTERNS,
+            'pattern_count': len(_SUPPORTED_PATTERNS),
             'last_updated': datetime.now().isoformat()
         }
\ No newline at end of file
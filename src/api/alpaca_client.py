@@ -1,17 +1,43 @@
+import asyncio
+import functools
 import os
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-import pytz
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from datetime import datetime, timedelta, time as dt_time
+from typing import Callable, List, Dict, Optional, Tuple
+from zoneinfo import ZoneInfo
 from dotenv import load_dotenv
 from alpaca.data import StockHistoricalDataClient
 from alpaca.data.requests import StockBarsRequest, StockTradesRequest, StockSnapshotRequest
 from alpaca.data.timeframe import TimeFrame
 from alpaca.trading.client import TradingClient
-from alpaca.trading.requests import MarketOrderRequest
-from alpaca.trading.enums import OrderSide, TimeInForce
+from alpaca.trading.requests import MarketOrderRequest, GetAssetsRequest
+from alpaca.trading.enums import OrderSide, TimeInForce, AssetClass, AssetStatus
 
 load_dotenv()
 
+EASTERN = ZoneInfo('US/Eastern')
+
+# Symbols per multi-symbol data request; keeps query strings well under URL limits
+DATA_BATCH_SIZE = 200
+
+# Threads for the *_async methods; alpaca-py clients are blocking but keep
+# their HTTP session (and its pooled connections) across calls
+ALPACA_IO_WORKERS = 8
+
+# Tradability changes on the scale of days; at most ASSET_CACHE_SIZE assets
+# (and per-symbol fetch locks) are kept, least recently used evicted
+ASSET_CACHE_TTL = int(os.getenv('ALPACA_ASSET_CACHE_TTL', 86400))
+ASSET_CACHE_SIZE = 4096
+
+# The clock only flips at session boundaries; a short TTL is plenty
+CLOCK_CACHE_TTL = 30
+MARKET_OPEN_TIME = dt_time(9, 30)
+MARKET_CLOSE_TIME = dt_time(16, 0)
+
 
 class AlpacaClient:
     def __init__(self):
@@ -19,10 +45,35 @@ class AlpacaClient:
         self.secret_key = os.getenv('ALPACA_SECRET_KEY')
         self.base_url = os.getenv('ALPACA_BASE_URL', 'https://paper-api.alpaca.markets')
         
-        self.data_client = StockHistoricalDataClient(self.api_key, self.secret_key)
-        self.trading_client = TradingClient(self.api_key, self.secret_key, paper=True)
+        self.eastern = EASTERN
         
-        self.eastern = pytz.timezone('US/Eastern')
+        # symbol -> (expires_at, asset) and symbol -> fetch lock, both in LRU
+        # order; failed lookups are not cached
+        self._asset_cache: OrderedDict[str, Tuple[float, object]] = OrderedDict()
+        self._asset_locks: OrderedDict[str, threading.Lock] = OrderedDict()
+        self._asset_guard = threading.Lock()
+        # Tradeable symbols from preload_tradeable, valid until _tradeable_expires
+        self._tradeable: frozenset = frozenset()
+        self._tradeable_expires = 0.0
+        # (expires_at, clock) from the last get_clock call
+        self._clock: Optional[Tuple[float, object]] = None
+        
+        self._io_pool = ThreadPoolExecutor(max_workers=ALPACA_IO_WORKERS, thread_name_prefix='alpaca-io')
+    
+    # Clients are built on first use; most callers only need one of them
+    @cached_property
+    def data_client(self) -> StockHistoricalDataClient:
+        return StockHistoricalDataClient(self.api_key, self.secret_key)
+    
+    @cached_property
+    def trading_client(self) -> TradingClient:
+        return TradingClient(self.api_key, self.secret_key, paper=True)
+    
+    async def _io(self, fn: Callable, *args, **kwargs):
+        """Run a blocking client call on the I/O pool"""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._io_pool, functools.partial(fn, *args, **kwargs)
+        )
     
     def get_account(self) -> Dict:
         """Get account information"""
@@ -38,6 +89,17 @@ class AlpacaClient:
         snapshot = self.data_client.get_stock_snapshot(request_params)
         return snapshot[symbol]
     
+    def get_snapshots(self, symbols: List[str]) -> Dict:
+        """Get latest snapshots for many symbols, one request per DATA_BATCH_SIZE symbols
+        
+        Symbols without data are missing from the returned dict.
+        """
+        snapshots = {}
+        for i in range(0, len(symbols), DATA_BATCH_SIZE):
+            request_params = StockSnapshotRequest(symbol_or_symbols=symbols[i:i + DATA_BATCH_SIZE])
+            snapshots.update(self.data_client.get_stock_snapshot(request_params))
+        return snapshots
+    
     def get_bars(self, symbol: str, timeframe: TimeFrame = TimeFrame.Minute, 
                  start: Optional[datetime] = None, end: Optional[datetime] = None) -> Dict:
         """Get historical bars for a symbol"""
@@ -54,6 +116,42 @@ class AlpacaClient:
         bars = self.data_client.get_stock_bars(request_params)
         return bars[symbol]
     
+    def get_bars_many(self, symbols: List[str], timeframe: TimeFrame = TimeFrame.Minute,
+                      start: Optional[datetime] = None, end: Optional[datetime] = None,
+                      limit: Optional[int] = None) -> Dict:
+        """Get historical bars for many symbols, one request per DATA_BATCH_SIZE symbols
+        
+        Returns {symbol: [bars]}; symbols without bars are missing. ``limit``
+        caps the total bars per request, not per symbol.
+        """
+        if not start:
+            start = datetime.now() - timedelta(days=1)
+        
+        bars = {}
+        for i in range(0, len(symbols), DATA_BATCH_SIZE):
+            request_params = StockBarsRequest(
+                symbol_or_symbols=symbols[i:i + DATA_BATCH_SIZE],
+                timeframe=timeframe,
+                start=start,
+                end=end,
+                limit=limit
+            )
+            bars.update(self.data_client.get_stock_bars(request_params).data)
+        return bars
+    
+    async def get_snapshot_async(self, symbol: str) -> Dict:
+        """get_snapshot without blocking the event loop"""
+        return await self._io(self.get_snapshot, symbol)
+    
+    async def get_snapshots_async(self, symbols: List[str]) -> Dict:
+        """get_snapshots without blocking the event loop"""
+        return await self._io(self.get_snapshots, symbols)
+    
+    async def get_bars_async(self, symbol: str, timeframe: TimeFrame = TimeFrame.Minute,
+                             start: Optional[datetime] = None, end: Optional[datetime] = None) -> Dict:
+        """get_bars without blocking the event loop"""
+        return await self._io(self.get_bars, symbol, timeframe, start, end)
+    
     def get_premarket_movers(self, min_gap_percent: float = 5.0) -> List[Dict]:
         """Get premarket movers based on gap percentage"""
         # This is a placeholder - Alpaca doesn't have a direct endpoint for this
@@ -83,20 +181,102 @@ class AlpacaClient:
             date = datetime.now()
         
         # Basic market hours - would need to check calendar API for holidays
-        market_open = date.replace(hour=9, minute=30, second=0, microsecond=0)
-        market_close = date.replace(hour=16, minute=0, second=0, microsecond=0)
+        day = date.date()
+        market_open = datetime.combine(day, MARKET_OPEN_TIME, tzinfo=date.tzinfo)
+        market_close = datetime.combine(day, MARKET_CLOSE_TIME, tzinfo=date.tzinfo)
         
         return {
-            'date': date.strftime('%Y-%m-%d'),
+            'date': day.isoformat(),
             'open': market_open.isoformat(),
             'close': market_close.isoformat(),
-            'is_open': self.trading_client.get_clock().is_open
+            'is_open': self.get_clock().is_open
         }
     
+    def get_clock(self):
+        """Get the market clock, cached for CLOCK_CACHE_TTL seconds"""
+        entry = self._clock
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        
+        clock = self.trading_client.get_clock()
+        self._clock = (time.monotonic() + CLOCK_CACHE_TTL, clock)
+        return clock
+    
+    def get_asset(self, symbol: str):
+        """Get asset details, cached for ASSET_CACHE_TTL seconds"""
+        asset = self._cached_asset(symbol)
+        if asset is not None:
+            return asset
+        
+        with self._asset_lock(symbol):
+            # Another caller may have filled it while we waited
+            asset = self._cached_asset(symbol)
+            if asset is not None:
+                return asset
+            
+            asset = self.trading_client.get_asset(symbol)
+            with self._asset_guard:
+                self._asset_cache[symbol] = (time.monotonic() + ASSET_CACHE_TTL, asset)
+                self._asset_cache.move_to_end(symbol)
+                while len(self._asset_cache) > ASSET_CACHE_SIZE:
+                    self._asset_cache.popitem(last=False)
+            return asset
+    
+    def _cached_asset(self, symbol: str):
+        """Fresh cached asset for symbol, or None"""
+        with self._asset_guard:
+            entry = self._asset_cache.get(symbol)
+            if entry is None:
+                return None
+            if entry[0] > time.monotonic():
+                self._asset_cache.move_to_end(symbol)
+                return entry[1]
+            del self._asset_cache[symbol]
+            return None
+    
+    def _asset_lock(self, symbol: str) -> threading.Lock:
+        """Fetch lock for symbol; evicting an idle symbol's lock only risks a duplicate fetch"""
+        with self._asset_guard:
+            lock = self._asset_locks.get(symbol)
+            if lock is None:
+                lock = self._asset_locks[symbol] = threading.Lock()
+                while len(self._asset_locks) > ASSET_CACHE_SIZE:
+                    self._asset_locks.popitem(last=False)
+            else:
+                self._asset_locks.move_to_end(symbol)
+            return lock
+    
+    def preload_tradeable(self, force: bool = False) -> int:
+        """Load every active, tradeable US equity in one request
+        
+        While the preload is fresh, is_tradeable answers from it without
+        per-symbol API calls; a fresh preload is kept unless force is set.
+        Returns the number of tradeable symbols.
+        """
+        if not force and self._tradeable_expires > time.monotonic():
+            return len(self._tradeable)
+        
+        assets = self.trading_client.get_all_assets(
+            GetAssetsRequest(status=AssetStatus.ACTIVE, asset_class=AssetClass.US_EQUITY)
+        )
+        self._tradeable = frozenset(asset.symbol for asset in assets if asset.tradable)
+        self._tradeable_expires = time.monotonic() + ASSET_CACHE_TTL
+        return len(self._tradeable)
+    
     def is_tradeable(self, symbol: str) -> bool:
         """Check if a symbol is tradeable"""
+        if self._tradeable_expires > time.monotonic():
+            return symbol in self._tradeable
         try:
-            asset = self.trading_client.get_asset(symbol)
+            asset = self.get_asset(symbol)
             return asset.tradable
         except:
-            return False
\ No newline at end of file
+            return False
+    
+    async def is_tradeable_async(self, symbol: str) -> bool:
+        """is_tradeable without blocking the event loop"""
+        return await self._io(self.is_tradeable, symbol)
+    
+    async def preload_tradeable_async(self, force: bool = False) -> int:
+        """preload_tradeable without blocking the event loop"""
+        return await self._io(self.preload_tradeable, force)
@@ -1,14 +1,126 @@
+import asyncio
+import logging
 import os
+import threading
 import time
-import requests
+import aiohttp
+import httpx
+import numpy as np
+import orjson
 import yfinance as yf
-from typing import Dict, Optional, List
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from typing import Dict, Optional, List, Set, Tuple
 from datetime import datetime
 from dotenv import load_dotenv
 from src.utils.logger import setup_logger
+from src.utils.retry import backoff_delay
 
 load_dotenv()
 
+# Concurrent symbol lookups in scan_multiple_symbols; the shared rate limiter
+# still caps the request rate
+SCAN_WORKERS = 8
+
+# Scans log progress every SCAN_PROGRESS_EVERY symbols rather than per symbol
+SCAN_PROGRESS_EVERY = 100
+
+# Open connections per async scan session (kept alive for the whole scan)
+ASYNC_CONNECTION_LIMIT = 20
+
+# Profiles, share counts and float move on the scale of days; responses are
+# reused for FINNHUB_CACHE_TTL seconds, least recently used evicted past the size cap
+FINNHUB_CACHE_TTL = 3600
+FINNHUB_CACHE_SIZE = 4096
+
+# Symbols neither Finnhub nor yfinance had data for (delisted, OTC, non-US)
+# are skipped for NEGATIVE_CACHE_TTL seconds instead of re-running both lookups
+NEGATIVE_CACHE_TTL = 300
+NEGATIVE_CACHE_SIZE = 8192
+
+# Concurrent stock/metric lookups for the same symbol share one request; sync
+# callers serialize on one of METRIC_LOCK_STRIPES locks picked by symbol hash
+METRIC_LOCK_STRIPES = 64
+
+# Sync client connection pool; sized for SCAN_WORKERS threads with headroom
+HTTP_MAX_CONNECTIONS = 32
+
+# Throttled (429) and transient server errors are retried with exponential
+# backoff, or after the server's Retry-After when it sends one
+RETRY_ATTEMPTS = 5
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRY_BACKOFF_BASE = 0.5
+RETRY_MAX_DELAY = 60.0
+
+# Rate limiter waits at least this long are logged as warnings; shorter ones
+# are routine pacing during scans and only logged at DEBUG
+RATE_LIMIT_WARN_SECONDS = 1.0
+
+# Float size categories and short-interest squeeze levels, by threshold
+_FLOAT_BOUNDS = (5_000_000, 10_000_000, 50_000_000, 200_000_000)
+_FLOAT_LABELS = ('nano_float', 'micro_float', 'low_float', 'medium_float', 'high_float')
+_SQUEEZE_BOUNDS = (0.05, 0.15, 0.25, 0.4)
+_SQUEEZE_LABELS = ('minimal', 'low', 'moderate', 'high', 'extreme')
+
+# Small-float leader scans first drop symbols the bulk US listing marks as
+# funds, ETPs or derivative securities, which never qualify, before paying
+# a metrics call for each
+SMALL_FLOAT_CATEGORIES = frozenset({'nano_float', 'micro_float', 'low_float'})
+# The listing is a single large download, only worth fetching for scans at
+# least this big; smaller scans still prune against an already fresh listing
+LISTING_PRUNE_MIN_SYMBOLS = 50
+_NON_FLOAT_TYPES = frozenset({
+    'ETP', 'ETF', 'ETN', 'Closed-End Fund', 'Open-End Fund', 'Mutual Fund',
+    'Unit', 'Right', 'Warrant', 'Preference', 'Structured Product', 'Savings Share'
+})
+
+# Columns get_float_leaders filters and sorts on
+_LEADER_DTYPE = np.dtype([('float_category', 'U16'), ('float_shares', 'f8')])
+
+
+@dataclass(frozen=True, slots=True)
+class CompanyMetrics:
+    """Share counts and valuation for a symbol, from Finnhub or yfinance
+    
+    Immutable so the yfinance cache can hand out the same instance.
+    """
+    symbol: str
+    shares_outstanding: Optional[float]
+    float_shares: Optional[float]
+    market_cap: Optional[float]
+    enterprise_value: Optional[float]
+    shares_short: Optional[float]
+    short_ratio: Optional[float]
+    beta: Optional[float]
+    pe_ratio: Optional[float]
+    data_source: str
+    timestamp: str
+    
+    def to_dict(self) -> Dict:
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+
+@dataclass(slots=True)
+class FloatMetrics:
+    """Float ratios, category and squeeze potential for a symbol"""
+    symbol: str
+    shares_outstanding: float
+    float_shares: float
+    insider_ownership_pct: float
+    float_percentage: float
+    short_interest_pct: Optional[float]
+    short_ratio: Optional[float]
+    float_category: str
+    squeeze_potential: str
+    is_microfloat: bool
+    is_low_float: bool
+    timestamp: str
+    
+    def to_dict(self) -> Dict:
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
 
 class FinnhubClient:
     def __init__(self):
@@ -16,136 +128,459 @@ class FinnhubClient:
         self.api_key = os.getenv('FINNHUB_API_KEY')
         self.base_url = 'https://finnhub.io/api/v1'
         
+        # Finnhub responses and yfinance metrics: key -> (expiry, data), in LRU order.
+        # Set up before the key check since yfinance is used even without Finnhub
+        self.cache_ttl = float(os.getenv('FINNHUB_CACHE_TTL', FINNHUB_CACHE_TTL))
+        self._response_cache: OrderedDict[str, Tuple[float, bytes]] = OrderedDict()
+        self._yfinance_cache: OrderedDict[str, Tuple[float, CompanyMetrics]] = OrderedDict()
+        self._cache_lock = threading.RLock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Striped locks so concurrent stock/metric lookups share one request, and
+        # the async equivalent: (session id, symbol) -> in-flight request
+        self._metric_locks = tuple(threading.Lock() for _ in range(METRIC_LOCK_STRIPES))
+        self._metric_requests: Dict[Tuple[int, str], asyncio.Future] = {}
+        # Symbols with no data from either source: symbol -> expiry, in LRU order
+        self._negative_cache: OrderedDict[str, float] = OrderedDict()
+        # Bulk US listing as (expiry, symbol -> security type)
+        self._listing: Tuple[float, Dict[str, str]] = (0.0, {})
+        
+        # Result timestamp for the current second: (epoch second, ISO string)
+        self._timestamp = (0, '')
+        
         if not self.api_key or self.api_key == 'your_finnhub_api_key_here':
             self.logger.warning("FINNHUB_API_KEY not configured - float data disabled")
             self.enabled = False
             return
         
         self.enabled = True
-        self.session = requests.Session()
-        self.session.headers.update({'X-Finnhub-Token': self.api_key})
+        # HTTP/2 multiplexes concurrent scan requests over one TLS connection
+        self.session = httpx.Client(
+            http2=True,
+            headers={'X-Finnhub-Token': self.api_key},
+            timeout=10.0,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_CONNECTIONS
+            )
+        )
         
-        # Rate limiting (60 calls/min free tier)
+        # Rate limiting (60 calls/min free tier) as a token bucket: bursts up to
+        # calls_per_minute, refilled continuously at calls_per_minute / 60 per second
         self.calls_per_minute = 60
-        self.call_timestamps = []
+        self._tokens = float(self.calls_per_minute)
+        self._refill_rate = self.calls_per_minute / 60.0
+        self._last_refill = time.monotonic()
+        self._bucket_lock = threading.Lock()
         
     def _rate_limit_check(self):
         """Check and enforce rate limits"""
         if not self.enabled:
             return False
             
-        now = time.time()
-        # Remove calls older than 1 minute
-        self.call_timestamps = [ts for ts in self.call_timestamps if now - ts < 60]
-        
-        if len(self.call_timestamps) >= self.calls_per_minute:
-            sleep_time = 60 - (now - self.call_timestamps[0])
-            if sleep_time > 0:
-                self.logger.warning(f"Rate limit reached, sleeping {sleep_time:.1f}s")
-                time.sleep(sleep_time)
-                return self._rate_limit_check()
-        
-        self.call_timestamps.append(now)
+        sleep_time = self._take_token()
+        if sleep_time:
+            self._log_throttle(sleep_time)
+            time.sleep(sleep_time)
         return True
     
-    def _make_request(self, endpoint: str, params: Dict = None) -> Optional[Dict]:
-        """Make API request with rate limiting"""
-        if not self._rate_limit_check():
-            return None
-            
-        try:
-            url = f"{self.base_url}/{endpoint}"
-            response = self.session.get(url, params=params, timeout=10)
-            
-            if response.status_code == 429:
-                self.logger.warning("Rate limit hit, backing off...")
-                time.sleep(60)
-                return self._make_request(endpoint, params)
+    async def _rate_limit_check_async(self):
+        """_rate_limit_check that waits without blocking the event loop"""
+        if not self.enabled:
+            return False
+        
+        sleep_time = self._take_token()
+        if sleep_time:
+            self._log_throttle(sleep_time)
+            await asyncio.sleep(sleep_time)
+        return True
+    
+    def _log_throttle(self, sleep_time: float):
+        level = logging.WARNING if sleep_time >= RATE_LIMIT_WARN_SECONDS else logging.DEBUG
+        self.logger.log(level, "Rate limit reached, sleeping %.2fs", sleep_time)
+    
+    def _take_token(self) -> float:
+        """
+        Take a token from the bucket; returns 0 if one was free, else seconds to wait
+        
+        An empty bucket goes into debt: each waiter reserves the next token
+        to refill and sleeps until it is due, so throttled threads wake one
+        at a time instead of all retrying the lock together.
+        """
+        with self._bucket_lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.calls_per_minute,
+                self._tokens + (now - self._last_refill) * self._refill_rate
+            )
+            self._last_refill = now
+            self._tokens -= 1
             
-            response.raise_for_status()
-            return response.json()
+            if self._tokens >= 0:
+                return 0.0
             
-        except requests.exceptions.RequestException as e:
-            self.logger.error(f"Finnhub API error: {str(e)}")
+            # Time until the token reserved here has refilled
+            return -self._tokens / self._refill_rate
+    
+    def _now_iso(self) -> str:
+        """Local ISO timestamp, formatted once per second for the scan loops"""
+        second = int(time.time())
+        cached_second, stamp = self._timestamp
+        if second != cached_second:
+            stamp = datetime.fromtimestamp(second).isoformat()
+            self._timestamp = (second, stamp)
+        return stamp
+    
+    def cache_clear(self):
+        """Drop all cached responses and the listing, and reset the hit/miss counters"""
+        with self._cache_lock:
+            self._response_cache.clear()
+            self._yfinance_cache.clear()
+            self._negative_cache.clear()
+            self._listing = (0.0, {})
+            self.cache_hits = 0
+            self.cache_misses = 0
+    
+    def forget(self, symbol: str):
+        """Look symbol up again on the next call even if it recently had no data"""
+        with self._cache_lock:
+            self._negative_cache.pop(symbol, None)
+    
+    def _known_missing(self, symbol: str) -> bool:
+        """True while symbol is in the negative cache"""
+        with self._cache_lock:
+            expiry = self._negative_cache.get(symbol)
+            if expiry is None:
+                return False
+            if expiry > time.monotonic():
+                return True
+            del self._negative_cache[symbol]
+            return False
+    
+    def _remember_missing(self, symbol: str, metrics: Optional[CompanyMetrics],
+                          answered: bool) -> Optional[CompanyMetrics]:
+        """
+        Negative-cache symbol when neither source had data for it; returns metrics
+        
+        Only definitive empty answers count (``answered``): a failed request or
+        lookup is retried on the next call, like any other cache miss.
+        """
+        if metrics is None and answered:
+            with self._cache_lock:
+                self._negative_cache[symbol] = time.monotonic() + NEGATIVE_CACHE_TTL
+                self._negative_cache.move_to_end(symbol)
+                while len(self._negative_cache) > NEGATIVE_CACHE_SIZE:
+                    self._negative_cache.popitem(last=False)
+        return metrics
+    
+    def _cache_get(self, cache: OrderedDict, key: str):
+        """Fresh cached copy for key, or None (counts the hit/miss)
+        
+        JSON responses are stored serialized and decoded per hit, so callers
+        get a deep copy and can't alter the cache; frozen CompanyMetrics
+        entries are shared as is.
+        """
+        with self._cache_lock:
+            entry = cache.get(key)
+            if entry and entry[0] > time.monotonic():
+                cache.move_to_end(key)
+                self.cache_hits += 1
+                data = entry[1]
+                return orjson.loads(data) if isinstance(data, bytes) else data
+            cache.pop(key, None)
+            self.cache_misses += 1
             return None
     
+    def _cache_put(self, cache: OrderedDict, key: str, data):
+        """Cache a successful result (failures are retried next time); returns data"""
+        if data:
+            with self._cache_lock:
+                stored = orjson.dumps(data) if isinstance(data, (dict, list)) else data
+                cache[key] = (time.monotonic() + self.cache_ttl, stored)
+                cache.move_to_end(key)
+                while len(cache) > FINNHUB_CACHE_SIZE:
+                    cache.popitem(last=False)
+        return data
+    
+    @staticmethod
+    def _request_key(endpoint: str, params: Optional[Dict]) -> str:
+        return f"{endpoint}:{'&'.join(f'{k}={v}' for k, v in sorted((params or {}).items()))}"
+    
+    def _make_request(self, endpoint: str, params: Dict = None, cache: bool = True) -> Optional[Dict]:
+        """Make API request with rate limiting (served from cache when fresh)
+        
+        ``cache=False`` skips the response cache, for callers that keep their
+        own parsed copy.
+        """
+        key = self._request_key(endpoint, params)
+        cached = self._cache_get(self._response_cache, key) if cache else None
+        if cached is not None:
+            return cached
+        
+        url = f"{self.base_url}/{endpoint}"
+        for attempt in range(RETRY_ATTEMPTS):
+            if not self._rate_limit_check():
+                return None
+                
+            try:
+                response = self.session.get(url, params=params)
+                
+                if response.status_code in RETRY_STATUSES and attempt < RETRY_ATTEMPTS - 1:
+                    delay = self._retry_delay(attempt, response.headers.get('Retry-After'))
+                    self.logger.warning(f"Finnhub returned {response.status_code}, retrying in {delay:.1f}s")
+                    time.sleep(delay)
+                    continue
+                
+                response.raise_for_status()
+                data = orjson.loads(response.content)
+                return self._cache_put(self._response_cache, key, data) if cache else data
+                
+            except (httpx.HTTPError, ValueError) as e:
+                self.logger.error(f"Finnhub API error: {str(e)}")
+                return None
+    
+    async def _make_request_async(self, session: aiohttp.ClientSession, endpoint: str,
+                                  params: Dict = None) -> Optional[Dict]:
+        """_make_request on an aiohttp session"""
+        key = self._request_key(endpoint, params)
+        cached = self._cache_get(self._response_cache, key)
+        if cached is not None:
+            return cached
+        
+        url = f"{self.base_url}/{endpoint}"
+        for attempt in range(RETRY_ATTEMPTS):
+            if not await self._rate_limit_check_async():
+                return None
+            
+            try:
+                async with session.get(url, params=params) as response:
+                    if response.status in RETRY_STATUSES and attempt < RETRY_ATTEMPTS - 1:
+                        delay = self._retry_delay(attempt, response.headers.get('Retry-After'))
+                        self.logger.warning(f"Finnhub returned {response.status}, retrying in {delay:.1f}s")
+                        await asyncio.sleep(delay)
+                        continue
+                    
+                    response.raise_for_status()
+                    return self._cache_put(self._response_cache, key, orjson.loads(await response.read()))
+                
+            except (aiohttp.ClientError, asyncio.TimeoutError, orjson.JSONDecodeError) as e:
+                self.logger.error(f"Finnhub API error: {str(e)}")
+                return None
+    
+    @staticmethod
+    def _retry_delay(attempt: int, retry_after: Optional[str]) -> float:
+        """Seconds before retrying: the server's Retry-After when given, else jittered backoff"""
+        try:
+            return min(RETRY_MAX_DELAY, max(0.0, float(retry_after)))
+        except (TypeError, ValueError):
+            return backoff_delay(attempt, base=RETRY_BACKOFF_BASE, cap=RETRY_MAX_DELAY, jitter=0.3)
+    
+    def _async_session(self) -> aiohttp.ClientSession:
+        """Session for one async scan: pooled keep-alive connections, auth header set"""
+        return aiohttp.ClientSession(
+            headers={'X-Finnhub-Token': self.api_key},
+            connector=aiohttp.TCPConnector(limit=ASYNC_CONNECTION_LIMIT, keepalive_timeout=30),
+            timeout=aiohttp.ClientTimeout(total=10)
+        )
+    
     def get_company_metrics(self, symbol: str) -> Optional[Dict]:
         """Get company metrics with fallback to yfinance"""
+        metrics = self._company_metrics(symbol)
+        return metrics.to_dict() if metrics else None
+    
+    def _company_metrics(self, symbol: str) -> Optional[CompanyMetrics]:
+        if self._known_missing(symbol):
+            return None
+        
         # Try Finnhub first
-        finnhub_data = self._get_finnhub_metrics(symbol)
+        data = self._fetch_stock_metric(symbol)
+        finnhub_data = self._parse_finnhub_metrics(symbol, data)
         
         # If float data not available, use yfinance fallback
-        if not finnhub_data or not finnhub_data.get('shares_outstanding'):
-            self.logger.debug(f"Using yfinance fallback for {symbol}")
-            yf_data = self._get_yfinance_metrics(symbol)
-            if yf_data:
-                # Merge data (prefer Finnhub for technical metrics, yfinance for float)
-                if finnhub_data:
-                    finnhub_data.update(yf_data)
-                    return finnhub_data
-                else:
-                    return yf_data
+        if self._needs_fallback(finnhub_data):
+            self.logger.debug("Using yfinance fallback for %s", symbol)
+            yf_data, yf_answered = self._get_yfinance_metrics(symbol)
+            return self._remember_missing(
+                symbol, self._merge_metrics(finnhub_data, yf_data), self._finnhub_answered(data) and yf_answered
+            )
+        
+        return finnhub_data
+    
+    def _finnhub_answered(self, data: Optional[Dict]) -> bool:
+        """Whether a stock/metric result is Finnhub's answer rather than a failed request"""
+        return data is not None or not self.enabled
+    
+    @staticmethod
+    def _needs_fallback(finnhub_data: Optional[CompanyMetrics]) -> bool:
+        """True when Finnhub has no float data for the symbol"""
+        return not finnhub_data or not finnhub_data.shares_outstanding
+    
+    @staticmethod
+    def _merge_metrics(finnhub_data: Optional[CompanyMetrics],
+                       yf_data: Optional[CompanyMetrics]) -> Optional[CompanyMetrics]:
+        """Merge fallback data (yfinance carries every field, so it wins outright)"""
+        return yf_data or finnhub_data
+    
+    async def get_company_metrics_async(self, session: aiohttp.ClientSession, symbol: str) -> Optional[Dict]:
+        """get_company_metrics on an aiohttp session (yfinance fallback runs in a thread)"""
+        metrics = await self._company_metrics_async(session, symbol)
+        return metrics.to_dict() if metrics else None
+    
+    async def _company_metrics_async(self, session: aiohttp.ClientSession, symbol: str) -> Optional[CompanyMetrics]:
+        if self._known_missing(symbol):
+            return None
+        
+        data = await self._fetch_stock_metric_async(session, symbol)
+        finnhub_data = self._parse_finnhub_metrics(symbol, data)
+        
+        if self._needs_fallback(finnhub_data):
+            self.logger.debug("Using yfinance fallback for %s", symbol)
+            yf_data, yf_answered = await asyncio.to_thread(self._get_yfinance_metrics, symbol)
+            return self._remember_missing(
+                symbol, self._merge_metrics(finnhub_data, yf_data), self._finnhub_answered(data) and yf_answered
+            )
         
         return finnhub_data
     
-    def _get_finnhub_metrics(self, symbol: str) -> Optional[Dict]:
-        """Get metrics from Finnhub API"""
+    def _fetch_stock_metric(self, symbol: str) -> Optional[Dict]:
+        """Raw stock/metric response, shared by the float metrics and get_basic_financials
+        
+        One request per symbol even when several scan threads ask at once:
+        later callers wait on the symbol's lock stripe and read the cached response.
+        """
         params = {
             'symbol': symbol,
             'metric': 'all'
         }
         
-        data = self._make_request('stock/metric', params)
+        with self._metric_locks[hash(symbol) % METRIC_LOCK_STRIPES]:
+            return self._make_request('stock/metric', params)
+    
+    async def _fetch_stock_metric_async(self, session: aiohttp.ClientSession, symbol: str) -> Optional[Dict]:
+        """_fetch_stock_metric on an aiohttp session; concurrent callers await one request"""
+        key = (id(session), symbol)
+        pending = self._metric_requests.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(
+                self._make_request_async(session, 'stock/metric', {'symbol': symbol, 'metric': 'all'})
+            )
+            self._metric_requests[key] = pending
+            pending.add_done_callback(lambda _: self._metric_requests.pop(key, None))
+        # Shielded so one cancelled caller doesn't cancel the request for the others
+        return await asyncio.shield(pending)
+    
+    def _parse_finnhub_metrics(self, symbol: str, data: Optional[Dict]) -> Optional[CompanyMetrics]:
+        """Key float metrics from a stock/metric response"""
         if not data or 'metric' not in data:
             return None
             
         metrics = data['metric']
         
         # Extract key float metrics
-        result = {
-            'symbol': symbol,
-            'shares_outstanding': metrics.get('sharesOutstanding'),
-            'float_shares': metrics.get('floatShares'),
-            'market_cap': metrics.get('marketCapitalization'),
-            'enterprise_value': metrics.get('enterpriseValue'),
-            'shares_short': metrics.get('sharesShort'),
-            'short_ratio': metrics.get('shortRatio'),
-            'beta': metrics.get('beta'),
-            'pe_ratio': metrics.get('peBasicExclExtraTTM'),
-            'data_source': 'finnhub',
-            'timestamp': datetime.now().isoformat()
-        }
-        
-        return result
+        return CompanyMetrics(
+            symbol=symbol,
+            shares_outstanding=metrics.get('sharesOutstanding'),
+            float_shares=metrics.get('floatShares'),
+            market_cap=metrics.get('marketCapitalization'),
+            enterprise_value=metrics.get('enterpriseValue'),
+            shares_short=metrics.get('sharesShort'),
+            short_ratio=metrics.get('shortRatio'),
+            beta=metrics.get('beta'),
+            pe_ratio=metrics.get('peBasicExclExtraTTM'),
+            data_source='finnhub',
+            timestamp=self._now_iso()
+        )
     
-    def _get_yfinance_metrics(self, symbol: str) -> Optional[Dict]:
-        """Get float metrics from Yahoo Finance as fallback"""
+    def _get_yfinance_metrics(self, symbol: str) -> Tuple[Optional[CompanyMetrics], bool]:
+        """
+        Get float metrics from Yahoo Finance as fallback (cached like Finnhub responses)
+        
+        Returns (metrics, answered); answered is False when the lookup failed
+        rather than Yahoo having no data.
+        """
+        cached = self._cache_get(self._yfinance_cache, symbol)
+        if cached is not None:
+            return cached, True
         try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
-            
-            if not info:
-                return None
-            
-            result = {
-                'symbol': symbol,
-                'shares_outstanding': info.get('sharesOutstanding'),
-                'float_shares': info.get('floatShares'),
-                'market_cap': info.get('marketCap'),
-                'enterprise_value': info.get('enterpriseValue'),
-                'shares_short': info.get('sharesShort'),
-                'short_ratio': info.get('shortRatio'),
-                'beta': info.get('beta'),
-                'pe_ratio': info.get('trailingPE'),
-                'data_source': 'yfinance',
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            return result
-            
+            metrics = self._fetch_yfinance_metrics(symbol)
         except Exception as e:
             self.logger.error(f"yfinance error for {symbol}: {str(e)}")
+            return None, False
+        return self._cache_put(self._yfinance_cache, symbol, metrics), True
+    
+    def _get_yfinance_metrics_batch(self, symbols: List[str],
+                                    executor: Optional[ThreadPoolExecutor] = None
+                                    ) -> Tuple[Dict[str, CompanyMetrics], Set[str]]:
+        """yfinance fallback for many symbols behind one yf.Tickers handle
+        
+        Cached symbols are served from the cache; the rest share a single
+        Tickers session and, when an executor is given, have their .info
+        lookups overlapped on it. Returns (metrics by symbol, symbols whose
+        lookup failed); symbols Yahoo has no data for are in neither.
+        """
+        results = {}
+        failed = set()
+        missing = []
+        for symbol in dict.fromkeys(symbols):
+            cached = self._cache_get(self._yfinance_cache, symbol)
+            if cached is not None:
+                results[symbol] = cached
+            else:
+                missing.append(symbol)
+        
+        if not missing:
+            return results, failed
+        
+        try:
+            tickers = yf.Tickers(" ".join(missing)).tickers
+        except Exception as e:
+            self.logger.error(f"yfinance batch error: {str(e)}")
+            return results, failed.union(missing)
+        
+        def fetch(symbol: str) -> Tuple[Optional[CompanyMetrics], bool]:
+            ticker = tickers.get(symbol) or tickers.get(symbol.upper())
+            if ticker is None:
+                return None, False
+            try:
+                metrics = self._yfinance_metrics_from(symbol, ticker)
+            except Exception as e:
+                self.logger.error(f"yfinance error for {symbol}: {str(e)}")
+                return None, False
+            return self._cache_put(self._yfinance_cache, symbol, metrics), True
+        
+        fetched = executor.map(fetch, missing) if executor else map(fetch, missing)
+        for symbol, (data, answered) in zip(missing, fetched):
+            if data:
+                results[symbol] = data
+            elif not answered:
+                failed.add(symbol)
+        
+        return results, failed
+    
+    def _fetch_yfinance_metrics(self, symbol: str) -> Optional[CompanyMetrics]:
+        """Uncached Yahoo Finance lookup; raises if the lookup itself fails"""
+        return self._yfinance_metrics_from(symbol, yf.Ticker(symbol))
+    
+    def _yfinance_metrics_from(self, symbol: str, ticker) -> Optional[CompanyMetrics]:
+        """Key float metrics from a yfinance Ticker's info (None if Yahoo has none)"""
+        info = ticker.info
+        
+        if not info:
             return None
+        
+        return CompanyMetrics(
+            symbol=symbol,
+            shares_outstanding=info.get('sharesOutstanding'),
+            float_shares=info.get('floatShares'),
+            market_cap=info.get('marketCap'),
+            enterprise_value=info.get('enterpriseValue'),
+            shares_short=info.get('sharesShort'),
+            short_ratio=info.get('shortRatio'),
+            beta=info.get('beta'),
+            pe_ratio=info.get('trailingPE'),
+            data_source='yfinance',
+            timestamp=self._now_iso()
+        )
     
     def get_company_profile(self, symbol: str) -> Optional[Dict]:
         """Get company profile data"""
@@ -172,12 +607,7 @@ class FinnhubClient:
     
     def get_basic_financials(self, symbol: str) -> Optional[Dict]:
         """Get basic financial metrics"""
-        params = {
-            'symbol': symbol,
-            'metric': 'all'
-        }
-        
-        data = self._make_request('stock/metric', params)
+        data = self._fetch_stock_metric(symbol)
         if not data:
             return None
             
@@ -185,14 +615,26 @@ class FinnhubClient:
     
     def calculate_float_metrics(self, symbol: str) -> Optional[Dict]:
         """Calculate advanced float metrics for squeeze analysis"""
-        metrics = self.get_company_metrics(symbol)
+        float_data = self._float_metrics_from(symbol, self._company_metrics(symbol))
+        return float_data.to_dict() if float_data else None
+    
+    async def calculate_float_metrics_async(self, session: aiohttp.ClientSession, symbol: str) -> Optional[Dict]:
+        """calculate_float_metrics on an aiohttp session"""
+        float_data = await self._float_metrics_async(session, symbol)
+        return float_data.to_dict() if float_data else None
+    
+    async def _float_metrics_async(self, session: aiohttp.ClientSession, symbol: str) -> Optional[FloatMetrics]:
+        return self._float_metrics_from(symbol, await self._company_metrics_async(session, symbol))
+    
+    def _float_metrics_from(self, symbol: str, metrics: Optional[CompanyMetrics]) -> Optional[FloatMetrics]:
+        """Float ratios, category and squeeze potential from company metrics"""
         if not metrics:
             return None
             
-        shares_out = metrics.get('shares_outstanding')
-        float_shares = metrics.get('float_shares')
-        shares_short = metrics.get('shares_short')
-        short_ratio = metrics.get('short_ratio')
+        shares_out = metrics.shares_outstanding
+        float_shares = metrics.float_shares
+        shares_short = metrics.shares_short
+        short_ratio = metrics.short_ratio
         
         if not all([shares_out, float_shares]):
             return None
@@ -206,38 +648,28 @@ class FinnhubClient:
         float_category = self._categorize_float(float_shares)
         squeeze_potential = self._calculate_squeeze_potential(short_interest, short_ratio)
         
-        result = {
-            'symbol': symbol,
-            'shares_outstanding': shares_out,
-            'float_shares': float_shares,
-            'insider_ownership_pct': round(insider_ownership * 100, 2),
-            'float_percentage': round(float_percentage * 100, 2),
-            'short_interest_pct': round(short_interest * 100, 2) if short_interest else None,
-            'short_ratio': short_ratio,
-            'float_category': float_category,
-            'squeeze_potential': squeeze_potential,
-            'is_microfloat': float_shares < 10_000_000 if float_shares else False,
-            'is_low_float': float_shares < 50_000_000 if float_shares else False,
-            'timestamp': datetime.now().isoformat()
-        }
-        
-        return result
+        return FloatMetrics(
+            symbol=symbol,
+            shares_outstanding=shares_out,
+            float_shares=float_shares,
+            insider_ownership_pct=round(insider_ownership * 100, 2),
+            float_percentage=round(float_percentage * 100, 2),
+            short_interest_pct=round(short_interest * 100, 2) if short_interest else None,
+            short_ratio=short_ratio,
+            float_category=float_category,
+            squeeze_potential=squeeze_potential,
+            is_microfloat=float_shares < 10_000_000 if float_shares else False,
+            is_low_float=float_shares < 50_000_000 if float_shares else False,
+            timestamp=self._now_iso()
+        )
     
     def _categorize_float(self, float_shares: Optional[float]) -> str:
         """Categorize float size"""
         if not float_shares:
             return 'unknown'
         
-        if float_shares < 5_000_000:
-            return 'nano_float'
-        elif float_shares < 10_000_000:
-            return 'micro_float'
-        elif float_shares < 50_000_000:
-            return 'low_float'
-        elif float_shares < 200_000_000:
-            return 'medium_float'
-        else:
-            return 'high_float'
+        # Upper bounds are exclusive (< 5M is nano_float)
+        return _FLOAT_LABELS[bisect_right(_FLOAT_BOUNDS, float_shares)]
     
     def _calculate_squeeze_potential(self, short_interest: Optional[float], 
                                    short_ratio: Optional[float]) -> str:
@@ -245,32 +677,67 @@ class FinnhubClient:
         if not short_interest:
             return 'unknown'
         
-        if short_interest > 0.4:  # >40% short interest
-            return 'extreme'
-        elif short_interest > 0.25:  # >25% short interest
-            return 'high'
-        elif short_interest > 0.15:  # >15% short interest
-            return 'moderate'
-        elif short_interest > 0.05:  # >5% short interest
-            return 'low'
-        else:
-            return 'minimal'
+        # Lower bounds are exclusive (> 40% short interest is extreme)
+        return _SQUEEZE_LABELS[bisect_left(_SQUEEZE_BOUNDS, short_interest)]
     
     def scan_multiple_symbols(self, symbols: List[str]) -> List[Dict]:
         """Scan multiple symbols for float data"""
-        results = []
-        
+        return [float_data.to_dict() for float_data in self._scan(symbols)]
+    
+    def _scan(self, symbols: List[str]) -> List[FloatMetrics]:
         self.logger.info(f"Scanning {len(symbols)} symbols for float data...")
         
-        for i, symbol in enumerate(symbols):
-            self.logger.debug(f"Scanning {symbol} ({i+1}/{len(symbols)})")
-            
-            float_data = self.calculate_float_metrics(symbol)
+        # Lookups are network-bound; overlap them and let _rate_limit_check pace
+        # the actual requests (results keep the input order)
+        # Symbols Finnhub has no float data for go through one batched yfinance
+        # fallback instead of a Ticker lookup each
+        symbols = [symbol for symbol in symbols if not self._known_missing(symbol)]
+        with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+            responses = []
+            for done, data in enumerate(executor.map(self._fetch_stock_metric, symbols), 1):
+                responses.append(data)
+                if done % SCAN_PROGRESS_EVERY == 0:
+                    self.logger.info("Fetched %d/%d symbols", done, len(symbols))
+            finnhub_data = [self._parse_finnhub_metrics(symbol, data) for symbol, data in zip(symbols, responses)]
+            fallback = [symbol for symbol, data in zip(symbols, finnhub_data) if self._needs_fallback(data)]
+            yf_data, yf_failed = self._get_yfinance_metrics_batch(fallback, executor) if fallback else ({}, set())
+        
+        results = []
+        for symbol, response, data in zip(symbols, responses, finnhub_data):
+            if self._needs_fallback(data):
+                answered = self._finnhub_answered(response) and symbol not in yf_failed
+                metrics = self._remember_missing(symbol, self._merge_metrics(data, yf_data.get(symbol)), answered)
+            else:
+                metrics = data
+            float_data = self._float_metrics_from(symbol, metrics)
             if float_data:
                 results.append(float_data)
-            
-            # Small delay to be respectful to API
-            time.sleep(0.1)
+        
+        self.logger.info(f"Successfully scanned {len(results)} symbols")
+        return results
+    
+    async def scan_multiple_symbols_async(self, symbols: List[str]) -> List[Dict]:
+        """
+        Scan multiple symbols for float data on one event loop
+        
+        All lookups share one keep-alive session and run concurrently, paced
+        by the rate limiter. Results keep the input order.
+        """
+        return [float_data.to_dict() for float_data in await self._scan_async(symbols)]
+    
+    async def _scan_async(self, symbols: List[str]) -> List[FloatMetrics]:
+        if not self.enabled:
+            # No Finnhub session to open; the sync scan goes straight to the
+            # batched yfinance fallback, like scan_multiple_symbols does
+            return await asyncio.to_thread(self._scan, symbols)
+        
+        self.logger.info(f"Scanning {len(symbols)} symbols for float data...")
+        
+        async with self._async_session() as session:
+            scanned = await asyncio.gather(
+                *(self._float_metrics_async(session, symbol) for symbol in symbols)
+            )
+        results = [float_data for float_data in scanned if float_data]
         
         self.logger.info(f"Successfully scanned {len(results)} symbols")
         return results
@@ -278,14 +745,69 @@ class FinnhubClient:
     def get_float_leaders(self, symbols: List[str], 
                          category: str = 'micro_float') -> List[Dict]:
         """Get symbols matching specific float category"""
-        all_data = self.scan_multiple_symbols(symbols)
+        return self._filter_float_leaders(self._scan(self._prune_for_category(symbols, category)), category)
+    
+    async def get_float_leaders_async(self, symbols: List[str],
+                                      category: str = 'micro_float') -> List[Dict]:
+        """get_float_leaders on top of scan_multiple_symbols_async"""
+        symbols = await asyncio.to_thread(self._prune_for_category, symbols, category)
+        return self._filter_float_leaders(await self._scan_async(symbols), category)
+    
+    def _prune_for_category(self, symbols: List[str], category: str) -> List[str]:
+        """Drop symbols that can't be small-float stocks before scanning them
+        
+        Uses one bulk stock/symbol call (cached) instead of a metrics call per
+        symbol, fetched only for scans of LISTING_PRUNE_MIN_SYMBOLS or more.
+        Symbols missing from the listing are kept.
+        """
+        if category not in SMALL_FLOAT_CATEGORIES or not self.enabled:
+            return symbols
+        
+        listing = self._us_listing(refresh=len(symbols) >= LISTING_PRUNE_MIN_SYMBOLS)
+        if not listing:
+            return symbols
+        
+        pruned = [symbol for symbol in symbols if listing.get(symbol) not in _NON_FLOAT_TYPES]
+        if len(pruned) < len(symbols):
+            self.logger.info("Pruned %d of %d symbols that can't be %s", len(symbols) - len(pruned), len(symbols), category)
+        return pruned
+    
+    def _us_listing(self, refresh: bool = True) -> Dict[str, str]:
+        """
+        Symbol -> security type for US listings, refreshed every cache_ttl seconds
+        
+        Only the parsed map is kept, not the raw response. With refresh=False an
+        expired listing is not refetched and {} is returned instead.
+        """
+        expiry, listing = self._listing
+        if expiry > time.monotonic():
+            return listing
+        if not refresh:
+            return {}
+        
+        data = self._make_request('stock/symbol', {'exchange': 'US'}, cache=False)
+        if not data:
+            return listing  # keep a stale listing rather than none
+        
+        listing = {item['symbol']: item.get('type', '') for item in data if item.get('symbol')}
+        self._listing = (time.monotonic() + self.cache_ttl, listing)
+        return listing
+    
+    def _filter_float_leaders(self, all_data: List[FloatMetrics], category: str) -> List[Dict]:
+        """Symbols in the float category, smallest float first (as dicts)"""
+        if not all_data:
+            return []
         
-        filtered = [
-            data for data in all_data 
-            if data.get('float_category') == category
-        ]
+        # Filter and sort on columns instead of per-object lookups; only the
+        # selected results are turned into dicts
+        columns = np.fromiter(
+            ((data.float_category or '', data.float_shares or np.inf) for data in all_data),
+            dtype=_LEADER_DTYPE,
+            count=len(all_data)
+        )
+        selected = np.flatnonzero(columns['float_category'] == category)
         
-        # Sort by float size (smallest first)
-        filtered.sort(key=lambda x: x.get('float_shares', float('inf')))
+        # Sort by float size (smallest first); stable so ties keep scan order
+        order = selected[np.argsort(columns['float_shares'][selected], kind='stable')]
         
-        return filtered
\ No newline at end of file
+        return [all_data[i].to_dict() for i in order]
@@ -8,6 +8,10 @@ from src.utils.logger import setup_logger
 
 load_dotenv()
 
+# (connect, read) seconds per API request; callers such as PatternAnalyzer cap
+# a whole lookup at 15s, so a single request must not outlive that
+REQUEST_TIMEOUT = (5, 10)
+
 # Try to import scraper, fallback to API client if not available
 try:
     from src.api.flash_research_final_scraper import FlashResearchFinalScraper
@@ -60,7 +64,7 @@ class FlashResearchClient:
                 'password': self.password
             }
             
-            response = self.session.post(login_url, json=login_data)
+            response = self.session.post(login_url, json=login_data, timeout=REQUEST_TIMEOUT)
             
             if response.status_code == 200:
                 auth_data = response.json()
@@ -108,14 +112,14 @@ class FlashResearchClient:
         
         try:
             url = f"{self.base_url}/api/{endpoint.lstrip('/')}"
-            response = self.session.get(url, params=params)
+            response = self.session.get(url, params=params, timeout=REQUEST_TIMEOUT)
             
             if response.status_code == 200:
                 return response.json()
             elif response.status_code == 401:
                 # Re-authenticate and retry once
                 if self.authenticate():
-                    response = self.session.get(url, params=params)
+                    response = self.session.get(url, params=params, timeout=REQUEST_TIMEOUT)
                     if response.status_code == 200:
                         return response.json()
             
@@ -405,7 +409,9 @@ class FlashResearchClient:
                         'avg_gap_size': gap_stats.get('avg_gap_size', 4.2),
                         'overall_edge_score': edge_score,
                         'trading_recommendations': self._get_recommendations_from_stats(gap_stats),
-                        'source': scraper_result.get('source', 'flash_research_final')
+                        'source': scraper_result.get('source', 'flash_research_final'),
+                        # Set when the scraper couldn't log in; worth retrying later
+                        'retryable': scraper_result.get('retryable', False)
                     }
                 else:
                     # Fall back to simulated data
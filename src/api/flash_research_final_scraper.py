@@ -16,6 +16,9 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
 logger = logging.getLogger(__name__)
 
+# Seconds a page load may take before Selenium gives up (its default is 300)
+PAGE_LOAD_TIMEOUT = 15
+
 class FlashResearchFinalScraper:
     """Final scraper using discovered login form"""
     
@@ -37,6 +40,7 @@ class FlashResearchFinalScraper:
         chrome_options.add_argument("--window-size=1920,1080")
         
         self.driver = webdriver.Chrome(options=chrome_options)
+        self.driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
         self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
         
     def login(self) -> bool:
@@ -140,8 +144,10 @@ class FlashResearchFinalScraper:
         """Get comprehensive analysis for a symbol"""
         # Check if we need to authenticate
         if not self._ensure_authenticated():
+            # Logins get rate-limited now and then; flag the result so callers
+            # can retry, unlike a symbol that simply has no data
             logger.warning("🔄 Using simulated data - authentication failed")
-            return self._get_simulated_data(symbol)
+            return {**self._get_simulated_data(symbol), 'retryable': True}
         
         try:
             return self._extract_real_data(symbol)
@@ -1,12 +1,24 @@
 import os
+import time
+import hashlib
 import openai
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dotenv import load_dotenv
 from src.utils.logger import setup_logger
 
 load_dotenv()
 
+# Identical prompts within this window reuse the previous analysis
+AI_CACHE_TTL = 600  # 10 minutes
+
+# Per-request limit in seconds (the SDK default is 600); stays under the 30s
+# budget PatternAnalyzer gives an analysis call
+AI_REQUEST_TIMEOUT = 25.0
+
+# Parse failures that should be retried rather than cached
+_UNCACHEABLE_PATTERNS = ('Analysis Error', 'Parse Error')
+
 
 class OpenAIClient:
     """OpenAI API client for pattern analysis and playbook generation"""
@@ -21,10 +33,14 @@ class OpenAIClient:
             return
         
         # Initialize OpenAI client (new v1+ API)
-        self.client = openai.OpenAI(api_key=self.api_key)
+        self.client = openai.OpenAI(api_key=self.api_key, timeout=AI_REQUEST_TIMEOUT)
         self.enabled = True
         self.model = "gpt-4o"  # Latest GPT-4 model
         
+        # Pattern analyses keyed by a hash of model + prompt: key -> (expiry, result)
+        self.cache_ttl = float(os.getenv('OPENAI_CACHE_TTL', AI_CACHE_TTL))
+        self._analysis_cache: Dict[str, Tuple[float, Dict]] = {}
+        
         self.logger.info("OpenAI client initialized successfully")
     
     def analyze_trading_pattern(self, gap_data: Dict, float_data: Optional[Dict] = None, 
@@ -39,8 +55,18 @@ class OpenAIClient:
             # Prepare data for AI analysis
             analysis_prompt = self._build_analysis_prompt(gap_data, float_data, news_data)
             
-            # Call OpenAI API (new v1+ API)
-            response = self.client.chat.completions.create(
+            # Rescans of an unchanged setup build the same prompt; reuse that answer
+            cache_key = hashlib.blake2b(
+                f"{self.model}\0{analysis_prompt}".encode(), digest_size=16
+            ).hexdigest()
+            cached = self._analysis_cache.get(cache_key)
+            if cached and cached[0] > time.monotonic():
+                self.logger.info(f"Using cached AI analysis for {gap_data['symbol']}")
+                return dict(cached[1])
+            
+            # Call OpenAI API (new v1+ API); no SDK retries, so one call stays
+            # within AI_REQUEST_TIMEOUT (PatternAnalyzer hedges it instead)
+            response = self.client.with_options(max_retries=0).chat.completions.create(
                 model=self.model,
                 messages=[
                     {
@@ -58,7 +84,17 @@ class OpenAIClient:
             
             # Parse response
             ai_response = response.choices[0].message.content
-            return self._parse_ai_response(ai_response, gap_data['symbol'])
+            analysis = self._parse_ai_response(ai_response, gap_data['symbol'])
+            
+            if analysis.get('pattern_type') not in _UNCACHEABLE_PATTERNS:
+                now = time.monotonic()
+                self._analysis_cache = {
+                    key: entry for key, entry in self._analysis_cache.items() if entry[0] > now
+                }
+                self._analysis_cache[cache_key] = (now + self.cache_ttl, analysis)
+                analysis = dict(analysis)
+            
+            return analysis
             
         except Exception as e:
             self.logger.error(f"Error in AI pattern analysis: {str(e)}")
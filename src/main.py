@@ -291,11 +291,13 @@ class TradingBot:
                     message = self._create_fallback_alert(gap)
                     self.logger.info(f"📱 Sending fallback alert for {gap['symbol']}")
                 
-                await self.telegram_bot.send_alert(message)
-                await asyncio.sleep(3)  # Delay between messages
+                # Queued so building the next alert doesn't wait on Telegram
+                await self.telegram_bot.queue_alert(message)
                 
             except Exception as e:
                 self.logger.error(f"❌ Failed to send alert for {gap['symbol']}: {str(e)}")
+        
+        await self.telegram_bot.flush_alerts()
     
     def _create_fallback_alert(self, gap_data):
         """Create fallback alert when AI analysis is not available"""
@@ -7,6 +7,9 @@ from src.utils.logger import setup_logger
 
 load_dotenv()
 
+# screen_watchlist logs progress every SCREEN_PROGRESS_EVERY symbols
+SCREEN_PROGRESS_EVERY = 100
+
 
 class FloatScreener:
     def __init__(self):
@@ -110,7 +113,7 @@ class FloatScreener:
         results = []
         screened_count = 0
         
-        for symbol in symbols:
+        for i, symbol in enumerate(symbols, 1):
             float_data = self.screen_symbol(symbol)
             if float_data:
                 results.append(float_data)
@@ -119,7 +122,10 @@ class FloatScreener:
                 # Log interesting finds
                 screening = float_data.get('screening_results', {})
                 if screening.get('float_score', 0) > 50:
-                    self.logger.info(f"🎯 High score: {symbol} - Score: {screening['float_score']}")
+                    self.logger.info("🎯 High score: %s - Score: %s", symbol, screening['float_score'])
+            
+            if i % SCREEN_PROGRESS_EVERY == 0:
+                self.logger.info("Screening progress: %d/%d symbols", i, len(symbols))
         
         # Sort by float score (highest first)
         results.sort(key=lambda x: x.get('screening_results', {}).get('float_score', 0), reverse=True)
@@ -1,10 +1,11 @@
 import os
 from datetime import datetime, timedelta, time
 from typing import List, Dict, Optional, Tuple
-import pytz
+from zoneinfo import ZoneInfo
 from dotenv import load_dotenv
 from alpaca.data.timeframe import TimeFrame
 from src.api.alpaca_client import AlpacaClient
+from src.utils.async_runner import run_sync
 from src.utils.logger import setup_logger
 import asyncio
 import pandas as pd
@@ -23,7 +24,7 @@ class GapScanner:
         self.max_price = float(os.getenv('MAX_PRICE', 20.00))
         self.min_volume = 100000  # Minimum average volume
         
-        self.eastern = pytz.timezone('US/Eastern')
+        self.eastern = ZoneInfo('US/Eastern')
         
     def calculate_gap_percentage(self, premarket_price: float, previous_close: float) -> float:
         """Calculate gap percentage between premarket and previous close"""
@@ -31,11 +32,12 @@ class GapScanner:
             return 0
         return ((premarket_price - previous_close) / previous_close) * 100
     
-    def get_previous_close(self, symbol: str) -> Optional[float]:
-        """Get previous day's closing price using snapshot data"""
+    def get_previous_close(self, symbol: str, snapshot=None) -> Optional[float]:
+        """Get previous day's closing price using snapshot data (fetched if not given)"""
         try:
             # Use snapshot which includes previous daily bar
-            snapshot = self.client.get_snapshot(symbol)
+            if snapshot is None:
+                snapshot = self.client.get_snapshot(symbol)
             
             if snapshot and snapshot.previous_daily_bar:
                 # Use previous_daily_bar for the actual previous trading day
@@ -47,10 +49,11 @@ class GapScanner:
             self.logger.error(f"Error getting previous close for {symbol}: {str(e)}")
             return None
     
-    def get_premarket_price(self, symbol: str) -> Optional[Tuple[float, int]]:
-        """Get current premarket price and volume"""
+    def get_premarket_price(self, symbol: str, snapshot=None) -> Optional[Tuple[float, int]]:
+        """Get current premarket price and volume (snapshot fetched if not given)"""
         try:
-            snapshot = self.client.get_snapshot(symbol)
+            if snapshot is None:
+                snapshot = self.client.get_snapshot(symbol)
             
             if snapshot and snapshot.latest_trade:
                 current_price = float(snapshot.latest_trade.price)
@@ -67,20 +70,26 @@ class GapScanner:
             self.logger.error(f"Error getting premarket price for {symbol}: {str(e)}")
             return None
     
-    def scan_symbol(self, symbol: str) -> Optional[Dict]:
-        """Scan a single symbol for gap criteria"""
+    def scan_symbol(self, symbol: str, snapshot=None, tradeable: Optional[bool] = None) -> Optional[Dict]:
+        """Scan a single symbol for gap criteria (snapshot/tradeable fetched if not given)"""
         try:
             # Check if tradeable
-            if not self.client.is_tradeable(symbol):
+            if tradeable is None:
+                tradeable = self.client.is_tradeable(symbol)
+            if not tradeable:
                 return None
             
+            # One snapshot serves both the previous close and premarket price
+            if snapshot is None:
+                snapshot = self.client.get_snapshot(symbol)
+            
             # Get previous close
-            previous_close = self.get_previous_close(symbol)
+            previous_close = self.get_previous_close(symbol, snapshot)
             if not previous_close:
                 return None
             
             # Get current premarket data
-            premarket_data = self.get_premarket_price(symbol)
+            premarket_data = self.get_premarket_price(symbol, snapshot)
             if not premarket_data:
                 return None
             
@@ -108,7 +117,7 @@ class GapScanner:
                 'timestamp': datetime.now(self.eastern).isoformat()
             }
             
-            self.logger.info(f"Gap found: {symbol} {result['gap_direction']} {abs(gap_percent):.2f}%")
+            self.logger.info("Gap found: %s %s %.2f%%", symbol, result['gap_direction'], abs(gap_percent))
             return result
             
         except Exception as e:
@@ -117,11 +126,33 @@ class GapScanner:
     
     def scan_watchlist(self, symbols: List[str]) -> List[Dict]:
         """Scan a list of symbols for gaps"""
+        return run_sync(self.scan_watchlist_async(symbols))
+    
+    async def scan_watchlist_async(self, symbols: List[str]) -> List[Dict]:
+        """
+        Scan a list of symbols for gaps, overlapping all Alpaca requests
+        
+        The watchlist snapshot batch and the per-symbol tradability checks run
+        concurrently, so wall time follows the slowest request, not their sum.
+        """
         self.logger.info(f"Scanning {len(symbols)} symbols for gaps...")
         
+        # One asset-list request (refreshed daily) replaces per-symbol tradability calls
+        try:
+            await self.client.preload_tradeable_async()
+        except Exception as e:
+            self.logger.error(f"Tradeable asset preload failed, checking per symbol: {str(e)}")
+        
+        snapshots, *tradeable = await asyncio.gather(
+            self._fetch_snapshots(symbols),
+            *(self.client.is_tradeable_async(symbol) for symbol in symbols)
+        )
+        
         results = []
-        for symbol in symbols:
-            gap_data = self.scan_symbol(symbol)
+        for symbol, is_tradeable in zip(symbols, tradeable):
+            if symbol not in snapshots:
+                continue
+            gap_data = self.scan_symbol(symbol, snapshots[symbol], is_tradeable)
             if gap_data:
                 results.append(gap_data)
         
@@ -131,6 +162,26 @@ class GapScanner:
         self.logger.info(f"Found {len(results)} symbols with gaps > {self.min_gap_percent}%")
         return results
     
+    async def _fetch_snapshots(self, symbols: List[str]) -> Dict:
+        """Snapshots for the watchlist in one batch, or per symbol if the batch fails"""
+        try:
+            # One snapshot request for the whole watchlist instead of two per symbol
+            return await self.client.get_snapshots_async(symbols)
+        except Exception as e:
+            self.logger.error(f"Batch snapshot request failed, fetching per symbol: {str(e)}")
+        
+        snapshots = await asyncio.gather(
+            *(self.client.get_snapshot_async(symbol) for symbol in symbols),
+            return_exceptions=True
+        )
+        fetched = {}
+        for symbol, snapshot in zip(symbols, snapshots):
+            if isinstance(snapshot, Exception):
+                self.logger.error(f"Error scanning {symbol}: {str(snapshot)}")
+            else:
+                fetched[symbol] = snapshot
+        return fetched
+    
     def get_market_movers(self) -> List[str]:
         """Get list of potential movers to scan"""
         # Mix of volatile small/micro caps and some liquid names
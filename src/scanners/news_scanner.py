@@ -3,7 +3,7 @@ import requests
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 from dotenv import load_dotenv
-import pytz
+from zoneinfo import ZoneInfo
 from src.utils.logger import setup_logger
 
 load_dotenv()
@@ -15,7 +15,7 @@ class NewsScanner:
     def __init__(self):
         self.logger = setup_logger('news_scanner')
         self.finnhub_key = os.getenv('FINNHUB_API_KEY')
-        self.eastern = pytz.timezone('US/Eastern')
+        self.eastern = ZoneInfo('US/Eastern')
         
         # Keywords that indicate potential catalysts
         self.catalyst_keywords = [
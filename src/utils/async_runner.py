@@ -0,0 +1,33 @@
+import asyncio
+import threading
+from typing import Any, Coroutine, Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_lock = threading.Lock()
+
+
+def _runner_loop() -> asyncio.AbstractEventLoop:
+    """Process-wide event loop on a daemon thread, started on first use"""
+    global _loop, _thread
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            _thread = threading.Thread(target=_loop.run_forever, name='async-runner', daemon=True)
+            _thread.start()
+        return _loop
+
+
+def run_sync(coro: Coroutine) -> Any:
+    """Run a coroutine to completion from synchronous code and return its result
+
+    Works whether or not the caller is already inside an event loop: the
+    coroutine runs on one long-lived background loop, so sync wrappers don't
+    create a new loop per call. Async callers should await the coroutine
+    directly instead, since this blocks the calling thread.
+    """
+    loop = _runner_loop()
+    if threading.current_thread() is _thread:
+        coro.close()
+        raise RuntimeError("run_sync() called from the runner loop; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
@@ -1,7 +1,7 @@
 import os
 from datetime import datetime, time
 from typing import Dict, Tuple, Optional
-import pytz
+from zoneinfo import ZoneInfo
 import requests
 from dotenv import load_dotenv
 from src.utils.logger import setup_logger
@@ -12,7 +12,7 @@ load_dotenv()
 class MarketHoursManager:
     def __init__(self):
         self.logger = setup_logger('market_hours')
-        self.eastern = pytz.timezone('US/Eastern')
+        self.eastern = ZoneInfo('US/Eastern')
         
         # Load schedule from .env
         self.premarket_start = self._parse_time(os.getenv('PREMARKET_START', '04:00'))
@@ -0,0 +1,37 @@
+import random
+import time
+from typing import Any, Callable, Optional, Tuple, Type
+
+import requests
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 60.0, jitter: float = 0.2) -> float:
+    """Exponential backoff delay for the given attempt, capped and jittered"""
+    return min(cap, base * 2 ** attempt) * (1 + random.uniform(-jitter, jitter))
+
+
+def with_backoff(fn: Callable[[], Any],
+                 attempts: int = 4,
+                 base: float = 1.0,
+                 cap: float = 60.0,
+                 jitter: float = 0.2,
+                 exceptions: Tuple[Type[BaseException], ...] = (requests.RequestException,),
+                 retry_if: Optional[Callable[[Any], bool]] = None) -> Any:
+    """Call fn, retrying transient failures with exponential backoff + jitter
+
+    A call is retried when it raises one of ``exceptions`` or when ``retry_if``
+    returns True for its result. The last exception is re-raised, or the last
+    result returned, once all attempts are used up.
+    """
+    for attempt in range(attempts):
+        last_attempt = attempt == attempts - 1
+        try:
+            result = fn()
+        except exceptions:
+            if last_attempt:
+                raise
+        else:
+            if last_attempt or retry_if is None or not retry_if(result):
+                return result
+
+        time.sleep(backoff_delay(attempt, base, cap, jitter))
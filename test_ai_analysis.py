@@ -81,7 +81,7 @@ async def test_ai_pattern_analysis():
             
             # Run AI pattern analysis
             print("🧠 Running AI pattern analysis...")
-            pattern_analysis = pattern_analyzer.analyze_gap_setup(gap_data, float_data)
+            pattern_analysis = await pattern_analyzer.analyze_gap_setup_async(gap_data, float_data)
             
             if pattern_analysis:
                 print(f"✅ Pattern identified: {pattern_analysis['pattern_type']}")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Offline checks for the Finnhub client's rate limiter and caches
+Ejecutar: python test_finnhub_cache.py
+"""
+import os
+
+os.environ.setdefault('FINNHUB_API_KEY', 'test-key')
+
+import orjson
+from src.api.finnhub_client import FinnhubClient, NEGATIVE_CACHE_SIZE
+
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self.status_code = status_code
+        self.content = orjson.dumps(payload)
+        self.headers = {}
+
+    def raise_for_status(self):
+        pass
+
+
+def make_client(payloads):
+    """Client whose HTTP session answers from payloads (endpoint -> body) and counts calls"""
+    client = FinnhubClient()
+    client.calls = []
+
+    def get(url, params=None):
+        endpoint = url[len(client.base_url) + 1:]
+        client.calls.append(endpoint)
+        return FakeResponse(payloads.get(endpoint))
+
+    client.session.get = get
+    return client
+
+
+def test_token_bucket_bursts_then_paces():
+    client = make_client({})
+    waits = [client._take_token() for _ in range(client.calls_per_minute + 2)]
+
+    assert all(wait == 0.0 for wait in waits[:client.calls_per_minute])
+    # Each throttled caller reserves the next token, so waits grow one refill apart
+    assert 0.9 < waits[-2] < 1.1
+    assert 1.9 < waits[-1] < 2.1
+
+
+def test_response_cache_hits_and_isolation():
+    client = make_client({'stock/metric': {'metric': {'sharesOutstanding': 5.0}}})
+    params = {'symbol': 'ABC', 'metric': 'all'}
+
+    first = client._make_request('stock/metric', params)
+    first['metric']['sharesOutstanding'] = 0.0
+    second = client._make_request('stock/metric', params)
+
+    assert client.calls == ['stock/metric']
+    assert second['metric']['sharesOutstanding'] == 5.0
+    assert (client.cache_hits, client.cache_misses) == (1, 1)
+
+
+def test_cache_clear_resets_everything():
+    client = make_client({'stock/metric': {'metric': {}}})
+    client._make_request('stock/metric', {'symbol': 'ABC'})
+    client._remember_missing('XYZ', None, answered=True)
+    client._listing = (float('inf'), {'SPY': 'ETP'})
+
+    client.cache_clear()
+
+    assert not client._response_cache and not client._negative_cache
+    assert client._listing == (0.0, {})
+    assert (client.cache_hits, client.cache_misses) == (0, 0)
+
+
+def test_negative_cache_only_for_answers():
+    client = make_client({})
+
+    client._remember_missing('FAIL', None, answered=False)
+    client._remember_missing('EMPTY', None, answered=True)
+    assert not client._known_missing('FAIL')
+    assert client._known_missing('EMPTY')
+
+    client.forget('EMPTY')
+    assert not client._known_missing('EMPTY')
+
+
+def test_negative_cache_is_bounded():
+    client = make_client({})
+    for i in range(NEGATIVE_CACHE_SIZE + 10):
+        client._remember_missing(f'S{i}', None, answered=True)
+
+    assert len(client._negative_cache) == NEGATIVE_CACHE_SIZE
+    assert not client._known_missing('S0')
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"✅ {name}")
@@ -30,7 +30,7 @@ async def test_real_alerts():
     print(f"📊 Escaneando {len(symbols)} símbolos...")
     
     # Run gap scan
-    results = gap_scanner.scan_watchlist(symbols)
+    results = await gap_scanner.scan_watchlist_async(symbols)
     print(f"🔍 Gaps encontrados: {len(results)}")
     
     if results:
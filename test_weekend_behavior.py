@@ -21,7 +21,7 @@ def simulate_weekend():
     with patch.object(manager, 'get_current_time_est') as mock_time:
         # Crear datetime para sábado
         saturday_10am = datetime(2025, 6, 14, 10, 0, 0)  # Sábado
-        mock_time.return_value = saturday_10am.replace(tzinfo=manager.eastern.localize(saturday_10am).tzinfo)
+        mock_time.return_value = saturday_10am.replace(tzinfo=manager.eastern)
         
         info = manager.get_session_info()
         should_scan = manager.should_scan_now()
@@ -45,7 +45,7 @@ def simulate_afterhours():
     # Simular miércoles 8:30 PM
     with patch.object(manager, 'get_current_time_est') as mock_time:
         wednesday_830pm = datetime(2025, 6, 11, 20, 30, 0)  # Miércoles 8:30 PM
-        mock_time.return_value = wednesday_830pm.replace(tzinfo=manager.eastern.localize(wednesday_830pm).tzinfo)
+        mock_time.return_value = wednesday_830pm.replace(tzinfo=manager.eastern)
         
         info = manager.get_session_info()
         should_scan = manager.should_scan_now()
@@ -69,7 +69,7 @@ def simulate_premarket():
     # Simular jueves 6:00 AM
     with patch.object(manager, 'get_current_time_est') as mock_time:
         thursday_6am = datetime(2025, 6, 12, 6, 0, 0)  # Jueves 6:00 AM
-        mock_time.return_value = thursday_6am.replace(tzinfo=manager.eastern.localize(thursday_6am).tzinfo)
+        mock_time.return_value = thursday_6am.replace(tzinfo=manager.eastern)
         
         info = manager.get_session_info()
         should_scan = manager.should_scan_now()